@@ -0,0 +1,188 @@
+"""
+Benchmark for the throughput and latency of commands.
+
+The benchmark connects a single CommandingClient to a server and lets the given amount of Threads issue commands
+through that client concurrently with 'execute_command'. For every level of concurrency the throughput of the whole
+client and the latency of the individual calls are being measured. As the commanding protocol exchanges one command
+at a time on a connection, the latency is expected to grow with the concurrency, while the throughput shows how much
+the queueing of the calls costs.
+Two kinds of servers can be compared:
+- handler: A dedicated CommandingHandler Thread for the connection
+- server: The selector based CommandingServer
+
+Usage:
+    python -m network.benchmark.bench_commanding --concurrency 1 2 4 8 16 --calls 2000 --mode handler server
+"""
+from network.protocol.commanding import CommandContext
+from network.protocol.commanding import CommandingHandler
+from network.protocol.commanding import CommandingClient
+from network.protocol.commanding import CommandingServer
+from network.connection import SocketConnection
+
+import statistics
+import threading
+import argparse
+import socket
+import json
+import time
+
+
+class BenchmarkCommandContext(CommandContext):
+    """
+    The command context of the benchmark with a single cheap command, so that the protocol overhead is being measured
+    """
+    def command_echo(self, value):
+        return value
+
+
+def start_server(mode, command_context):
+    """
+    This function starts the server of the given mode and connects a started CommandingClient to it
+    Args:
+        mode: The string mode of the server, either 'handler' or 'server'
+        command_context: The command context object
+
+    Returns:
+    The tuple (client, stop) with the CommandingClient and a function, which stops the client and the server
+    """
+    if mode == "server":
+        server = CommandingServer(("127.0.0.1", 0), command_context)
+        server.daemon = True
+        server.start()
+        sock = socket.create_connection(server.address)
+        stop = server.stop
+    else:
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(1)
+        sock = socket.create_connection(listener.getsockname())
+        handler = CommandingHandler(SocketConnection(listener.accept()[0]), command_context)
+        listener.close()
+        handler.daemon = True
+        handler.start()
+        stop = handler.stop
+
+    client = CommandingClient(SocketConnection(sock), command_context, queue_size=0)
+    client.daemon = True
+    client.start()
+
+    def stop_all():
+        client.running = False
+        client.join()
+        stop()
+        sock.close()
+
+    return client, stop_all
+
+
+def issue_calls(client, amount, latencies):
+    """
+    The target function of the calling Threads, which issues the given amount of commands one after the other
+    Args:
+        client: The CommandingClient
+        amount: The int amount of calls
+        latencies: The list, to which the latencies of the calls are being appended
+
+    Returns:
+    void
+    """
+    for index in range(amount):
+        start_time = time.perf_counter()
+        client.execute_command("echo", [index], {})
+        latencies.append(time.perf_counter() - start_time)
+
+
+def percentiles(latencies):
+    """
+    This function returns the median and the 99th percentile of the given latencies
+    Args:
+        latencies: The list of float latencies
+
+    Returns:
+    The tuple (p50, p99)
+    """
+    latencies = sorted(latencies)
+    return statistics.median(latencies), latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+
+
+def measure(mode, concurrency, calls):
+    """
+    This function runs a single benchmark case
+    Args:
+        mode: The string mode of the server, either 'handler' or 'server'
+        concurrency: The int amount of Threads issuing commands at the same time
+        calls: The int total amount of calls, which are being split among the Threads
+
+    Returns:
+    The dict with the results of the case
+    """
+    client, stop = start_server(mode, BenchmarkCommandContext())
+    try:
+        # Warming up, so that the first calls do not include the one time costs
+        issue_calls(client, 20, [])
+
+        latencies = []
+        threads = [
+            threading.Thread(target=issue_calls, args=(client, calls // concurrency, latencies))
+            for index in range(concurrency)
+        ]
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        duration = time.perf_counter() - start_time
+    finally:
+        stop()
+
+    p50, p99 = percentiles(latencies)
+    return {
+        "benchmark": "commanding_throughput",
+        "mode": mode,
+        "concurrency": concurrency,
+        "calls": len(latencies),
+        "calls_per_second": len(latencies) / duration,
+        "p50_seconds": p50,
+        "p99_seconds": p99
+    }
+
+
+def run(modes, concurrency_list, calls):
+    """
+    This function runs the benchmark cases for all the combinations of the given parameters
+    Args:
+        modes: The list of string server modes
+        concurrency_list: The list of int concurrency levels
+        calls: The int total amount of calls per case
+
+    Returns:
+    The list of the result dicts
+    """
+    return [measure(mode, concurrency, calls) for mode in modes for concurrency in concurrency_list]
+
+
+def add_arguments(parser):
+    """
+    This function adds the command line arguments of this benchmark to the given parser
+    Args:
+        parser: The argparse.ArgumentParser
+
+    Returns:
+    void
+    """
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--mode", nargs="+", default=["handler", "server"], choices=["handler", "server"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput and latency benchmark for commands")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    for result in run(args.mode, args.concurrency, args.calls):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Benchmark for the round trip latency of forms.
+
+The benchmark sends a Form over a connection with the FormTransmitterThread, an echo Thread on the other end receives
+it with the FormReceiverThread and sends it back the same way. The latency of the whole round trip is being measured
+for every combination of:
+- lines: The amount of lines in the body of the form
+- appendix: The size of the appendix in bytes, the appendix is a dict containing a string of that length
+- encoder: The AppendixEncoder, with which the appendix is being encoded (json and pickle)
+- transport: The kind of the connected sockets
+  - tcp: A TCP connection over the loopback interface
+  - unix: A connection over an AF_UNIX socket in the file system
+  - socketpair: An anonymous pair of connected sockets
+
+Usage:
+    python -m network.benchmark.bench_form --lines 1 10 100 --appendix 10 10000 --transport tcp unix socketpair
+"""
+from network.form import JsonAppendixEncoder
+from network.form import PickleAppendixEncoder
+from network.form import FormTransmitterThread
+from network.form import FormReceiverThread
+from network.form import Form
+from network.connection import SocketConnection
+
+import statistics
+import threading
+import itertools
+import argparse
+import tempfile
+import socket
+import json
+import time
+import os
+
+SEPARATION = "$separation$"
+
+ENCODERS = {
+    "json": JsonAppendixEncoder,
+    "pickle": PickleAppendixEncoder
+}
+
+
+def socket_pair(transport):
+    """
+    This function creates a pair of connected sockets of the given transport
+    Args:
+        transport: The string name of the transport, either 'tcp', 'unix' or 'socketpair'
+
+    Returns:
+    The tuple of the two connected sockets
+    """
+    if transport == "socketpair":
+        return socket.socketpair()
+
+    if transport == "tcp":
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        address = listener.getsockname()
+    else:
+        directory = tempfile.mkdtemp()
+        address = os.path.join(directory, "bench.sock")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(address)
+    listener.listen(1)
+    client = socket.socket(listener.family, socket.SOCK_STREAM)
+    client.connect(address)
+    server, _ = listener.accept()
+    listener.close()
+    if transport == "unix":
+        os.unlink(address)
+        os.rmdir(os.path.dirname(address))
+    return client, server
+
+
+def transmit(connection, form):
+    """
+    This function sends the given form over the connection, the same way the commanding protocol does
+    Args:
+        connection: The Connection object
+        form: The Form object to be sent
+
+    Returns:
+    void
+    """
+    transmitter = FormTransmitterThread(connection, form, SEPARATION)
+    transmitter.start()
+    transmitter.join()
+    transmitter.raise_exception()
+
+
+def receive(connection, encoder):
+    """
+    This function receives a form from the connection, the same way the commanding protocol does
+    Args:
+        connection: The Connection object
+        encoder: The AppendixEncoder class of the form
+
+    Returns:
+    The received Form object
+    """
+    receiver = FormReceiverThread(connection, SEPARATION, appendix_encoder=encoder)
+    receiver.start()
+    return receiver.receive_form()
+
+
+def echo(connection, encoder, amount):
+    """
+    The target function of the echo Thread, which sends back every received form
+    Args:
+        connection: The Connection object
+        encoder: The AppendixEncoder class of the forms
+        amount: The int amount of forms to echo
+
+    Returns:
+    void
+    """
+    for i in range(amount):
+        transmit(connection, receive(connection, encoder))
+
+
+def percentiles(latencies):
+    """
+    This function returns the median and the 99th percentile of the given latencies
+    Args:
+        latencies: The list of float latencies
+
+    Returns:
+    The tuple (p50, p99)
+    """
+    latencies = sorted(latencies)
+    return statistics.median(latencies), latencies[max(int(len(latencies) * 0.99) - 1, 0)]
+
+
+def measure(lines, appendix_size, encoder_name, transport, repetitions):
+    """
+    This function runs a single benchmark case
+    Args:
+        lines: The int amount of body lines
+        appendix_size: The int length of the string within the appendix
+        encoder_name: The string name of the encoder, either 'json' or 'pickle'
+        transport: The string name of the transport, either 'tcp', 'unix' or 'socketpair'
+        repetitions: The int amount of round trips to measure
+
+    Returns:
+    The dict with the results of the case
+    """
+    encoder = ENCODERS[encoder_name]
+    body = ["line {}".format(index) for index in range(lines)]
+    form = Form("BENCHMARK", body, {"data": "x" * appendix_size}, appendix_encoder=encoder)
+
+    sock1, sock2 = socket_pair(transport)
+    connection1, connection2 = SocketConnection(sock1), SocketConnection(sock2)
+    # Warming up, so that the first round trips do not include the one time costs
+    warmup = max(repetitions // 10, 1)
+    thread = threading.Thread(target=echo, args=(connection2, encoder, warmup + repetitions), daemon=True)
+    thread.start()
+    for i in range(warmup):
+        transmit(connection1, form)
+        receive(connection1, encoder)
+
+    latencies = []
+    for i in range(repetitions):
+        start_time = time.perf_counter()
+        transmit(connection1, form)
+        receive(connection1, encoder)
+        latencies.append(time.perf_counter() - start_time)
+    thread.join()
+    sock1.close()
+    sock2.close()
+
+    p50, p99 = percentiles(latencies)
+    return {
+        "benchmark": "form_round_trip",
+        "lines": lines,
+        "appendix_bytes": appendix_size,
+        "encoder": encoder_name,
+        "transport": transport,
+        "repetitions": repetitions,
+        "p50_seconds": p50,
+        "p99_seconds": p99,
+        "mean_seconds": statistics.mean(latencies)
+    }
+
+
+def run(lines_list, appendix_list, encoder_names, transports, repetitions):
+    """
+    This function runs the benchmark cases for all the combinations of the given parameters
+    Args:
+        lines_list: The list of int amounts of body lines
+        appendix_list: The list of int appendix sizes
+        encoder_names: The list of string encoder names
+        transports: The list of string transport names
+        repetitions: The int amount of round trips per case
+
+    Returns:
+    The list of the result dicts
+    """
+    cases = itertools.product(transports, encoder_names, lines_list, appendix_list)
+    return [measure(lines, appendix, encoder, transport, repetitions) for transport, encoder, lines, appendix in cases]
+
+
+def add_arguments(parser):
+    """
+    This function adds the command line arguments of this benchmark to the given parser
+    Args:
+        parser: The argparse.ArgumentParser
+
+    Returns:
+    void
+    """
+    parser.add_argument("--lines", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--appendix", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--encoder", nargs="+", default=list(ENCODERS), choices=list(ENCODERS))
+    parser.add_argument("--transport", nargs="+", default=["tcp", "unix", "socketpair"],
+                        choices=["tcp", "unix", "socketpair"])
+    parser.add_argument("--repetitions", type=int, default=200)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round trip latency benchmark for forms")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    for result in run(args.lines, args.appendix, args.encoder, args.transport, args.repetitions):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""
+Benchmark for the connection setup latency.
+
+The benchmark starts a server in a background Thread and then repeatedly opens a new connection to it. Three latencies
+are being measured from the start of the connect:
+- handshake: Until the handshake of the CommandingClient is complete
+- resumed: Until the handshake is complete, when the client resumes its previous session with the resumption token
+- setup: Until the return value of the first command has been received, which is the latency a client sees, when it
+  has to (re)connect to issue a command
+Two kinds of servers can be compared:
+- selector: A single CommandingServer, which multiplexes all connections from one Thread
+- threaded: A listening socket, which starts a dedicated CommandingHandler Thread for every accepted connection
+
+Usage:
+    python -m network.benchmark.bench_handshake --connects 500 --mode selector threaded
+"""
+from network.protocol.commanding import CommandContext
+from network.protocol.commanding import CommandingHandler
+from network.protocol.commanding import CommandingClient
+from network.protocol.commanding import CommandingServer
+from network.connection import SocketConnection
+
+import statistics
+import threading
+import argparse
+import socket
+import json
+import time
+
+
+class HandshakeCommandContext(CommandContext):
+    """
+    A command context with a few commands, so that the command set is not trivial
+    """
+    def command_echo(self, value):
+        return value
+
+    def command_add(self, a, b=0):
+        return a + b
+
+    def command_concat(self, *strings, separator=""):
+        return separator.join(strings)
+
+
+def serve_threaded(sock, command_context):
+    """
+    The target function for the accepting Thread in the threaded mode, which starts a CommandingHandler for every
+    accepted connection
+    Args:
+        sock: The listening socket
+        command_context: The command context object to be served
+
+    Returns:
+    void
+    """
+    while True:
+        try:
+            connection, address = sock.accept()
+        except OSError:
+            return
+        handler = CommandingHandler(SocketConnection(connection), command_context)
+        handler.daemon = True
+        handler.start()
+
+
+def start_server(mode, command_context):
+    """
+    This function starts the server of the given mode in a background Thread
+    Args:
+        mode: The string mode of the server, either 'selector' or 'threaded'
+        command_context: The command context object to be served
+
+    Returns:
+    The tuple (address, stop) with the address of the server and a function, which stops the server
+    """
+    if mode == "selector":
+        server = CommandingServer(("127.0.0.1", 0), command_context)
+        server.daemon = True
+        server.start()
+        return server.address, server.stop
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(128)
+    thread = threading.Thread(target=serve_threaded, args=(sock, command_context), daemon=True)
+    thread.start()
+    return sock.getsockname(), sock.close
+
+
+def handshake(address, command_context, resumption_token=None):
+    """
+    This function opens a new connection and only performs the handshake
+    Args:
+        address: The address of the server
+        command_context: The command context object of the client
+        resumption_token: The token of the session to resume, None for a new session
+
+    Returns:
+    The CommandingClient, which has not been started
+    """
+    connection = SocketConnection(socket.create_connection(address))
+    client = CommandingClient(connection, command_context, resumption_token=resumption_token)
+    client.validate()
+    return client
+
+
+def connect(address, command_context):
+    """
+    This function opens a new connection, performs the handshake and issues the first command
+    Args:
+        address: The address of the server
+        command_context: The command context object of the client
+
+    Returns:
+    The started CommandingClient
+    """
+    client = CommandingClient(SocketConnection(socket.create_connection(address)), command_context)
+    client.daemon = True
+    client.start()
+    client.execute_command("echo", [1], {})
+    return client
+
+
+def close(client):
+    """
+    This function stops the given client and closes its socket
+    Args:
+        client: The CommandingClient
+
+    Returns:
+    void
+    """
+    client.running = False
+    if client.is_alive():
+        client.join()
+    client.connection.sock.close()
+
+
+def percentiles(latencies):
+    """
+    This function returns the median and the 99th percentile of the given latencies
+    Args:
+        latencies: The list of float latencies
+
+    Returns:
+    The tuple (p50, p99)
+    """
+    latencies = sorted(latencies)
+    return statistics.median(latencies), latencies[int(len(latencies) * 0.99) - 1]
+
+
+def measure(mode, connects):
+    """
+    This function runs a single benchmark case
+    Args:
+        mode: The string mode of the server, either 'selector' or 'threaded'
+        connects: The int amount of connections to open one after the other
+
+    Returns:
+    The dict with the results of the case
+    """
+    command_context = HandshakeCommandContext()
+    address, stop = start_server(mode, command_context)
+    # Warming up, so that the first connects do not include the one time costs
+    for i in range(10):
+        close(connect(address, command_context))
+
+    latencies = {"handshake": [], "resumed": [], "setup": []}
+    try:
+        resumption_token = None
+        for i in range(connects):
+            start_time = time.perf_counter()
+            client = handshake(address, command_context)
+            latencies["handshake"].append(time.perf_counter() - start_time)
+            close(client)
+
+            start_time = time.perf_counter()
+            client = handshake(address, command_context, resumption_token)
+            latencies["resumed"].append(time.perf_counter() - start_time)
+            resumption_token = client.resumption_token
+            close(client)
+
+            start_time = time.perf_counter()
+            client = connect(address, command_context)
+            latencies["setup"].append(time.perf_counter() - start_time)
+            close(client)
+    finally:
+        stop()
+
+    result = {"mode": mode, "connects": connects}
+    for name, values in latencies.items():
+        result["{}_p50_seconds".format(name)], result["{}_p99_seconds".format(name)] = percentiles(values)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency benchmark for the connection setup")
+    parser.add_argument("--connects", type=int, default=500)
+    parser.add_argument("--mode", nargs="+", default=["selector", "threaded"], choices=["selector", "threaded"])
+    args = parser.parse_args()
+
+    for mode in args.mode:
+        result = measure(mode, args.connects)
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark for the memory of the queued messages.
+
+The benchmark creates the given amount of messages, keeps all of them alive and measures the memory they occupy with
+tracemalloc. Two values are being reported per message:
+- bytes_per_message: All the memory allocated for one message
+- overhead_bytes_per_message: The memory of the message minus the memory of its payload (the arguments, the return
+  value or the exception), which is the memory the message objects themselves add
+The messages are a command form with arguments, a return form and an error form. The 'queued' message is a command
+form, which is put into the CallQueue of the CommandingClient together with its call id, as it is the case for the
+calls waiting to be sent.
+
+Usage:
+    python -m network.benchmark.bench_memory --amount 10000 --message command return error queued
+"""
+from network.protocol.commanding import CommandForm
+from network.protocol.commanding import ReturnForm
+from network.protocol.commanding import ErrorForm
+from network.protocol.commanding import CallQueue
+
+import tracemalloc
+import argparse
+import json
+
+# The functions creating the payload of each kind of message from the index of the message
+PAYLOADS = {
+    "command": lambda index: (["value", index], {"flag": True}),
+    "return": lambda index: {"status": "ok", "items": [index, index + 1]},
+    "error": lambda index: ValueError("the value {} is not valid".format(index)),
+    "queued": lambda index: (["value", index], {"flag": True})
+}
+
+
+def build_messages(message, payloads):
+    """
+    This function creates the messages of the given kind from the payloads
+    Args:
+        message: The string kind of the message, one of the keys of PAYLOADS
+        payloads: The list of payloads
+
+    Returns:
+    The object holding all the messages
+    """
+    if message == "command":
+        return [CommandForm("echo", pos_args, kw_args) for pos_args, kw_args in payloads]
+    if message == "return":
+        return [ReturnForm(payload) for payload in payloads]
+    if message == "error":
+        return [ErrorForm(payload) for payload in payloads]
+
+    call_queue = CallQueue(maxsize=0)
+    for call_id, (pos_args, kw_args) in enumerate(payloads):
+        call_queue.put((call_id, CommandForm("echo", pos_args, kw_args)))
+    return call_queue
+
+
+def allocated(function):
+    """
+    This function calls the given function and returns the amount of memory, which was allocated by the call and is
+    still allocated afterwards, as the result of the function is kept alive until the measurement is done
+    Args:
+        function: The function without parameters to measure
+
+    Returns:
+    The tuple (result, bytes) with the result of the function and the int amount of bytes
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = function()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return result, after - before
+
+
+def measure(message, amount):
+    """
+    This function runs a single benchmark case
+    Args:
+        message: The string kind of the message, one of the keys of PAYLOADS
+        amount: The int amount of messages to create
+
+    Returns:
+    The dict with the results of the case
+    """
+    payloads, payload_bytes = allocated(lambda: [PAYLOADS[message](index) for index in range(amount)])
+    messages, message_bytes = allocated(lambda: build_messages(message, payloads))
+
+    return {
+        "benchmark": "memory",
+        "message": message,
+        "messages": amount,
+        "bytes_per_message": (payload_bytes + message_bytes) / amount,
+        "overhead_bytes_per_message": message_bytes / amount
+    }
+
+
+def run(messages, amount):
+    """
+    This function runs the benchmark for all the given kinds of messages
+    Args:
+        messages: The list of string kinds of messages
+        amount: The int amount of messages per case
+
+    Returns:
+    The list of result dicts
+    """
+    return [measure(message, amount) for message in messages]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark for the memory of the queued messages")
+    parser.add_argument("--amount", type=int, default=10000)
+    parser.add_argument("--message", nargs="+", default=list(PAYLOADS), choices=list(PAYLOADS))
+    args = parser.parse_args()
+
+    for result in run(args.message, args.amount):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark for parsing the received commanding forms.
+
+The benchmark measures the time per message it takes to turn a received Form into its commanding form wrapper. The
+messages are being parsed in batches and the median and the 99th percentile of the time per message of the batches
+are being reported. Three stages of the parsing can be measured:
+- header: Only parsing the body string of a command form into the command name, return mode, error mode and deadline
+- evaluate: Wrapping a Form, whose appendix has already been decoded, into the commanding form
+- receive: Creating the Form from the title, body and encoded appendix, as the FormParser does, and wrapping it
+The messages are a command form with arguments and a deadline, a return form and an error form.
+
+Usage:
+    python -m network.benchmark.bench_parse --batches 200 --batch-size 1000 --message command return error
+"""
+from network.protocol.commanding import CommandingBase
+from network.protocol.commanding import CommandForm
+from network.protocol.commanding import ReturnForm
+from network.protocol.commanding import ErrorForm
+from network.form import Form
+
+import statistics
+import argparse
+import json
+import time
+
+# The functions creating the Form of each kind of message
+MESSAGES = {
+    "command": lambda: CommandForm("echo", ["value", 12], {"flag": True}, deadline=time.time() + 60).form,
+    "return": lambda: ReturnForm({"status": "ok", "items": [1, 2, 3]}).form,
+    "error": lambda: ErrorForm(ValueError("the value 'http://host:80' is not valid")).form
+}
+# The stages of the parsing, which can be measured
+STAGES = ("header", "evaluate", "receive")
+
+
+def build_parse(stage, form):
+    """
+    This function returns the function, which performs the given stage of the parsing for the given form
+    Args:
+        stage: The string name of the stage
+        form: The Form object of the message
+
+    Returns:
+    The function without parameters, which parses the message once
+    """
+    if stage == "header":
+        body = form.body
+        return lambda: CommandForm.parse_header(body)
+    if stage == "evaluate":
+        return lambda: CommandingBase.evaluate_commanding_form(form)
+
+    title, body, appendix_encoded = form.title, form.body, form.appendix_encoded
+    return lambda: CommandingBase.evaluate_commanding_form(Form(title, body, appendix_encoded))
+
+
+def measure(message, stage, batches, batch_size):
+    """
+    This function runs a single benchmark case
+    Args:
+        message: The string kind of the message, one of the keys of MESSAGES
+        stage: The string name of the stage
+        batches: The int amount of batches to measure
+        batch_size: The int amount of messages parsed per batch
+
+    Returns:
+    The dict with the results of the case
+    """
+    parse = build_parse(stage, MESSAGES[message]())
+    # Warming up, so that the first batch does not include the one time costs
+    for i in range(batch_size):
+        parse()
+
+    durations = []
+    for i in range(batches):
+        start_time = time.perf_counter()
+        for j in range(batch_size):
+            parse()
+        durations.append((time.perf_counter() - start_time) / batch_size)
+    durations.sort()
+
+    return {
+        "benchmark": "parse",
+        "message": message,
+        "mode": stage,
+        "messages": batches * batch_size,
+        "p50_seconds": statistics.median(durations),
+        "p99_seconds": durations[max(int(len(durations) * 0.99) - 1, 0)],
+        "calls_per_second": 1 / statistics.mean(durations)
+    }
+
+
+def run(messages, stages, batches, batch_size):
+    """
+    This function runs the benchmark for all the combinations of the given messages and stages. The header stage is
+    only measured for the command message, as only the command form has a header to parse
+    Args:
+        messages: The list of string kinds of messages
+        stages: The list of string names of the stages
+        batches: The int amount of batches per case
+        batch_size: The int amount of messages parsed per batch
+
+    Returns:
+    The list of result dicts
+    """
+    results = []
+    for message in messages:
+        for stage in stages:
+            if stage == "header" and message != "command":
+                continue
+            results.append(measure(message, stage, batches, batch_size))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark for parsing the received commanding forms")
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--message", nargs="+", default=list(MESSAGES), choices=list(MESSAGES))
+    parser.add_argument("--stage", nargs="+", default=list(STAGES), choices=list(STAGES))
+    args = parser.parse_args()
+
+    for result in run(args.message, args.stage, args.batches, args.batch_size):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
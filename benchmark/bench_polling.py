@@ -0,0 +1,184 @@
+"""
+Benchmark for polling many connections.
+
+The benchmark registers the given amount of Pollers, whose first polls are spread evenly over the interval, and then
+measures the CPU time the process uses within a fixed window of time, the amount of polls performed and how late the
+polls started compared to their due time. The poll function itself does nothing, so that only the overhead of driving
+the Pollers is being measured.
+Two ways of driving the Pollers can be compared:
+- scheduler: A single PollingScheduler, which keeps the due times in a heap and polls on a small worker pool
+- threaded: A dedicated Thread for every Poller, which checks 'is_interval_match' in a loop with the given resolution
+
+Usage:
+    python -m network.benchmark.bench_polling --pollers 100 1000 10000 --mode scheduler threaded
+"""
+from network.polling import GenericPoller
+from network.polling import PollingScheduler
+
+import threading
+import argparse
+import json
+import time
+
+
+class Measurement:
+    """
+    The shared state of one benchmark case, which counts the polls and records how late they started
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.polls = 0
+        self.lateness_max = 0.0
+
+    def record(self, lateness):
+        with self.lock:
+            self.polls += 1
+            self.lateness_max = max(self.lateness_max, lateness)
+
+
+def build_pollers(amount, interval, measurement):
+    """
+    This function creates the given amount of GenericPollers with a constant interval and a poll function, which
+    only records the poll
+    Args:
+        amount: The int amount of pollers
+        interval: The float interval in seconds
+        measurement: The Measurement object, which counts the polls
+
+    Returns:
+    The list of GenericPollers
+    """
+    pollers = []
+    for index in range(amount):
+        poller = GenericPoller(None, lambda: interval, lambda connection: measurement.polls)
+        pollers.append(poller)
+    return pollers
+
+
+def drive_scheduler(pollers, interval, duration, resolution, measurement):
+    """
+    This function drives the pollers with a PollingScheduler for the duration
+    Args:
+        pollers: The list of Pollers
+        interval: The float interval of the pollers in seconds
+        duration: The float amount of seconds to run
+        resolution: Not used by the scheduler, which wakes up exactly at the due times
+        measurement: The Measurement object, which counts the polls
+
+    Returns:
+    The float CPU seconds used during the duration
+    """
+    scheduler = PollingScheduler(workers=4)
+    scheduler.start()
+    for index, poller in enumerate(pollers):
+        scheduler.register(poller, delay=interval * index / len(pollers))
+    cpu_time = time.process_time()
+    time.sleep(duration)
+    cpu_time = time.process_time() - cpu_time
+    scheduler.stop()
+    scheduler.join()
+    metrics = scheduler.metrics()
+    measurement.polls = metrics["polls"]
+    measurement.lateness_max = metrics["lateness_max"]
+    return cpu_time
+
+
+def poll_loop(poller, delay, resolution, running, measurement):
+    """
+    The target function of a Thread in the threaded mode, which polls a single poller, whenever the time since the
+    last poll matches its interval
+    Args:
+        poller: The Poller object
+        delay: The float amount of seconds until the first poll
+        resolution: The float amount of seconds to sleep between the checks
+        running: The Event, which is cleared to stop the loop
+        measurement: The Measurement object, which counts the polls
+
+    Returns:
+    void
+    """
+    last_poll = time.monotonic() + delay - poller.interval
+    while running.is_set():
+        time.sleep(resolution)
+        matched, difference = poller.is_interval_match(time.monotonic() - last_poll, update=True)
+        if matched:
+            measurement.record(difference)
+            poller.poll()
+            last_poll = time.monotonic()
+
+
+def drive_threaded(pollers, interval, duration, resolution, measurement):
+    """
+    This function drives the pollers with one Thread per Poller for the duration
+    Args:
+        pollers: The list of Pollers
+        interval: The float interval of the pollers in seconds
+        duration: The float amount of seconds to run
+        resolution: The float amount of seconds each Thread sleeps between its checks
+        measurement: The Measurement object, which counts the polls
+
+    Returns:
+    The float CPU seconds used during the duration
+    """
+    running = threading.Event()
+    running.set()
+    threads = []
+    for index, poller in enumerate(pollers):
+        delay = interval * index / len(pollers)
+        thread = threading.Thread(target=poll_loop, args=(poller, delay, resolution, running, measurement), daemon=True)
+        thread.start()
+        threads.append(thread)
+    cpu_time = time.process_time()
+    time.sleep(duration)
+    cpu_time = time.process_time() - cpu_time
+    running.clear()
+    for thread in threads:
+        thread.join()
+    return cpu_time
+
+
+def measure(mode, amount, interval, duration, resolution):
+    """
+    This function runs a single benchmark case
+    Args:
+        mode: The string mode, either 'scheduler' or 'threaded'
+        amount: The int amount of pollers
+        interval: The float interval of the pollers in seconds
+        duration: The float amount of seconds to measure
+        resolution: The float amount of seconds the threads of the threaded mode sleep between their checks
+
+    Returns:
+    The dict with the results of the case
+    """
+    measurement = Measurement()
+    pollers = build_pollers(amount, interval, measurement)
+    drive = drive_scheduler if mode == "scheduler" else drive_threaded
+    cpu_time = drive(pollers, interval, duration, resolution, measurement)
+    return {
+        "mode": mode,
+        "pollers": amount,
+        "interval_seconds": interval,
+        "polls": measurement.polls,
+        "cpu_percent": 100 * cpu_time / duration,
+        "cpu_per_poll_seconds": cpu_time / measurement.polls if measurement.polls != 0 else None,
+        "lateness_max_seconds": measurement.lateness_max
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU usage benchmark for driving many pollers")
+    parser.add_argument("--pollers", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--mode", nargs="+", default=["scheduler", "threaded"], choices=["scheduler", "threaded"])
+    parser.add_argument("--interval", type=float, default=30)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--resolution", type=float, default=0.1)
+    args = parser.parse_args()
+
+    for mode in args.mode:
+        for amount in args.pollers:
+            result = measure(mode, amount, args.interval, args.duration, args.resolution)
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Benchmark for serving many mostly idle connections.
+
+The benchmark starts a server in a separate process, opens the given amount of idle client connections to it and then
+measures the resident memory of the server process as well as the latency of commands issued by a single active
+CommandingClient while all the idle connections are open.
+Two kinds of servers can be compared:
+- selector: A single CommandingServer, which multiplexes all connections from one Thread
+- threaded: A listening socket, which starts a dedicated CommandingHandler Thread for every accepted connection
+
+Usage:
+    python -m network.benchmark.bench_server --connections 1000 5000 10000 --mode selector threaded
+"""
+from network.protocol.commanding import CommandContext
+from network.protocol.commanding import CommandingHandler
+from network.protocol.commanding import CommandingClient
+from network.protocol.commanding import CommandingServer
+from network.protocol.commanding import Hello
+from network.connection import SocketConnection
+
+import multiprocessing
+import statistics
+import argparse
+import resource
+import socket
+import json
+import time
+
+
+def raise_file_limit(amount):
+    """
+    This function raises the soft limit for open file descriptors of the current process to the given amount, as far
+    as the hard limit allows it
+    Args:
+        amount: The int amount of file descriptors needed
+
+    Returns:
+    The new soft limit
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = amount if hard == resource.RLIM_INFINITY else min(amount, hard)
+    if wanted > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+    return resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+
+
+def resident_memory(pid):
+    """
+    This function returns the resident memory of the process with the given pid in bytes, read from the proc file
+    system (linux only)
+    Args:
+        pid: The int pid of the process
+
+    Returns:
+    The int amount of bytes
+    """
+    with open("/proc/{}/status".format(pid)) as file:
+        for line in file:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def serve_selector(pipe, file_limit):
+    """
+    The target function for the server process in the selector mode
+    Args:
+        pipe: The multiprocessing pipe through which the address of the server is being reported
+        file_limit: The amount of file descriptors needed
+
+    Returns:
+    void
+    """
+    raise_file_limit(file_limit)
+    server = CommandingServer(("127.0.0.1", 0), CommandContext(), backlog=4096)
+    pipe.send(server.address)
+    server.run()
+
+
+def serve_threaded(pipe, file_limit):
+    """
+    The target function for the server process in the threaded mode, which starts a CommandingHandler for every
+    accepted connection
+    Args:
+        pipe: The multiprocessing pipe through which the address of the server is being reported
+        file_limit: The amount of file descriptors needed
+
+    Returns:
+    void
+    """
+    raise_file_limit(file_limit)
+    command_context = CommandContext()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(4096)
+    pipe.send(sock.getsockname())
+    while True:
+        connection, address = sock.accept()
+        handler = CommandingHandler(SocketConnection(connection), command_context)
+        handler.daemon = True
+        handler.start()
+
+
+def open_idle_connection(address):
+    """
+    This function opens a client connection, which performs the handshake and then stays idle
+    Args:
+        address: The address of the server
+
+    Returns:
+    The connected socket
+    """
+    sock = socket.create_connection(address)
+    connection = SocketConnection(sock)
+    connection.sendall_bytes(Hello(CommandContext.fingerprint).encode())
+    Hello.decode(connection.receive_length_bytes(Hello.size, 10))
+    return sock
+
+
+def measure(mode, connections, calls):
+    """
+    This function runs a single benchmark case
+    Args:
+        mode: The string mode of the server, either 'selector' or 'threaded'
+        connections: The int amount of idle connections
+        calls: The int amount of commands issued to measure the latency
+
+    Returns:
+    The dict with the results of the case
+    """
+    file_limit = connections + 256
+    raise_file_limit(file_limit)
+    target = serve_selector if mode == "selector" else serve_threaded
+    receiver, sender = multiprocessing.Pipe(duplex=False)
+    process = multiprocessing.Process(target=target, args=(sender, file_limit), daemon=True)
+    process.start()
+    address = receiver.recv()
+    time.sleep(0.2)
+    memory_before = resident_memory(process.pid)
+
+    try:
+        start_time = time.perf_counter()
+        idle_sockets = [open_idle_connection(address) for i in range(connections)]
+        connect_duration = time.perf_counter() - start_time
+        time.sleep(0.5)
+        memory_after = resident_memory(process.pid)
+
+        # Measuring the latency of an active client while all the idle connections are open
+        command_context = CommandContext()
+        client = CommandingClient(SocketConnection(socket.create_connection(address)), command_context)
+        client.daemon = True
+        client.start()
+        client.execute_command("time", [], {})
+        latencies = []
+        for i in range(calls):
+            call_start = time.perf_counter()
+            client.execute_command("time", [], {})
+            latencies.append(time.perf_counter() - call_start)
+        client.running = False
+
+        for sock in idle_sockets:
+            sock.close()
+    finally:
+        process.terminate()
+        process.join()
+
+    latencies.sort()
+    return {
+        "mode": mode,
+        "connections": connections,
+        "connect_seconds": connect_duration,
+        "memory_bytes": memory_after,
+        "memory_per_connection_bytes": (memory_after - memory_before) / max(connections, 1),
+        "latency_p50_seconds": statistics.median(latencies),
+        "latency_p99_seconds": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory and latency benchmark for many idle connections")
+    parser.add_argument("--connections", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--mode", nargs="+", default=["selector", "threaded"], choices=["selector", "threaded"])
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    for mode in args.mode:
+        for connections in args.connections:
+            result = measure(mode, connections, args.calls)
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
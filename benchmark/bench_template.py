@@ -0,0 +1,166 @@
+"""
+Benchmark for the CPU cost of issuing a command with and without a CommandTemplate.
+
+The benchmark measures the CPU time per call it takes to issue the same command with changing arguments. Two ways of
+issuing the command are being compared:
+- command: A new CommandForm is being created for every call from the command name, the modes and the arguments
+- template: The command is being compiled into a CommandTemplate once and every call only passes the arguments
+Two stages can be measured:
+- serialize: Only creating the command form and the chunks, which are being sent for it. Both ways are measured in
+  alternating batches, so that they are affected by the load of the machine alike
+- client: Complete calls of a CommandingClient with a CommandingHandler Thread in the same process, which is why the
+  CPU time includes the handler side and the Threads of the form transmission
+The median and the minimum of the CPU time per call of the batches are being reported.
+
+Usage:
+    python -m network.benchmark.bench_template --batches 100 --batch-size 1000 --stage serialize client
+"""
+from network.benchmark.bench_commanding import BenchmarkCommandContext
+from network.benchmark.bench_commanding import start_server
+from network.protocol.commanding import CommandTemplate
+from network.protocol.commanding import CommandForm
+from network.form import FormSerializer
+
+import statistics
+import argparse
+import json
+import time
+
+# The ways of issuing the command, which are being compared
+MODES = ("command", "template")
+# The stages, which can be measured
+STAGES = ("serialize", "client")
+
+
+def arguments(index):
+    """
+    This function returns the pos args of the call with the given index, which only differ in the index
+    Args:
+        index: The int index of the call
+
+    Returns:
+    The pos args list
+    """
+    return [{"value": index, "flag": True}]
+
+
+def build_serialize(mode, separation):
+    """
+    This function returns the function, which creates the command form and its chunks for a call in the given mode
+    Args:
+        mode: The string mode, either 'command' or 'template'
+        separation: The string separation between the body and the appendix
+
+    Returns:
+    The function, which takes the int index of the call
+    """
+    if mode == "command":
+        return lambda index: FormSerializer(CommandForm("echo", arguments(index), {}).form, separation).chunks()
+
+    template = CommandTemplate("echo")
+    return lambda index: FormSerializer(template.create(arguments(index), {}).form, separation).chunks()
+
+
+def build_client_call(mode, client):
+    """
+    This function returns the function, which issues a call in the given mode with the given client
+    Args:
+        mode: The string mode, either 'command' or 'template'
+        client: The started CommandingClient
+
+    Returns:
+    The function, which takes the int index of the call
+    """
+    if mode == "command":
+        return lambda index: client.execute_command("echo", arguments(index), {})
+
+    template = CommandTemplate("echo")
+    return lambda index: client.execute_template(template, arguments(index), {})
+
+
+def measure_batches(calls, batches, batch_size):
+    """
+    This function measures the CPU time per call of the given functions in alternating batches
+    Args:
+        calls: The dict with the string modes as keys and the functions taking the call index as values
+        batches: The int amount of batches per mode
+        batch_size: The int amount of calls per batch
+
+    Returns:
+    The dict with the modes as keys and the list of the float CPU seconds per call of each batch as values
+    """
+    durations = {mode: [] for mode in calls}
+    for i in range(batches):
+        for mode, call in calls.items():
+            start_time = time.process_time()
+            for index in range(batch_size):
+                call(index)
+            durations[mode].append((time.process_time() - start_time) / batch_size)
+    return durations
+
+
+def measure(stage, batches, batch_size):
+    """
+    This function runs the benchmark for both modes in the given stage
+    Args:
+        stage: The string name of the stage, either 'serialize' or 'client'
+        batches: The int amount of batches per mode
+        batch_size: The int amount of calls per batch
+
+    Returns:
+    The list with the result dict for every mode
+    """
+    if stage == "serialize":
+        calls = {mode: build_serialize(mode, "$separation$") for mode in MODES}
+        durations = measure_batches(calls, batches, batch_size)
+    else:
+        client, stop = start_server("handler", BenchmarkCommandContext())
+        try:
+            calls = {mode: build_client_call(mode, client) for mode in MODES}
+            durations = measure_batches(calls, batches, batch_size)
+        finally:
+            stop()
+
+    results = []
+    for mode in MODES:
+        results.append({
+            "benchmark": "template",
+            "stage": stage,
+            "mode": mode,
+            "calls": batches * batch_size,
+            "cpu_seconds_per_call": statistics.median(durations[mode]),
+            "cpu_seconds_per_call_min": min(durations[mode])
+        })
+    return results
+
+
+def run(stages, batches, batch_size):
+    """
+    This function runs the benchmark for all the given stages
+    Args:
+        stages: The list of string names of the stages
+        batches: The int amount of batches per mode
+        batch_size: The int amount of calls per batch
+
+    Returns:
+    The list of result dicts
+    """
+    results = []
+    for stage in stages:
+        results.extend(measure(stage, batches, batch_size))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark for the CPU cost of issuing a command with a template")
+    parser.add_argument("--batches", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--stage", nargs="+", default=list(STAGES), choices=list(STAGES))
+    args = parser.parse_args()
+
+    for result in run(args.stage, args.batches, args.batch_size):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Benchmark for the connection setup latency with TLS.
+
+The benchmark starts a CommandingServer in a background Thread and then repeatedly opens a new connection to it. The
+connections are being opened in three modes, which are measured in alternation:
+- plain: Without TLS, as the baseline
+- full: With TLS, performing a full handshake for every connection
+- resumed: With TLS, resuming the session of the previous connection with the TLSConnector
+Two latencies are being measured from the start of the connect:
+- handshake: Until the handshake of the CommandingClient is complete, which is the first exchange after the TLS
+  handshake
+- setup: Until the return value of the first command has been received
+The server certificate is signed by a self signed authority, which is being created with the openssl command line
+tool, unless the files are given.
+
+Usage:
+    python -m network.benchmark.bench_tls --connects 500 --mode plain full resumed --stage handshake setup
+"""
+from network.benchmark.bench_handshake import HandshakeCommandContext
+from network.benchmark.bench_handshake import percentiles
+from network.protocol.commanding import CommandingClient
+from network.protocol.commanding import CommandingServer
+from network.connection import SocketConnection
+from network.connection import TLSConnector
+from network.test.util import certificates
+
+import argparse
+import tempfile
+import socket
+import json
+import time
+import ssl
+
+# The ways of opening the connections, which are being compared
+MODES = ("plain", "full", "resumed")
+# The latencies, which can be measured
+STAGES = ("handshake", "setup")
+
+
+def build_connect(mode, ca_file):
+    """
+    This function returns the function, which opens a new connection in the given mode
+    Args:
+        mode: The string mode, one of MODES
+        ca_file: The string path of the certificate of the authority, which signed the certificate of the server
+
+    Returns:
+    The function, which takes the address of the server and returns the connected Connection
+    """
+    if mode == "plain":
+        return lambda address: SocketConnection(socket.create_connection(address))
+
+    connector = TLSConnector(ssl.create_default_context(cafile=ca_file), resume=mode == "resumed")
+    return connector.connect
+
+
+def open_client(connection, command_context, stage):
+    """
+    This function performs the handshake of a CommandingClient on the given connection and in the setup stage also
+    issues the first command
+    Args:
+        connection: The connected Connection
+        command_context: The command context object of the client
+        stage: The string name of the stage, one of STAGES
+
+    Returns:
+    The CommandingClient
+    """
+    client = CommandingClient(connection, command_context)
+    if stage == "handshake":
+        client.validate()
+    else:
+        client.daemon = True
+        client.start()
+        client.execute_command("echo", [1], {})
+    return client
+
+
+def close(client):
+    """
+    This function stops the given client and closes its socket
+    Args:
+        client: The CommandingClient
+
+    Returns:
+    void
+    """
+    client.running = False
+    if client.is_alive():
+        client.join()
+    client.connection.sock.close()
+
+
+def measure(stage, connects, ca_file, cert_file, key_file):
+    """
+    This function runs the benchmark for all the modes in the given stage
+    Args:
+        stage: The string name of the stage, one of STAGES
+        connects: The int amount of connections per mode
+        ca_file: The string path of the certificate of the authority
+        cert_file: The string path of the certificate of the server
+        key_file: The string path of the private key of the server
+
+    Returns:
+    The list with the result dict for every mode
+    """
+    command_context = HandshakeCommandContext()
+    # The plain connections are served by their own server, as the TLS server only accepts encrypted connections
+    server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    server_context.load_cert_chain(cert_file, key_file)
+    servers = {
+        "plain": CommandingServer(("127.0.0.1", 0), command_context),
+        "tls": CommandingServer(("127.0.0.1", 0), command_context, ssl_context=server_context)
+    }
+    for server in servers.values():
+        server.daemon = True
+        server.start()
+
+    connects_by_mode = {mode: build_connect(mode, ca_file) for mode in MODES}
+    latencies = {mode: [] for mode in MODES}
+    try:
+        # Warming up, so that the first connects do not include the one time costs. This also lets the resuming
+        # connector receive the first session
+        for i in range(10):
+            for mode, connect in connects_by_mode.items():
+                address = servers["plain" if mode == "plain" else "tls"].address
+                close(open_client(connect(address), command_context, "handshake"))
+
+        for i in range(connects):
+            for mode, connect in connects_by_mode.items():
+                address = servers["plain" if mode == "plain" else "tls"].address
+                start_time = time.perf_counter()
+                client = open_client(connect(address), command_context, stage)
+                latencies[mode].append(time.perf_counter() - start_time)
+                close(client)
+    finally:
+        for server in servers.values():
+            server.stop()
+
+    results = []
+    for mode in MODES:
+        p50, p99 = percentiles(latencies[mode])
+        results.append({
+            "benchmark": "tls",
+            "stage": stage,
+            "mode": mode,
+            "connects": connects,
+            "p50_seconds": p50,
+            "p99_seconds": p99
+        })
+    return results
+
+
+def run(stages, connects, files=None):
+    """
+    This function runs the benchmark for all the given stages
+    Args:
+        stages: The list of string names of the stages
+        connects: The int amount of connections per mode and stage
+        files: The tuple (ca_file, cert_file, key_file) with the paths of the certificates and the key of the server.
+            By default they are being created in a temporary directory
+
+    Returns:
+    The list of result dicts
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        if files is None:
+            files = certificates(directory)
+        results = []
+        for stage in stages:
+            results.extend(measure(stage, connects, *files))
+        return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency benchmark for the connection setup with TLS")
+    parser.add_argument("--connects", type=int, default=500)
+    parser.add_argument("--stage", nargs="+", default=list(STAGES), choices=list(STAGES))
+    parser.add_argument("--ca-file", help="The certificate of the authority, which signed the server certificate")
+    parser.add_argument("--cert-file", help="The certificate of the server for 'localhost' and '127.0.0.1'")
+    parser.add_argument("--key-file", help="The private key of the server")
+    args = parser.parse_args()
+
+    files = None
+    if args.ca_file is not None:
+        files = (args.ca_file, args.cert_file, args.key_file)
+    for result in run(args.stage, args.connects, files):
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+The benchmark suite, which runs the form round trip, the form parsing, the message memory, the command template and the
+commanding throughput benchmarks and writes the results into a single JSON document. Besides the results, the
+document contains the git commit, the python version and the platform, so that the runs of different commits can be
+compared with each other.
+
+Comparing a run with a previous one prints the ratio of every latency, CPU time, memory and throughput value of the
+cases, that exist in both runs. For latencies, CPU time and memory a ratio below 1 is an improvement, for throughputs a
+ratio above 1.
+
+Usage:
+    python -m network.benchmark.suite --output results.json
+    python -m network.benchmark.suite --quick --output new.json --compare old.json
+"""
+from network.benchmark import bench_commanding
+from network.benchmark import bench_form
+from network.benchmark import bench_parse
+from network.benchmark import bench_memory
+from network.benchmark import bench_template
+
+import subprocess
+import platform
+import argparse
+import json
+import time
+import sys
+import os
+
+# The keys of the results, which describe the case instead of being a measured value
+CASE_KEYS = ("benchmark", "lines", "appendix_bytes", "encoder", "transport", "message", "stage", "mode", "concurrency")
+# The keys of the measured values, which are being compared
+VALUE_KEYS = ("p50_seconds", "p99_seconds", "calls_per_second", "bytes_per_message", "cpu_seconds_per_call")
+
+
+def git_commit():
+    """
+    This function returns the hash of the commit currently checked out in the repository of this package
+    Returns:
+    The string commit hash or None, in case it cannot be determined
+    """
+    try:
+        output = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)), stderr=subprocess.DEVNULL
+        )
+        return output.decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_key(result):
+    """
+    This function returns the tuple of the values, which identify the case of a result
+    Args:
+        result: The dict result of a benchmark case
+
+    Returns:
+    The tuple of the case values
+    """
+    return tuple(result.get(key) for key in CASE_KEYS)
+
+
+def compare(results, baseline):
+    """
+    This function compares the given results with the results of a baseline run
+    Args:
+        results: The list of result dicts of the current run
+        baseline: The list of result dicts of the baseline run
+
+    Returns:
+    The list of dicts with the case values and the ratio current / baseline for every measured value
+    """
+    baseline_results = {case_key(result): result for result in baseline}
+    comparisons = []
+    for result in results:
+        baseline_result = baseline_results.get(case_key(result))
+        if baseline_result is None:
+            continue
+        comparison = {key: result[key] for key in CASE_KEYS if key in result}
+        for key in VALUE_KEYS:
+            if key in result and baseline_result.get(key):
+                comparison["{}_ratio".format(key)] = result[key] / baseline_result[key]
+        comparisons.append(comparison)
+    return comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description="The benchmark suite of the network package")
+    parser.add_argument("--output", help="The path of the JSON file to write the results to")
+    parser.add_argument("--compare", help="The path of the JSON file of a previous run to compare with")
+    parser.add_argument("--quick", action="store_true", help="Run fewer repetitions, for a quick check")
+    parser.add_argument("--skip", nargs="*", default=[], choices=["form", "parse", "memory", "template", "commanding"])
+    args = parser.parse_args()
+
+    factor = 0.1 if args.quick else 1
+    results = []
+    if "form" not in args.skip:
+        results.extend(bench_form.run(
+            [1, 10, 100], [10, 1000, 100000], list(bench_form.ENCODERS), ["tcp", "unix", "socketpair"],
+            max(int(200 * factor), 10)
+        ))
+    if "parse" not in args.skip:
+        results.extend(bench_parse.run(
+            list(bench_parse.MESSAGES), list(bench_parse.STAGES), max(int(200 * factor), 10), 1000
+        ))
+    if "memory" not in args.skip:
+        results.extend(bench_memory.run(list(bench_memory.PAYLOADS), max(int(10000 * factor), 100)))
+    if "template" not in args.skip:
+        results.extend(bench_template.run(list(bench_template.STAGES), max(int(20 * factor), 4), 200))
+    if "commanding" not in args.skip:
+        results.extend(bench_commanding.run(["handler", "server"], [1, 2, 4, 8, 16], max(int(2000 * factor), 16)))
+
+    document = {
+        "commit": git_commit(),
+        "python": sys.version,
+        "platform": platform.platform(),
+        "timestamp": time.time(),
+        "results": results
+    }
+    if args.output is None:
+        print(json.dumps(document, indent=2))
+    else:
+        with open(args.output, "w") as file:
+            json.dump(document, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        print("Compared with the commit {}".format(baseline.get("commit")))
+        for comparison in compare(results, baseline["results"]):
+            print(json.dumps(comparison))
+
+
+if __name__ == "__main__":
+    main()
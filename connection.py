@@ -1,5 +1,6 @@
 import socket
 import time
+import ssl
 
 
 class SocketWrapper:
@@ -379,6 +380,16 @@ class Connection:
         """
         raise NotImplementedError()
 
+    def pending_bytes(self):
+        """
+        A Connection object, which buffers received data internally, has to report how much of it can be received
+        without waiting, as such data can not be detected by waiting for the underlying channel to become readable.
+        By default a Connection does not buffer anything.
+        Returns:
+        The int amount of bytes, which have already been received, but not yet been read from the connection
+        """
+        return 0
+
     @staticmethod
     def _check_timeout(timeout):
         """
@@ -451,10 +462,19 @@ class SocketConnection(Connection):
     This is a subclass of the Connection object and therefore a direct implementation of its abstract methods. This
     class uses the network communication via socket objects to ensure the receive/send functionlity guaranteed for
     a Connection object.
+    Notes:
+        Nagle's algorithm is being disabled for TCP sockets. The protocols on top of the connection send many small
+        messages, often two in a row without waiting for an answer in between (like an ACK followed by the next
+        request), where the second one would otherwise be held back until the delayed ACK of the remote side arrives.
     """
     def __init__(self, sock):
         Connection.__init__(self)
         self.sock = sock
+        if sock.family in (socket.AF_INET, socket.AF_INET6) and sock.type == socket.SOCK_STREAM:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
 
     def sendall_bytes(self, bytes_string):
         """
@@ -524,7 +544,7 @@ class SocketConnection(Connection):
             received = self.sock.recv(length - len(data))
 
             if not received:
-                raise EOFError("Only received ({}|{}) bytes from the socket".format(len(bytes), bytes))
+                raise EOFError("Only received ({}|{}) bytes from the socket".format(len(data), length))
 
             # Checking for overall timeout
             time_delta = time.time() - start_time
@@ -565,7 +585,7 @@ class SocketConnection(Connection):
 
             # Checking if there is nothing to receive anymore, before the specified amount was reached
             if not received:
-                raise EOFError("Only received ({}|{}) bytes from the socket".format(len(bytes), bytes))
+                raise EOFError("Only received ({}|{}) bytes from the socket".format(len(data), length))
 
             data += received
 
@@ -612,7 +632,7 @@ class SocketConnection(Connection):
 
             # Checking if there is nothing to receive anymore, before the specified amount was reached
             if not received:
-                raise EOFError("Only received ({}|{}) bytes from the socket".format(len(bytes), bytes))
+                raise EOFError("The connection was closed after receiving {} bytes".format(len(data)))
 
             # Checking for overall timeout
             time_delta = time.time() - start_time
@@ -661,7 +681,7 @@ class SocketConnection(Connection):
 
             # Checking if there is nothing to receive anymore, before the specified amount was reached
             if not received:
-                raise EOFError("Only received ({}|{}) bytes from the socket".format(len(bytes), bytes))
+                raise EOFError("The connection was closed after receiving {} bytes".format(len(data)))
 
             data.append(received)
         # Removing the break character from the data list
@@ -669,3 +689,219 @@ class SocketConnection(Connection):
         # Returning the assembled bytes string
         return b''.join(data)
 
+
+class TLSSocketConnection(SocketConnection):
+    """
+    GENERAL
+    This is a SocketConnection, whose traffic is encrypted with TLS using the ssl module. The given socket has to be
+    connected already, it is being wrapped with the given SSLContext and the TLS handshake is performed right away, so
+    that the connection can be used like any other SocketConnection afterwards, for example for a CommandingClient or
+    a CommandingHandler.
+    The SSLContext should be created once and be shared by all the connections of a side: Creating a context loads
+    the certificates and the trust store, which is expensive, and a server can only resume the sessions, which have
+    been issued with the ticket keys of the same context.
+
+    SESSION RESUMPTION
+    A client can pass the session of a previous connection to the same server, which then lets the handshake resume
+    that session instead of performing a full handshake with the certificate verification and the key exchange. With
+    TLS 1.3 the server sends the session tickets only after the handshake, which is why the session of a connection
+    can not be resumed right after the connect, but only after something has been received. The connection therefore
+    captures its session with the first reception, that yields one with a ticket, and passes it to the session
+    callback. The TLSConnector uses this to remember the sessions of the servers it connects to.
+
+    Notes:
+        Decrypted data is being buffered within the SSL object, which is why the socket may not be readable, although
+        there is data to be received. The 'pending_bytes' method reports the amount of that data.
+    """
+    def __init__(self, sock, context, server_side=False, server_hostname=None, session=None, session_callback=None):
+        SocketConnection.__init__(self, sock)
+        self.context = context
+        self.server_side = server_side
+        self.session_callback = session_callback
+        self.sock = context.wrap_socket(
+            sock,
+            server_side=server_side,
+            server_hostname=server_hostname,
+            session=session
+        )
+        # The session, that can be resumed by a later connection, only the client side has to capture it. With TLS 1.3
+        # even a resumed handshake is followed by a new ticket, which is why the session is captured later on
+        self._session = None
+        self._awaiting_session = not server_side
+        if self._awaiting_session and self.sock.version() != "TLSv1.3":
+            self._capture_session()
+
+    @property
+    def session(self):
+        """
+        The property for the SSLSession of the connection, that can be passed to a later connection to the same server
+        to resume it. None in case the connection did not receive a resumable session (yet)
+        Returns:
+        The SSLSession object or None
+        """
+        return self._session
+
+    @property
+    def session_reused(self):
+        """
+        The property for whether the handshake of the connection has resumed a previous session
+        Returns:
+        The boolean value
+        """
+        return self.sock.session_reused
+
+    def pending_bytes(self):
+        """
+        This method returns the amount of bytes, which have already been decrypted by the SSL object and can be
+        received without the socket being readable
+        Returns:
+        The int amount of bytes
+        """
+        return self.sock.pending()
+
+    def receive_length_bytes(self, length, timeout):
+        """
+        This method will receive a specified length of byte string
+        Args:
+            length: The length of the byte string to receive
+            timeout: The max amount of time for the reception
+
+        Returns:
+        The received byte string
+        """
+        data = SocketConnection.receive_length_bytes(self, length, timeout)
+        if self._awaiting_session:
+            self._capture_session()
+        return data
+
+    def wait_length_bytes(self, length):
+        """
+        This method will wait an indefinite amount of time to receive a bytes string of the specified length
+        Args:
+            length: The length of the byte string to receive
+
+        Returns:
+        The received byte string
+        """
+        data = SocketConnection.wait_length_bytes(self, length)
+        if self._awaiting_session:
+            self._capture_session()
+        return data
+
+    def receive_bytes_until_byte(self, byte, timeout):
+        """
+        This function will receive the bytes string and return the sub string until a special break byte character
+        has occurred in the stream
+        Args:
+            byte: The byte string character after which to return the sub string before
+            timeout: The max time for the reception
+
+        Returns:
+        The received bytes string
+        """
+        data = SocketConnection.receive_bytes_until_byte(self, byte, timeout)
+        if self._awaiting_session:
+            self._capture_session()
+        return data
+
+    def wait_bytes_until_byte(self, byte):
+        """
+        This method will wait an indefinite amount of time until the break byte character has been received and then
+        return the sub string received up to that point.
+        Args:
+            byte: The byte string character
+
+        Returns:
+        The received byte string
+        """
+        data = SocketConnection.wait_bytes_until_byte(self, byte)
+        if self._awaiting_session:
+            self._capture_session()
+        return data
+
+    def _capture_session(self):
+        """
+        This method stores the session of the connection and passes it to the session callback, as soon as it can be
+        resumed. Before TLS 1.3 this is the case right after the handshake, with TLS 1.3 only once a session ticket
+        has been received.
+        Returns:
+        void
+        """
+        session = self.sock.session
+        if session is None or (self.sock.version() == "TLSv1.3" and not session.has_ticket):
+            return
+        self._awaiting_session = False
+        self._session = session
+        if self.session_callback is not None:
+            self.session_callback(session)
+
+
+class TLSConnector:
+    """
+    GENERAL
+    The TLSConnector opens the client side TLSSocketConnections. All the connections share the one SSLContext of the
+    connector and the connector remembers the latest session of every address it has connected to, so that a
+    reconnect to the same server only needs the abbreviated handshake of a resumed session, which saves the
+    certificate verification and a part of the key exchange.
+    The session of an address is only known after the previous connection to it has received something, as the
+    server sends the session tickets after the handshake. A session, that can not be resumed anymore (for example
+    because the server has been restarted), simply leads to a full handshake.
+
+    Example:
+        context = ssl.create_default_context(cafile="ca.pem")
+        connector = TLSConnector(context)
+        connection = connector.connect(("127.0.0.1", 5000))
+        client = CommandingClient(connection, command_context)
+    """
+    def __init__(self, context, resume=True):
+        self.context = context
+        self.resume = resume
+        # The latest session of each address, only updated by the connections to that address
+        self.sessions = {}
+
+    def connect(self, address, timeout=None, server_hostname=None):
+        """
+        This method connects to the given address and performs the TLS handshake, resuming the session of the previous
+        connection to that address, if there is one.
+        Args:
+            address: The address tuple of host and port. A string address is being interpreted as the path of a unix
+                socket
+            timeout: The float amount of seconds the connect and the handshake may take, None to wait indefinitely.
+                The connection itself is blocking without a timeout afterwards
+            server_hostname: The string host name the certificate of the server has to match. By default the host of
+                the address
+
+        Returns:
+        The connected TLSSocketConnection
+        """
+        if isinstance(address, str):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(timeout)
+            try:
+                sock.connect(address)
+            except OSError:
+                sock.close()
+                raise
+        else:
+            sock = socket.create_connection(address, timeout)
+            if server_hostname is None:
+                server_hostname = address[0]
+
+        session = self.sessions.get(address) if self.resume else None
+
+        def remember(received_session):
+            self.sessions[address] = received_session
+
+        try:
+            connection = TLSSocketConnection(
+                sock,
+                self.context,
+                server_hostname=server_hostname,
+                session=session,
+                session_callback=remember
+            )
+        except (OSError, ValueError):
+            sock.close()
+            raise
+        connection.sock.settimeout(None)
+        return connection
@@ -1,3 +1,5 @@
+from network.tracing import get_tracer
+
 import threading
 import pickle
 import time
@@ -175,6 +177,8 @@ class PickleAppendixEncoder(AppendixEncoder):
 
 class FormFrame:
 
+    __slots__ = ("_title", "_body", "_appendix")
+
     def __init__(self, title, body, appendix):
         self._title = title
         self._body = body
@@ -230,18 +234,26 @@ class Form:
     The appendix is special, if it is a string it is being interpreted as already being a json string and it is
     attempted to load the data, any other data type will be attempted to be converted into a json string!
 
+    MEMORY
+    As there can be many thousands of forms queued at the same time, the form does not have an instance dict, but
+    slots for its attributes. Thus no other attributes can be assigned to a form object.
+
     Attributes:
         title: The string title of the Form
         body: The string block, organized by new line characters
         appendix_json: The Json string of the data to be represented by the appendix
         appendix: The actual data object, described by the json string
+        template: The FormTemplate, from which the form has been created, None for a regular form
     """
+    __slots__ = ("title", "body", "appendix", "appendix_encoded", "appendix_encoder", "template")
+
     def __init__(self, title, body, appendix, appendix_encoder=JsonAppendixEncoder):
         self.title = title
         self.body = body
         self.appendix = appendix
         self.appendix_encoded = None
         self.appendix_encoder = appendix_encoder
+        self.template = None
 
         # Checking if the title is a string without a new line, as needed
         self.check_title()
@@ -281,6 +293,9 @@ class Form:
         Returns:
         void
         """
+        tracer = get_tracer()
+        if tracer.enabled:
+            start = time.perf_counter()
         # In case the appendix is a string it is being interpreted as already in json format and thus trying to unjson
         if isinstance(self.appendix, bytes):
             try:
@@ -292,12 +307,16 @@ class Form:
                 raise value_error
             except TypeError as type_error:
                 raise type_error
+            if tracer.enabled:
+                tracer.record("decode_appendix", start, time.perf_counter())
         # All other data types are interpreted as raw data and are being jsoned
         else:
             try:
                 self.appendix_encoded = self.appendix_encoder.encode(self.appendix)
             except ValueError as e:
                 raise e
+            if tracer.enabled:
+                tracer.record("encode_appendix", start, time.perf_counter())
 
     @property
     def empty(self):
@@ -479,6 +498,298 @@ class Form:
         return '\n'.join(string_list)
 
 
+class FormTemplate:
+    """
+    GENERAL
+    A FormTemplate is the precompiled part of forms, which all have the same title and start with the same body lines,
+    while only the remaining body lines and the appendix differ from form to form. The title and the fixed body lines
+    are being checked only once, when the template is created, and are encoded into the chunks to be sent for them
+    once for every separation. Creating a form from the template only appends the varying body lines and encodes the
+    appendix, so the FormSerializer has to adjust and encode only the varying lines for every form.
+    Examples:
+        template = FormTemplate("REQUEST", ["method:get"])
+        form = template.create_form(["path:/index.html"], {"headers": {}})
+
+    SEPARATION COLLISIONS
+    The fixed body lines are checked for a collision with the separation, when they are being encoded for that
+    separation, the varying lines are checked for every form by the FormSerializer.
+
+    Attributes:
+        title: The string title of the forms
+        body: The string of the fixed body lines of the forms
+        appendix_encoder: The AppendixEncoder class for the appendix of the forms
+        encoded_headers: The dict with the list of encoded chunks of the title and the fixed body lines for every
+            tuple (separation, adjust) used so far
+    """
+    def __init__(self, title, body, appendix_encoder=JsonAppendixEncoder):
+        # Creating a form with an empty appendix to check and assemble the title and the body
+        form = Form(title, body, {}, appendix_encoder)
+        self.title = form.title
+        self.body = form.body
+        self.appendix_encoder = appendix_encoder
+        self.encoded_headers = {}
+
+    def create_form(self, body_lines, appendix):
+        """
+        This method creates a new form from the template, whose body consists of the fixed body lines of the template
+        followed by the given lines and which has the given appendix. The title and the body are not being checked
+        again, thus the lines have to be strings.
+        Args:
+            body_lines: The list of string lines, which follow the fixed body lines
+            appendix: The appendix object of the form
+
+        Returns:
+        The Form object
+        """
+        tracer = get_tracer()
+        if tracer.enabled:
+            start = time.perf_counter()
+        form = Form.__new__(Form)
+        form.title = self.title
+        form.body = "\n".join([self.body] + body_lines) if body_lines else self.body
+        form.appendix = appendix
+        form.appendix_encoded = self.appendix_encoder.encode(appendix)
+        form.appendix_encoder = self.appendix_encoder
+        form.template = self
+        if tracer.enabled:
+            tracer.record("encode_appendix", start, time.perf_counter())
+        return form
+
+    def header_chunks(self, separation, adjust=True):
+        """
+        This method returns the chunks of the title and the fixed body lines, as they are being sent with the given
+        separation. The chunks are only encoded for the first form sent with a separation.
+        Raises:
+            ValueError: In case there is a collision of the separation in the body and the adjust flag is not set
+        Args:
+            separation: The string separation between the body and the appendix
+            adjust: The boolean flag of whether to adjust body lines, which collide with the separation
+
+        Returns:
+        The list of byte strings, which must not be modified
+        """
+        chunk_list = self.encoded_headers.get((separation, adjust))
+        if chunk_list is None:
+            body_lines = FormSerializer.adjust_lines(self.body.split("\n"), separation, adjust)
+            chunk_list = [(self.title + "\n").encode()] + [(line + "\n").encode() for line in body_lines]
+            self.encoded_headers[(separation, adjust)] = chunk_list
+        return chunk_list
+
+
+class FormSerializer:
+    """
+    GENERAL
+    The FormSerializer turns a Form object into the sequence of byte chunks, which are being sent over a connection by
+    the form transmission protocol. The protocol sends the title, every individual line of the body, the separation
+    line containing the length of the appendix and the appendix itself, and after each one of those chunks the
+    receiving end replies with an ACK. So the chunks returned by this object have to be sent one after another, always
+    waiting for the ACK in between.
+    Other than the FormTransmitterThread, this object does not do any I/O itself, which means it can be used for non
+    blocking implementations of the protocol as well.
+
+    SEPARATION COLLISIONS:
+    Lines of the body, that start with the separation string are being adjusted by a leading whitespace in case the
+    'adjust' flag is set, otherwise a ValueError is being raised (Same behaviour as the FormTransmitterThread).
+
+    TEMPLATES
+    For a form, which has been created from a FormTemplate, the chunks of the title and the fixed body lines are
+    taken from the template, so only the varying body lines have to be adjusted and encoded.
+    """
+    def __init__(self, form, separation, adjust=True):
+        self.form = form
+        self.separation = separation
+        self.adjust = adjust
+
+    def chunks(self):
+        """
+        This method creates the list of byte strings to be sent for the form. The amount of ACKs, that have to be
+        received in the process equals the length of this list.
+        Raises:
+            ValueError: In case there is a collision of the separation in the body and the adjust flag is not set
+        Returns:
+        The list of byte strings
+        """
+        template = self.form.template
+        if template is None:
+            chunk_list = [(self.form.title + "\n").encode()]
+            body_lines = self.body_lines()
+        else:
+            # Only the lines following the fixed body lines of the template are left to be encoded
+            chunk_list = list(template.header_chunks(self.separation, self.adjust))
+            varying_body = self.form.body[len(template.body) + 1:]
+            body_lines = []
+            if varying_body:
+                body_lines = self.adjust_lines(varying_body.split("\n"), self.separation, self.adjust)
+        for line in body_lines:
+            chunk_list.append((line + "\n").encode())
+        appendix_encoded = self.form.appendix_encoded
+        chunk_list.append("{}{}\n".format(self.separation, len(appendix_encoded)).encode())
+        chunk_list.append(appendix_encoded)
+        return chunk_list
+
+    def body_lines(self):
+        """
+        This method returns the list of the body lines of the form, adjusted for collisions with the separation string
+        Raises:
+            ValueError: In case there is a collision of the separation in the body and the adjust flag is not set
+        Returns:
+        The list of string lines
+        """
+        return self.adjust_lines(self.form.body.split("\n"), self.separation, self.adjust)
+
+    @staticmethod
+    def adjust_lines(body_lines, separation, adjust):
+        """
+        This function adjusts the given body lines, that start with the separation string, by a leading whitespace
+        Raises:
+            ValueError: In case there is a collision of the separation in the body and the adjust flag is not set
+        Args:
+            body_lines: The list of string lines, which is being modified
+            separation: The string separation between the body and the appendix
+            adjust: The boolean flag of whether to adjust the lines or to raise an error for a collision
+
+        Returns:
+        The list of string lines
+        """
+        for i in range(len(body_lines)):
+            if body_lines[i][:len(separation)] == separation:
+                if not adjust:
+                    raise ValueError("There is a collision of the separation string in the form body")
+                body_lines[i] = " " + body_lines[i]
+        return body_lines
+
+
+class FormParser:
+    """
+    GENERAL
+    The FormParser is the counterpart of the FormSerializer. It is being fed with the raw bytes, as they arrive from a
+    connection and incrementally assembles the Form from those. Every time one of the parts of the form (title, a body
+    line, the separation line or the appendix) has been completely received, the receiving end has to reply with an
+    ACK, which is why the feed method returns the amount of ACKs, that have to be sent for the data.
+    Other than the FormReceiverThread, this object does not do any I/O itself and never blocks, which means it can be
+    used by selector and asyncio based implementations of the protocol.
+    The assembly of the form is being reported to the tracer as the phase 'assemble_form'.
+
+    Attributes:
+        buffer: The bytearray with the data, that has been received but not yet been processed
+        finished: The boolean flag of whether the form has been completely received
+        form: The Form object, once it has been completely received, None before that
+    """
+    def __init__(self, separation, appendix_encoder=JsonAppendixEncoder, limit=65536, tracer=None):
+        self.separation = separation
+        self.appendix_encoder = appendix_encoder
+        self.tracer = get_tracer() if tracer is None else tracer
+        # The max amount of bytes for a single line
+        self.limit = limit
+        self.buffer = bytearray()
+        # The state variables of the parsing process
+        self.state = "title"
+        self.finished = False
+        # All the variables holding the relevant values for the form object
+        self.title = None
+        self.body_lines = []
+        self.appendix_length = None
+        self.form = None
+
+    def feed(self, data):
+        """
+        This method adds the given data to the internal buffer and then processes as much of the buffer as possible.
+        Data, that is exceeding the form will be left in the buffer.
+        Raises:
+            OverflowError: In case a line exceeds the limit without a newline character
+            ValueError: In case the separation line is malformed
+        Args:
+            data: The bytes received from the connection
+
+        Returns:
+        The int amount of ACKs, that have to be sent back to the transmitting end
+        """
+        self.buffer += data
+        acks = 0
+        while not self.finished:
+            if self.state == "appendix":
+                if len(self.buffer) < self.appendix_length:
+                    break
+                appendix_bytes = bytes(self.buffer[:self.appendix_length])
+                del self.buffer[:self.appendix_length]
+                self.assemble_form(appendix_bytes)
+                acks += 1
+                continue
+
+            line = self.next_line()
+            if line is None:
+                break
+            if self.state == "title":
+                self.title = line
+                self.state = "body"
+            elif self.checkup_separation(line):
+                self.process_separation(line)
+                self.state = "appendix"
+            else:
+                self.body_lines.append(line)
+            acks += 1
+        return acks
+
+    def next_line(self):
+        """
+        This method removes the next line from the buffer and returns it as a string without the newline character.
+        Raises:
+            OverflowError: In case there is no newline character within the limit
+        Returns:
+        The string line or None, if there is no complete line in the buffer yet
+        """
+        index = self.buffer.find(b"\n")
+        if index == -1:
+            if len(self.buffer) > self.limit:
+                raise OverflowError("The limit of bytes to receive until the line end has been reached")
+            return None
+        line = bytes(self.buffer[:index]).decode()
+        del self.buffer[:index + 1]
+        return line
+
+    def checkup_separation(self, line):
+        """
+        This method returns whether the passed line is the separation line, which has to start with the separation
+        string and be longer than that string alone.
+        Args:
+            line: The string line to check
+
+        Returns:
+        The boolean value of the line being the separation line
+        """
+        return len(line) > len(self.separation) and line.startswith(self.separation)
+
+    def process_separation(self, line):
+        """
+        This method extracts the length of the appendix from the separation line
+        Args:
+            line: The separation line
+
+        Returns:
+        void
+        """
+        length_string = line[len(self.separation):].strip()
+        self.appendix_length = int(length_string)
+
+    def assemble_form(self, appendix_bytes):
+        """
+        This method assembles the Form object from all the received parts and marks the parser as finished
+        Args:
+            appendix_bytes: The encoded appendix, that has been received
+
+        Returns:
+        void
+        """
+        if self.tracer.enabled:
+            start = time.perf_counter()
+        body_string = '\n'.join(self.body_lines)
+        self.form = Form(self.title, body_string, appendix_bytes, appendix_encoder=self.appendix_encoder)
+        if self.tracer.enabled:
+            self.tracer.record("assemble_form", start, time.perf_counter())
+        self.state = "finished"
+        self.finished = True
+
+
 class FormTransmitterThread(threading.Thread):
     """
     GENERAL
@@ -489,16 +800,23 @@ class FormTransmitterThread(threading.Thread):
     the length of the string of the forms appendix.
     In between each sending the receiving end is supposed to be sending an ACK message. In case the ACK is not sent in
     the specified amount of time for the timeout the communication is stopped.
+    The chunks to be sent are being created by a FormSerializer, which means the blocking and the non blocking
+    implementations of the protocol share a single definition of the wire format.
 
     SEPARATION COLLISIONS:
     The separation string is supposed to be a definite sign, that the body of the form is now finished and that the
     appendix starts now. In case the separation string is already the front part of a line in the body of the form
-    that would lead to an error. Through the 'adjust' parameter it can be set, that the body is being searched for
-    ocurrances of the separation string and then adjusted, so that they would not be recognised, by adding a whitespace
-    at the front of the line. In case the adjust is False, the body will be searched for the separation string and
-    an exception risen in case one was found
+    that would lead to an error. Through the 'adjust' parameter it can be set, that the lines of the body are being
+    sent with an additional whitespace at the front of the lines, that contain the separation string, so that they
+    would not be recognised. In case the adjust is False, an exception is risen in case there is a collision.
+    The form object itself is not being modified in either case.
+
+    TRACING
+    The phases of the transmission are being reported to the tracer: 'serialize_form', then for every chunk the
+    sending as 'send_title', 'send_body', 'send_separation' or 'send_appendix' and the following 'wait_ack'. By default
+    the tracer set for the process with 'network.tracing.set_tracer' is being used.
     """
-    def __init__(self, connection, form, separation, timeout=10, adjust=True):
+    def __init__(self, connection, form, separation, timeout=10, adjust=True, tracer=None):
         threading.Thread.__init__(self)
         # The form object to be transmitted over the socket connection
         self.form = form
@@ -509,13 +827,14 @@ class FormTransmitterThread(threading.Thread):
         self.separation = separation
         self.check_separation()
 
-        if adjust:
-            self.adjust_body_string()
-        else:
-            self.check_body_string()
+        # The serializer creating the chunks, checking for a collision right away, in case the body is not adjusted
+        self.serializer = FormSerializer(form, separation, adjust)
+        if not adjust:
+            self.serializer.body_lines()
 
         # The timeout of receiving the ack after a sending
         self.timeout = timeout
+        self.tracer = get_tracer() if tracer is None else tracer
         self.exception = None
         # The state variables of the Thread and the transmission
         self.running = False
@@ -524,12 +843,13 @@ class FormTransmitterThread(threading.Thread):
     def run(self):
         try:
             self.running = True
-            self.send_title()
-            self.wait_ack()
-            self.send_body()
-            self.wait_ack()
-            self.send_appendix()
-            self.wait_ack()
+            if self.tracer.enabled:
+                self.run_traced()
+            else:
+                # Sending the title, the body lines, the separation and the appendix, each one being acknowledged
+                for chunk in self.serializer.chunks():
+                    self.connection.sendall_bytes(chunk)
+                    self.wait_ack()
 
             # Updating the state variables
             self.running = False
@@ -537,33 +857,33 @@ class FormTransmitterThread(threading.Thread):
         except Exception as exception:
             self.exception = exception
 
-    def send_body(self):
+    def run_traced(self):
         """
-        This method simply pushes the complete body string into the socket connection
+        This method sends the chunks of the form just like the run method, but reports every phase to the tracer
         Returns:
         void
         """
-        # Sending the individual lines of the body of the form over the socket
-        body_string_lines = self.form.body.split("\n")
-        for line in body_string_lines:
-            self.connection.sendall_string(line+"\n")
+        start = time.perf_counter()
+        chunks = self.serializer.chunks()
+        end = time.perf_counter()
+        self.tracer.record("serialize_form", start, end)
+        for index, chunk in enumerate(chunks):
+            if index == 0:
+                phase = "send_title"
+            elif index == len(chunks) - 1:
+                phase = "send_appendix"
+            elif index == len(chunks) - 2:
+                phase = "send_separation"
+            else:
+                phase = "send_body"
+            start = end
+            self.connection.sendall_bytes(chunk)
+            end = time.perf_counter()
+            self.tracer.record(phase, start, end)
+            start = end
             self.wait_ack()
-        # Sending the separation at last
-        separator = self.assemble_separator()
-        self.connection.sendall_string(separator+"\n")
-
-    def send_title(self):
-        title = self.form.title + "\n"
-        self.connection.sendall_string(title)
-
-    def send_appendix(self):
-        """
-        This method will send the appendix in form of the json string
-        Returns:
-        void
-        """
-        appendix_encoded = self.form.appendix_encoded
-        self.connection.sendall_bytes(appendix_encoded)
+            end = time.perf_counter()
+            self.tracer.record("wait_ack", start, end)
 
     def wait_ack(self):
         """
@@ -616,48 +936,6 @@ class FormTransmitterThread(threading.Thread):
         else:
             raise TypeError("The separation has to be a string")
 
-    def check_body_string(self):
-        """
-        Checking the body string for a occurance of the separation string and raising an error in case the is a
-        collision of the separation string in the body of the form
-        Returns:
-        void
-        """
-        form_body_string = self.form.body
-        form_body_lines = form_body_string.split("\n")
-        for i in range(len(form_body_lines)):
-            if form_body_lines[i][:len(self.separation)] == self.separation:
-                raise ValueError("There is a collision of the separation string in the form body")
-
-    def assemble_separator(self):
-        """
-        This method will assemble the string to send as separation from the
-        Returns:
-        The string consisting of the separation string and the length of the appendix
-        """
-        appendix = self.form.appendix_encoded
-        appendix_length = len(appendix)
-        return ''.join([self.separation, str(appendix_length)])
-
-    def adjust_body_string(self):
-        """
-        This method adjusts the body string of the form to transmit by appending a whitespace character to the front
-        of all the lines, that match the separation string. If lines from the form body, this would cause an error
-        in the loading of the appendix.
-        Notes:
-            This method assumes, that the separation and the form attribute of the object is correctly set, so this
-            method is not to be called in before initializing those parameters
-        Returns:
-        void
-        """
-        form_body_string = self.form.body
-        form_body_lines = form_body_string.split("\n")
-        for i in range(len(form_body_lines)):
-            if form_body_lines[i][:len(self.separation)] == self.separation:
-                form_body_lines[i] = " " + form_body_lines[i]
-        form_body_string = "\n".join(form_body_lines)
-        self.form.body = form_body_string
-
     def raise_exception(self):
         """
         In case the Thread has raised an exception, this exception will be saved in the designated 'exception'
@@ -671,8 +949,18 @@ class FormTransmitterThread(threading.Thread):
 
 
 class FormReceiverThread(threading.Thread):
-
-    def __init__(self, connection, separation, timeout=10):
+    """
+    GENERAL
+    This is a Thread. It is the counterpart of the FormTransmitterThread and receives a Form from the connection,
+    sending an ACK after every part of the form. The received data is being assembled into the form by a FormParser,
+    which means the blocking and the non blocking implementations of the protocol share a single definition of the
+    wire format.
+    The appendix of the received form is being decoded with the given appendix encoder, which has to be the one the
+    form was created with on the transmitting end.
+    The phases of the reception are being reported to the tracer: 'receive_title', 'receive_body' (which includes the
+    separation line), 'receive_appendix' and 'send_ack' for every part and 'assemble_form' at the end.
+    """
+    def __init__(self, connection, separation, timeout=10, appendix_encoder=JsonAppendixEncoder, tracer=None):
         threading.Thread.__init__(self)
         # The socket and the wrapped socket
         self.connection = connection
@@ -681,30 +969,37 @@ class FormReceiverThread(threading.Thread):
 
         # The timeout of receiving the ack after a sending
         self.timeout = timeout
-        self.start_time = None
+        self.tracer = get_tracer() if tracer is None else tracer
         self.exception = None
         # The state variables of the Thread and the transmission
         self.running = False
         self.finished = False
-        # The variable for the length of the appendix to receive
-        self.appendix_length = None
-        # All the variables holding the relevant values for the form object
-        self.title = None
-        self.body = None
-        self.appendix = None
+        # The parser assembling the form from the received data
+        self.parser = FormParser(separation, appendix_encoder, tracer=self.tracer)
         self.form = None
 
     def run(self):
         # Catching every exception and in case there is one putting it into the attribute variable
         try:
             self.running = True
-            self.receive_title()
-            self.send_ack()
-            self.receive_body()
-            self.send_ack()
-            self.receive_appendix()
-            self.send_ack()
-            self.assemble_form()
+            tracing = self.tracer.enabled
+            while not self.parser.finished:
+                if tracing:
+                    phase = "receive_" + self.parser.state
+                    start = time.perf_counter()
+                    part = self.receive_part()
+                    self.tracer.record(phase, start, time.perf_counter())
+                else:
+                    part = self.receive_part()
+                acks = self.parser.feed(part)
+                for i in range(acks):
+                    if tracing:
+                        start = time.perf_counter()
+                        self.send_ack()
+                        self.tracer.record("send_ack", start, time.perf_counter())
+                    else:
+                        self.send_ack()
+            self.form = self.parser.form
             self.running = False
             self.finished = True
         except Exception as exception:
@@ -724,149 +1019,17 @@ class FormReceiverThread(threading.Thread):
                 self.raise_exception()
         return self.form
 
-    def receive_title(self):
-        """
-        This method receives a single line and assigns that line as the title of the form. Because it does so, this
-        method has to be called as the first method when beginning a form transmission.
-        Returns:
-        void
-        """
-        line = self.receive_line()
-        self.title = line
-
-    def receive_body(self):
-        """
-        This method will receive the body of the form, by receiving line for line until the separation line has been
-        received. The separation line will then be processed into the length of the appendix and the received lines
-        will be processed into the body string
-        Returns:
-        void
-        """
-        is_separation = False
-        line_list = []
-        line = None
-        # Receiving new lines from the socket, until the separation line has been received
-        while not is_separation:
-            line = self.receive_line()
-            is_separation = self.checkup_separation(line)
-            if not is_separation:
-                line_list.append(line)
-                # Sending the ack
-                self.send_ack()
-        # If the while loop exits, that means the separation has been sent and is now the last line that was received
-        # which means the string is still inside the line variable
-        self.process_separation(line)
-
-        # Assembling the line list into the body string and assigning it to the body
-        body_string = '\n'.join(line_list)
-        self.body = body_string
-
-    def receive_appendix(self):
-        """
-        This method will receive the appendix data from the socket, by receiving exactly as many bytes as the length
-        extracted from the separation string
-        Returns:
-        void
-        """
-        # Receiving as many bytes as the length was dictated by the separation string
-        appendix_bytes = self.connection.receive_length_bytes(self.appendix_length, timeout=self.timeout)
-        appendix_string = appendix_bytes
-        self.appendix = appendix_string
-
-    def receive_line(self):
-        """
-        This method will receive a line from the socket as a bytes string object and then turn the byte string back
-        into a regular string, assuming the standard encoding
-        Returns:
-        The string line, received from the socket
-        """
-        return self.connection.receive_line(self.timeout)
-
-    def process_separation(self, line):
-        """
-        This method will take the separation line, check it for its validity and in case it is correct extract the
-        appendix length from the string and then assign this length to the length attribute of this object
-        Args:
-            line: the string line to be processed for the length of the appendix
-
-        Returns:
-        void
-        """
-        # Checking if this actaully is the separation string line
-        self.check_separation(line)
-        # Removing the actual separation string from the line
-        length_string = line.replace(self.separation, "")
-        length_string.strip()
-        # Turning the string into a number
-        length = int(length_string)
-        # Assigning that length value to the designated attribute of this object
-        self.appendix_length = length
-
-    def assemble_form(self):
-        """
-        This method will use all the data received through the socket and saved in the objects attributes to build a
-        new form object.
-        Raises:
-            ValueError: In case the form has not been completely received yet
-        Returns:
-        void
-        """
-        # Checking if all the data has been received and if it is save to assemble a Form object from that data
-        self.check_form()
-        # Building the Form object from the received data
-        form = Form(self.title, self.body, self.appendix)
-        self.form = form
-
-    def check_separation(self, line):
-        """
-        This method checks, whether the passed object is a string and then also checks if that string is actually the
-        separation string by calling the checkup method for the separation string. An exception will be risen in case
-        either one of the conditions is not met.
-        This method is used to assure, that the correct object is being used for further processing
-        Raises:
-            ValueError
-            TypeError
-        Args:
-            line: The string line, which is supposed to be the separation string
-
-        Returns:
-        void
-        """
-        # Raising an error, in case the passed object is not a string or not the separation string
-        if not isinstance(line, str):
-            raise TypeError("The passed line is not even a string")
-        if not self.checkup_separation(line):
-            raise ValueError("The passed line is not the separation string")
-
-    def check_form(self):
-        """
-        This method checks if all the attribute of this object, that were supposed to contain the form data actually
-        contain data other than None and thus checking if it is save to assemble a form object.
-        Raises:
-            ValueError
-        Returns:
-        void
-        """
-        if self.title is None or self.body is None or self.appendix is None:
-            raise ValueError("The form data has not been completely received")
-
-    def checkup_separation(self, line):
+    def receive_part(self):
         """
-        This method checks whether the the passed line string is the separation line, that is meant to separate the
-        body from the appendix and returns the boolean value of that being the case ot not
-        Args:
-            line: The string of the receuved line to check
-
+        This method receives the next part of the form from the connection, which is the appendix in case the parser
+        already knows its length and the next line otherwise. As the transmitting end waits for the ACK after every
+        part, nothing beyond the current part is being received.
         Returns:
-        The boolean value of the line being the separation line or not
+        The received bytes, including the newline character for a line
         """
-        # The first condition of the line being the separation is it being longer than the sep string alone
-        if len(line) > len(self.separation):
-            separation_length = len(self.separation)
-            if line[:separation_length] == self.separation:
-                return True
-        # In case one of the conditions was not given, False is returned
-        return False
+        if self.parser.state == "appendix":
+            return self.connection.receive_length_bytes(self.parser.appendix_length, timeout=self.timeout)
+        return self.connection.receive_bytes_until_byte(b"\n", self.timeout) + b"\n"
 
     def send_ack(self):
         """
@@ -0,0 +1,410 @@
+"""
+The load generator:
+A command line tool, which puts a commanding server under load, to size deployments and to catch regressions of the
+commanding protocol before rollout. It either starts a local server in a separate process or connects to a running
+one and drives it with the given amount of CommandingClients, each one issuing calls from the given amount of Threads.
+
+The load is generated in one of two ways:
+- closed loop: Every Thread issues the next call as soon as the previous one returned, which measures the maximum
+  throughput
+- open loop: The calls are being issued at the target rate, spread evenly over all the Threads. The latency of a call
+  is measured from the time it was scheduled, not from the time it was actually issued, so that a server, which falls
+  behind, shows in the latencies instead of silently lowering the rate (coordinated omission)
+
+By default the built-in LoadCommandContext is being served, whose 'echo' command returns a result of the requested
+size. Any other command context can be given as 'module:Class', the class has to be importable by the server process
+as well as the load generator, as both sides of a connection need the same command set.
+
+The report contains the throughput, the latency percentiles, the errors by exception class and the CPU time and
+memory of the load generator and of the local server, as well as the metrics of the served commands.
+
+Usage:
+    python -m network.loadgen --clients 4 --threads 2 --duration 10
+    python -m network.loadgen --server selector --rate 2000 --argument-size 1024 --result-size 65536
+    python -m network.loadgen --connect 10.0.0.5:7000 --context mypackage.contexts:MyContext --command query
+"""
+from network.protocol.commanding import CommandContext
+from network.protocol.commanding import CommandingHandler
+from network.protocol.commanding import CommandingClient
+from network.protocol.commanding import CommandingServer
+from network.connection import SocketConnection
+
+import multiprocessing
+import importlib
+import threading
+import argparse
+import resource
+import socket
+import json
+import time
+
+
+class LoadCommandContext(CommandContext):
+    """
+    The default command context of the load generator
+    """
+    def command_echo(self, payload, result_size=None):
+        """
+        This command returns the payload or a string of the given size
+        Args:
+            payload: Any value
+            result_size: The int length of the string to return instead of the payload
+
+        Returns:
+        The payload or the string
+        """
+        if result_size is None:
+            return payload
+        return "x" * result_size
+
+    def command_sleep(self, duration):
+        """
+        This command blocks for the given duration, to simulate a slow command
+        Args:
+            duration: The float amount of seconds
+
+        Returns:
+        The duration
+        """
+        time.sleep(duration)
+        return duration
+
+
+def load_context_class(spec):
+    """
+    This function imports the command context class given as 'module:Class'
+    Args:
+        spec: The string specification of the class, None for the LoadCommandContext
+
+    Returns:
+    The CommandContext subclass
+    """
+    if spec is None:
+        return LoadCommandContext
+    module_name, class_name = spec.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+def parse_address(string):
+    """
+    This function parses an address given as 'host:port'
+    Args:
+        string: The address string
+
+    Returns:
+    The tuple (host, port)
+    """
+    host, port = string.rsplit(":", 1)
+    return host, int(port)
+
+
+def usage():
+    """
+    This function returns the resource usage of the current process
+    Returns:
+    The dict with the keys cpu_user_seconds, cpu_system_seconds and max_rss_bytes
+    """
+    rusage = resource.getrusage(resource.RUSAGE_SELF)
+    return {
+        "cpu_user_seconds": rusage.ru_utime,
+        "cpu_system_seconds": rusage.ru_stime,
+        # The max resident set size is reported in kilobytes on linux
+        "max_rss_bytes": rusage.ru_maxrss * 1024
+    }
+
+
+def serve(pipe, mode, context_spec):
+    """
+    The target function of the local server process. It reports the address of the server through the pipe, serves
+    until it receives anything through the pipe and then reports its resource usage and the metrics of the commands
+    Args:
+        pipe: The duplex multiprocessing pipe to the load generator
+        mode: The string mode of the server, either 'threaded' or 'selector'
+        context_spec: The string specification of the command context class or None
+
+    Returns:
+    void
+    """
+    command_context = load_context_class(context_spec)()
+    if mode == "selector":
+        server = CommandingServer(("127.0.0.1", 0), command_context, backlog=1024)
+        server.daemon = True
+        server.start()
+        pipe.send(server.address)
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(1024)
+        thread = threading.Thread(target=accept_handlers, args=(sock, command_context), daemon=True)
+        thread.start()
+        pipe.send(sock.getsockname())
+
+    start_usage = usage()
+    pipe.recv()
+    end_usage = usage()
+    end_usage["cpu_user_seconds"] -= start_usage["cpu_user_seconds"]
+    end_usage["cpu_system_seconds"] -= start_usage["cpu_system_seconds"]
+    pipe.send({"usage": end_usage, "metrics": command_context.metrics.snapshot()})
+
+
+def accept_handlers(sock, command_context):
+    """
+    The target function of the accepting Thread of the threaded server, which starts a CommandingHandler for every
+    accepted connection
+    Args:
+        sock: The listening socket
+        command_context: The command context object to be served
+
+    Returns:
+    void
+    """
+    while True:
+        connection, address = sock.accept()
+        handler = CommandingHandler(SocketConnection(connection), command_context)
+        handler.daemon = True
+        handler.start()
+
+
+class LoadWorker(threading.Thread):
+    """
+    A Thread issuing calls through a CommandingClient, which it might share with other workers. In the closed loop the
+    worker issues the calls back to back, in the open loop at the given interval, starting at the given offset.
+    The latencies of the calls issued after the warmup are being recorded, as well as the exceptions of the failed
+    calls.
+    """
+    def __init__(self, client, call, interval, offset, start_time, warmup_time, end_time):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.client = client
+        self.call = call
+        self.interval = interval
+        self.offset = offset
+        self.start_time = start_time
+        self.warmup_time = warmup_time
+        self.end_time = end_time
+        self.latencies = []
+        self.errors = {}
+
+    def run(self):
+        command_name, pos_args, kw_args = self.call
+        scheduled_time = self.start_time + self.offset
+        while True:
+            if self.interval is None:
+                scheduled_time = time.perf_counter()
+            else:
+                # Waiting for the scheduled time of the next call in the open loop, a worker, which is behind
+                # schedule, issues the call right away
+                delay = scheduled_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if scheduled_time >= self.end_time:
+                return
+            try:
+                self.client.execute_command(command_name, pos_args, kw_args)
+            except Exception as exception:
+                name = exception.__class__.__name__
+                if scheduled_time >= self.warmup_time:
+                    self.errors[name] = self.errors.get(name, 0) + 1
+                # A client, which has lost its connection fails every following call, the worker stops then
+                if not self.client.running:
+                    return
+            else:
+                if scheduled_time >= self.warmup_time:
+                    self.latencies.append(time.perf_counter() - scheduled_time)
+            if self.interval is not None:
+                scheduled_time += self.interval
+
+
+def percentiles(latencies):
+    """
+    This function returns the percentiles of the given latencies
+    Args:
+        latencies: The list of float latencies
+
+    Returns:
+    The dict with the percentiles p50, p90, p99, p999 and the max in seconds, empty in case there are no latencies
+    """
+    if len(latencies) == 0:
+        return {}
+    latencies = sorted(latencies)
+    result = {}
+    for name, fraction in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99), ("p999", 0.999)):
+        result["{}_seconds".format(name)] = latencies[min(int(len(latencies) * fraction), len(latencies) - 1)]
+    result["max_seconds"] = latencies[-1]
+    return result
+
+
+def build_call(args):
+    """
+    This function builds the call, which is being issued by the workers, from the command line arguments
+    Args:
+        args: The parsed arguments
+
+    Returns:
+    The tuple (command_name, pos_args, kw_args)
+    """
+    if args.arguments is not None:
+        return args.command, json.loads(args.arguments), json.loads(args.kwargs)
+    kw_args = json.loads(args.kwargs)
+    if args.command == "echo" and args.context is None and args.result_size is not None:
+        kw_args["result_size"] = args.result_size
+    return args.command, ["x" * args.argument_size], kw_args
+
+
+def run_load(address, context_class, call, clients, threads, rate, duration, warmup):
+    """
+    This function generates the load on the server with the given address
+    Args:
+        address: The tuple (host, port) of the server
+        context_class: The CommandContext subclass
+        call: The tuple (command_name, pos_args, kw_args) of the call to issue
+        clients: The int amount of CommandingClients, each one with its own connection
+        threads: The int amount of worker Threads per client
+        rate: The float target rate of calls per second, None for the closed loop
+        duration: The float amount of seconds to measure
+        warmup: The float amount of seconds before the measurement, whose calls are not being recorded
+
+    Returns:
+    The dict with the results
+    """
+    command_context = context_class()
+    client_list = []
+    for i in range(clients):
+        client = CommandingClient(SocketConnection(socket.create_connection(address)), command_context, queue_size=0)
+        client.daemon = True
+        client.start()
+        client_list.append(client)
+
+    worker_count = clients * threads
+    interval = None if rate is None else worker_count / rate
+    start_time = time.perf_counter() + 0.1
+    warmup_time = start_time + warmup
+    end_time = warmup_time + duration
+    workers = []
+    for index in range(worker_count):
+        # Spreading the calls of the open loop evenly, so that the workers do not issue their calls at the same time
+        offset = 0 if interval is None else interval * index / worker_count
+        worker = LoadWorker(client_list[index % clients], call, interval, offset, start_time, warmup_time, end_time)
+        worker.start()
+        workers.append(worker)
+
+    start_usage = usage()
+    for worker in workers:
+        worker.join()
+    end_usage = usage()
+    for client in client_list:
+        client.running = False
+    for client in client_list:
+        client.join()
+        client.connection.sock.close()
+
+    latencies = [latency for worker in workers for latency in worker.latencies]
+    errors = {}
+    for worker in workers:
+        for name, count in worker.errors.items():
+            errors[name] = errors.get(name, 0) + count
+    return {
+        "clients": clients,
+        "threads": threads,
+        "mode": "closed" if rate is None else "open",
+        "target_rate": rate,
+        "duration_seconds": duration,
+        "calls": len(latencies),
+        "errors": errors,
+        "calls_per_second": len(latencies) / duration,
+        "latency": percentiles(latencies),
+        "usage": {
+            "cpu_user_seconds": end_usage["cpu_user_seconds"] - start_usage["cpu_user_seconds"],
+            "cpu_system_seconds": end_usage["cpu_system_seconds"] - start_usage["cpu_system_seconds"],
+            "max_rss_bytes": end_usage["max_rss_bytes"]
+        }
+    }
+
+
+def format_report(result):
+    """
+    This function formats the results for the terminal
+    Args:
+        result: The dict with the results
+
+    Returns:
+    The string report
+    """
+    lines = [
+        "{} loop, {} clients x {} threads, {:.1f} s".format(
+            result["mode"], result["clients"], result["threads"], result["duration_seconds"]
+        ),
+        "throughput: {:.1f} calls/s ({} calls, {} errors)".format(
+            result["calls_per_second"], result["calls"], sum(result["errors"].values())
+        )
+    ]
+    if result["target_rate"] is not None:
+        lines.append("target rate: {:.1f} calls/s".format(result["target_rate"]))
+    if len(result["latency"]) != 0:
+        lines.append("latency: " + ", ".join(
+            "{} {:.3f} ms".format(name[:-len("_seconds")], value * 1000) for name, value in result["latency"].items()
+        ))
+    for name, count in sorted(result["errors"].items()):
+        lines.append("error {}: {}".format(name, count))
+    for side in ("usage", "server_usage"):
+        if side in result:
+            usage_dict = result[side]
+            lines.append("{}: cpu user {:.2f} s, system {:.2f} s, max rss {:.1f} MB".format(
+                "client" if side == "usage" else "server", usage_dict["cpu_user_seconds"],
+                usage_dict["cpu_system_seconds"], usage_dict["max_rss_bytes"] / 1024 / 1024
+            ))
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for commanding servers")
+    parser.add_argument("--connect", help="The address host:port of a running server, by default a local one")
+    parser.add_argument("--server", default="threaded", choices=["threaded", "selector"],
+                        help="The kind of the local server")
+    parser.add_argument("--context", help="The command context class as module:Class")
+    parser.add_argument("--command", default="echo")
+    parser.add_argument("--arguments", help="The JSON list of the positional arguments of the command")
+    parser.add_argument("--kwargs", default="{}", help="The JSON object of the keyword arguments of the command")
+    parser.add_argument("--argument-size", type=int, default=16, help="The length of the argument of 'echo'")
+    parser.add_argument("--result-size", type=int, help="The length of the result of 'echo'")
+    parser.add_argument("--clients", type=int, default=1)
+    parser.add_argument("--threads", type=int, default=1, help="The amount of calling Threads per client")
+    parser.add_argument("--rate", type=float, help="The target rate of calls per second, closed loop by default")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--warmup", type=float, default=1)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    context_class = load_context_class(args.context)
+    call = build_call(args)
+    process = None
+    if args.connect is None:
+        pipe, child_pipe = multiprocessing.Pipe()
+        process = multiprocessing.Process(target=serve, args=(child_pipe, args.server, args.context), daemon=True)
+        process.start()
+        address = pipe.recv()
+    else:
+        address = parse_address(args.connect)
+
+    try:
+        result = run_load(
+            address, context_class, call, args.clients, args.threads, args.rate, args.duration, args.warmup
+        )
+        if process is not None:
+            pipe.send("stop")
+            server_report = pipe.recv()
+            result["server_usage"] = server_report["usage"]
+            result["server_metrics"] = server_report["metrics"]
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join()
+
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(format_report(result))
+
+
+if __name__ == "__main__":
+    main()
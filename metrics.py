@@ -0,0 +1,254 @@
+"""
+The metrics registry:
+The MetricsRegistry collects the operational numbers of the commands executed on the handler side: The amount of
+calls, the errors by the class of the exception, and histograms of the execution time, the time a call waited before
+its execution and the sizes of the request and response appendices.
+
+As the registry is being updated by every call of every handler Thread, the updates must not contend for a lock.
+Therefore every Thread writes into its own shard, which is only created once per Thread, under the lock. A snapshot
+merges the shards of all the Threads, the values of a Thread, which is updating its shard at the same time, might be
+off by that single update.
+"""
+import threading
+import bisect
+
+
+class MetricsShard:
+    """
+    The metrics of a single Thread. The counters map the tuple (metric, command, exception) to the int count, the
+    histograms map the tuple (metric, command) to the list of the counts per bucket, where the last bucket counts the
+    values above all the bounds, followed by the sum of all the values.
+    """
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+
+
+class MetricsRegistry:
+    """
+    GENERAL
+    The registry of the per command metrics. The metrics are being updated with 'count_call', 'count_error' and
+    'observe' and exported either as a nested dict with 'snapshot' or as the text format of prometheus with
+    'prometheus'.
+
+    METRICS
+    - calls_total: The amount of executed calls per command
+    - errors_total: The amount of failed calls per command and exception class
+    - execution_seconds: The histogram of the execution times per command
+    - queue_wait_seconds: The histogram of the times between the reception of the call and the start of its execution
+    - request_bytes: The histogram of the sizes of the encoded appendices of the command forms
+    - response_bytes: The histogram of the sizes of the encoded appendices of the response forms
+
+    SHARDS
+    Every Thread updates its own MetricsShard, which is kept in a thread local. Thus the updates do not need a lock
+    and the only contention is the creation of the shard of a new Thread. The shards of finished Threads, like the
+    handlers of closed connections, are being folded into a single retired shard on the next merge.
+    """
+    # The upper bounds of the buckets of the histograms
+    duration_buckets = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+    size_buckets = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+    histogram_buckets = {
+        "execution_seconds": duration_buckets,
+        "queue_wait_seconds": duration_buckets,
+        "request_bytes": size_buckets,
+        "response_bytes": size_buckets
+    }
+
+    def __init__(self, prefix="commanding"):
+        self.prefix = prefix
+        # The tuples (thread, shard) of the shards in use and the shard, which holds the values of finished Threads
+        self.shards = []
+        self.retired = MetricsShard()
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def count_call(self, command_name):
+        """
+        This method counts a call of the given command
+        Args:
+            command_name: The string name of the command
+
+        Returns:
+        void
+        """
+        counters = self.shard().counters
+        key = ("calls_total", command_name, None)
+        counters[key] = counters.get(key, 0) + 1
+
+    def count_error(self, command_name, exception):
+        """
+        This method counts a failed call of the given command, by the class of the exception
+        Args:
+            command_name: The string name of the command
+            exception: The exception raised by the command
+
+        Returns:
+        void
+        """
+        counters = self.shard().counters
+        key = ("errors_total", command_name, exception.__class__.__name__)
+        counters[key] = counters.get(key, 0) + 1
+
+    def observe(self, metric, command_name, value):
+        """
+        This method adds a value to the histogram of the given metric and command
+        Args:
+            metric: The string name of the histogram metric, one of the keys of 'histogram_buckets'
+            command_name: The string name of the command
+            value: The float value
+
+        Returns:
+        void
+        """
+        buckets = self.histogram_buckets[metric]
+        histograms = self.shard().histograms
+        key = (metric, command_name)
+        try:
+            histogram = histograms[key]
+        except KeyError:
+            histogram = histograms[key] = [0] * (len(buckets) + 1) + [0]
+        histogram[bisect.bisect_left(buckets, value)] += 1
+        histogram[-1] += value
+
+    def shard(self):
+        """
+        This method returns the shard of the current Thread, creating it on the first call of the Thread
+        Returns:
+        The MetricsShard object
+        """
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = MetricsShard()
+            with self.lock:
+                self.shards.append((threading.current_thread(), shard))
+            self._local.shard = shard
+            return shard
+
+    def merged(self):
+        """
+        This method merges the shards of all the Threads
+        Returns:
+        The tuple (counters, histograms) of the merged dicts, with the same structure as within the shards
+        """
+        counters = {}
+        histograms = {}
+        with self.lock:
+            for thread, shard in [entry for entry in self.shards if not entry[0].is_alive()]:
+                self._merge(shard, self.retired.counters, self.retired.histograms)
+                self.shards.remove((thread, shard))
+            for shard in [shard for thread, shard in self.shards] + [self.retired]:
+                self._merge(shard, counters, histograms)
+        return counters, histograms
+
+    @staticmethod
+    def _merge(shard, counters, histograms):
+        """
+        This method adds the values of the given shard to the given dicts
+        Args:
+            shard: The MetricsShard to add
+            counters: The dict of the counters to add to
+            histograms: The dict of the histograms to add to
+
+        Returns:
+        void
+        """
+        # Copying the dicts first, as the owning Thread might add keys in the meantime
+        for key, count in shard.counters.copy().items():
+            counters[key] = counters.get(key, 0) + count
+        for key, histogram in shard.histograms.copy().items():
+            merged = histograms.setdefault(key, [0] * len(histogram))
+            for index, value in enumerate(list(histogram)):
+                merged[index] += value
+
+    def snapshot(self):
+        """
+        This method returns the current values of all the metrics as a dict, with the command names as keys and
+        dicts as values, which contain:
+        - calls: The int amount of calls
+        - errors: The dict with the exception class names as keys and the int amounts of errors as values
+        - For every histogram with values: A dict with the keys count, sum and buckets, the latter being a dict with
+          the upper bounds as keys and the cumulative counts as values, the last bound being float("inf")
+        Returns:
+        The dict snapshot
+        """
+        counters, histograms = self.merged()
+        snapshot = {}
+        for (metric, command_name, exception_name), count in counters.items():
+            entry = snapshot.setdefault(command_name, {"calls": 0, "errors": {}})
+            if metric == "calls_total":
+                entry["calls"] += count
+            else:
+                entry["errors"][exception_name] = count
+        for (metric, command_name), histogram in histograms.items():
+            entry = snapshot.setdefault(command_name, {"calls": 0, "errors": {}})
+            bounds = list(self.histogram_buckets[metric]) + [float("inf")]
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(bounds, histogram[:-1]):
+                cumulative += count
+                buckets[bound] = cumulative
+            entry[metric] = {"count": cumulative, "sum": histogram[-1], "buckets": buckets}
+        return snapshot
+
+    def prometheus(self):
+        """
+        This method exports the current values of all the metrics in the text exposition format of prometheus
+        Returns:
+        The string with the lines of the metrics
+        """
+        counters, histograms = self.merged()
+        lines = []
+        for metric in ("calls_total", "errors_total"):
+            keys = sorted((key for key in counters if key[0] == metric), key=lambda key: (key[1], key[2] or ""))
+            if len(keys) == 0:
+                continue
+            lines.append("# TYPE {}_{} counter".format(self.prefix, metric))
+            for key in keys:
+                labels = {"command": key[1]}
+                if key[2] is not None:
+                    labels["exception"] = key[2]
+                lines.append("{}_{}{{{}}} {}".format(self.prefix, metric, self._labels(labels), counters[key]))
+        for metric, bounds in self.histogram_buckets.items():
+            keys = sorted(key for key in histograms if key[0] == metric)
+            if len(keys) == 0:
+                continue
+            name = "{}_{}".format(self.prefix, metric)
+            lines.append("# TYPE {} histogram".format(name))
+            for key in keys:
+                histogram = histograms[key]
+                cumulative = 0
+                for bound, count in zip(list(bounds) + ["+Inf"], histogram[:-1]):
+                    cumulative += count
+                    labels = self._labels({"command": key[1], "le": str(bound)})
+                    lines.append("{}_bucket{{{}}} {}".format(name, labels, cumulative))
+                labels = self._labels({"command": key[1]})
+                lines.append("{}_sum{{{}}} {}".format(name, labels, histogram[-1]))
+                lines.append("{}_count{{{}}} {}".format(name, labels, cumulative))
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """
+        This method resets all the metrics
+        Returns:
+        void
+        """
+        with self.lock:
+            for thread, shard in self.shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+            self.retired = MetricsShard()
+
+    @staticmethod
+    def _labels(labels):
+        """
+        This method formats the given labels for the prometheus text format, escaping the values
+        Args:
+            labels: The dict of the string label names and values
+
+        Returns:
+        The string of the comma separated labels
+        """
+        return ",".join('{}="{}"'.format(
+            name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        ) for name, value in labels.items())
@@ -15,7 +15,16 @@ This kind of polling service can be build in two main ways:
   also features the possibility to put a threading Lock on the connection. And also if there is a big number of
   connections to contain a polling service it would be problematic for the performance to maintain a big number of
   mostly idle Threads, that just count the time till the next poll...
+  The PollingScheduler solves this: It drives any number of Poller objects from a single Thread, which keeps their
+  next due times in a heap and only wakes up, when the next poll is actually due. The polls themselves are being
+  performed by a small pool of worker Threads.
 """
+import itertools
+import threading
+import numbers
+import random
+import heapq
+import queue
 import time
 
 
@@ -105,9 +114,19 @@ class GenericPoller(Poller):
             object as the parameter. This function then raises a TimeoutError in case the poll was unsuccessful, which
             is then being risen from within the 'poll' call of the Poller object
         _interval: The actual numeric interval value, which holds the current interval to check for
+        idle_function: The optional function without parameters, which returns the seconds since the last traffic on
+            the connection. In case the traffic within the current interval already proved the liveness, the poll
+            is being skipped
+        skipped: The int amount of polls, that have been skipped
+    Notes:
+        The interval generator may also be a function, which simply returns the next numeric value on every call
     """
-    def __init__(self, connection, interval_generator, polling_function):
+    def __init__(self, connection, interval_generator, polling_function, idle_function=None):
         self.interval_generator = interval_generator
+        self.idle_function = idle_function
+        self.skipped = 0
+        # The iterator created by calling the generator function, the next intervals are being taken from it
+        self._intervals = None
         interval = self._next_interval()
         self.keep_interval = True
         Poller.__init__(self, connection, interval, polling_function)
@@ -115,11 +134,16 @@ class GenericPoller(Poller):
     def poll(self):
         """
         This method will call the function, that was specified as the poll instruction with the connection object as
-        the parameter.
+        the parameter. The poll is being skipped, in case the idle function shows, that there was traffic on the
+        connection within the current interval.
         Returns:
-        void
+        The boolean value of whether the poll has actually been performed
         """
+        if self.idle_function is not None and self.idle_function() < self.interval:
+            self.skipped += 1
+            return False
         self.poll_function(self.connection)
+        return True
 
     def is_interval_match(self, interval, update=False):
         """
@@ -210,12 +234,21 @@ class GenericPoller(Poller):
 
     def _next_interval(self):
         """
-        This function will simply call the interval generator of the Poller and therefore get the next interval, that
-        is supposed to be used as the specified interval after which the poller should be sending a poll.
+        This function will get the next interval from the interval generator of the Poller, that is supposed to be
+        used as the specified interval after which the poller should be sending a poll. The generator function is
+        being called once and the intervals are then taken from the resulting iterator. A function, which returns
+        a number instead of an iterator, is being called again for every interval. Once the iterator is exhausted,
+        the last interval is being kept.
         Returns:
         The float/int value for the interval
         """
-        return self.interval_generator()
+        if self._intervals is None:
+            value = self.interval_generator()
+            if isinstance(value, numbers.Number):
+                return value
+            self._intervals = iter(value)
+        # A generator, which is exhausted, keeps its last interval
+        return next(self._intervals, getattr(self, "_interval", None))
 
     def _assign_interval(self, interval):
         """
@@ -231,3 +264,277 @@ class GenericPoller(Poller):
         """
         # Assigning the new value to the interval attribute of the object
         self._interval = interval
+
+
+def adaptive_interval_generator(initial, maximum=None, factor=2.0, jitter=0.1, idle_function=None,
+                                rtt_function=None, rtt_factor=50):
+    """
+    This function builds a generator function for the interval of a GenericPoller, which adapts the interval to the
+    activity of the connection:
+    - Backoff: Every interval, that passed without any traffic on the connection, multiplies the next interval by the
+      factor, up to the maximum. A connection, which stays healthy and idle, is thus being polled less and less
+    - Reset: As soon as there was traffic within the last interval, the interval is being reset to the initial value,
+      so that a connection in use is being watched closely again
+    - Jitter: Every interval is being randomized by the given fraction, so that many connections, which were opened
+      at the same time, do not poll in sync
+    - RTT: In case a function for the round trip time is given, the interval is never shorter than the rtt factor
+      times the measured round trip time, which bounds the share of time the connection spends polling
+    Notes:
+        Without an idle function every interval counts as idle and the interval only ever grows until the maximum.
+    Args:
+        initial: The float initial interval in seconds
+        maximum: The float maximum interval in seconds, by default the initial one, which means no backoff
+        factor: The float factor, by which the interval grows after every idle interval
+        jitter: The float fraction, by which every interval is randomly shortened or prolonged
+        idle_function: The function without parameters, which returns the seconds since the last traffic
+        rtt_function: The function without parameters, which returns the last measured round trip time or None
+        rtt_factor: The float minimum ratio between the interval and the round trip time
+
+    Returns:
+    The generator function without parameters
+    """
+    if maximum is None:
+        maximum = initial
+
+    def generator():
+        interval = initial
+        while True:
+            value = interval * random.uniform(1 - jitter, 1 + jitter)
+            rtt = rtt_function() if rtt_function is not None else None
+            if rtt is not None:
+                value = max(value, rtt * rtt_factor)
+            yielded_time = time.monotonic()
+            yield value
+            # The next interval is being requested once this interval has passed. In case there was traffic since
+            # the last interval began, the connection was in use and the interval starts over
+            if idle_function is not None and idle_function() < time.monotonic() - yielded_time:
+                interval = initial
+            else:
+                interval = min(interval * factor, maximum)
+
+    return generator
+
+
+class PollingScheduler(threading.Thread):
+    """
+    GENERAL
+    The PollingScheduler drives the polling of many Poller objects from a single Thread. Instead of one mostly idle
+    Thread per Poller, which would have to check 'is_interval_match' in a loop, the scheduler keeps the due time of
+    every registered Poller in a heap. The scheduler Thread sleeps until the earliest due time, takes out all the
+    Pollers that are due and hands them to a small pool of worker Threads, which perform the actual polls. This way
+    the cost of an idle Poller is one heap entry and the CPU usage only depends on the amount of polls, not on the
+    amount of registered Pollers.
+
+    SCHEDULING
+    A Poller is being scheduled for the first time at the registration plus its interval (or the given delay). After a
+    poll, the interval of the Poller is being updated by 'is_interval_match' and the Poller is being scheduled again
+    at the end of the poll plus the new interval. Thus a Poller is never polled concurrently by the scheduler, even if
+    a poll takes longer than the interval. Unregistering a Poller only removes it from the registry, the entry in the
+    heap is being discarded once it becomes due (lazy deletion).
+
+    FAILURES
+    A poll, which raises an exception, is considered failed: The Poller is being removed from the schedule and the
+    failure callbacks are being called with the Poller and the exception. A callback may register the Poller again,
+    for example after reconnecting. The success callbacks are being called with the Poller after every successful
+    poll. The callbacks are being called from within the worker Threads.
+
+    METRICS
+    The 'metrics' method returns the amount of registered Pollers, the amount of polls and failures and the lateness,
+    which is the time between the due time of a poll and the moment a worker actually started it.
+    """
+    def __init__(self, workers=4, failure_callback=None, success_callback=None):
+        threading.Thread.__init__(self)
+        self.daemon = True
+        self.worker_count = workers
+        self.failure_callbacks = [] if failure_callback is None else [failure_callback]
+        self.success_callbacks = [] if success_callback is None else [success_callback]
+
+        # The heap contains the tuples (due_time, sequence, poller), the registry maps every registered poller to the
+        # sequence of its current heap entry. Entries with a sequence other than the registered one are stale
+        self.heap = []
+        self.registry = {}
+        self._sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.jobs = queue.SimpleQueue()
+        self.workers = []
+        self.running = False
+
+        self.polls = 0
+        self.failures = 0
+        self.lateness_total = 0.0
+        self.lateness_max = 0.0
+
+    def register(self, poller, delay=None):
+        """
+        This method adds the given Poller to the schedule. A Poller, which is already registered, is being rescheduled
+        Args:
+            poller: The Poller object to be polled by the scheduler
+            delay: The amount of seconds until the first poll, by default the interval of the Poller
+
+        Returns:
+        void
+        """
+        if delay is None:
+            delay = poller.interval
+        with self.condition:
+            self._schedule(poller, time.monotonic() + delay)
+
+    def unregister(self, poller):
+        """
+        This method removes the given Poller from the schedule. A poll, which is currently being performed, is not
+        interrupted, but the Poller will not be scheduled again afterwards
+        Args:
+            poller: The Poller object to be removed
+
+        Returns:
+        The boolean value of whether the Poller was registered
+        """
+        with self.condition:
+            return self.registry.pop(poller, None) is not None
+
+    def add_failure_callback(self, callback):
+        """
+        This method adds a function, which is being called with the Poller and the exception, whenever a poll failed
+        Args:
+            callback: The function with the two parameters poller and exception
+
+        Returns:
+        void
+        """
+        self.failure_callbacks.append(callback)
+
+    def add_success_callback(self, callback):
+        """
+        This method adds a function, which is being called with the Poller, whenever a poll succeeded
+        Args:
+            callback: The function with the single parameter poller
+
+        Returns:
+        void
+        """
+        self.success_callbacks.append(callback)
+
+    def run(self):
+        """
+        The main loop of the scheduler. It starts the worker Threads and then waits until the earliest entry of the
+        heap is due, to pass all due Pollers on to the workers. Stale entries of unregistered Pollers are being
+        discarded on the way.
+        Returns:
+        void
+        """
+        self.running = True
+        for index in range(self.worker_count):
+            worker = threading.Thread(target=self._work, daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+        try:
+            with self.condition:
+                while self.running:
+                    now = time.monotonic()
+                    while len(self.heap) != 0 and self.heap[0][0] <= now:
+                        due_time, sequence, poller = heapq.heappop(self.heap)
+                        if self.registry.get(poller) == sequence:
+                            self.jobs.put((due_time, sequence, poller))
+                    # Sleeping until the next entry is due, a registration of an earlier entry or the stop wakes the
+                    # Thread up through the condition
+                    timeout = self.heap[0][0] - now if len(self.heap) != 0 else None
+                    self.condition.wait(timeout)
+        finally:
+            for worker in self.workers:
+                self.jobs.put(None)
+
+    def stop(self):
+        """
+        This method stops the scheduler. The workers finish the polls, which they have already started
+        Returns:
+        void
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    def metrics(self):
+        """
+        This method returns the metrics of the scheduler
+        Returns:
+        The dict with the keys registered, polls, failures, lateness_mean and lateness_max, the times in seconds
+        """
+        with self.condition:
+            return {
+                "registered": len(self.registry),
+                "polls": self.polls,
+                "failures": self.failures,
+                "lateness_mean": self.lateness_total / self.polls if self.polls != 0 else 0.0,
+                "lateness_max": self.lateness_max
+            }
+
+    def _work(self):
+        """
+        The target function of the worker Threads, which performs the polls handed over by the scheduler Thread and
+        then schedules the Poller again or reports the failure
+        Returns:
+        void
+        """
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            due_time, sequence, poller = job
+            start_time = time.monotonic()
+            try:
+                poller.poll()
+            except Exception as exception:
+                with self.condition:
+                    self._count(start_time - due_time)
+                    self.failures += 1
+                    # Only removing the poller, if it has not been unregistered or registered again in the meantime
+                    if self.registry.get(poller) == sequence:
+                        del self.registry[poller]
+                for callback in self.failure_callbacks:
+                    callback(poller, exception)
+                continue
+
+            end_time = time.monotonic()
+            # The whole time since the last scheduling has passed, so this updates the interval of the poller
+            poller.is_interval_match(end_time - due_time + poller.interval, update=True)
+            interval = poller.interval
+            with self.condition:
+                self._count(start_time - due_time)
+                if self.registry.get(poller) == sequence:
+                    self._schedule(poller, end_time + interval)
+            for callback in self.success_callbacks:
+                callback(poller)
+
+    def _count(self, lateness):
+        """
+        This method adds a finished poll to the metrics. It has to be called while holding the condition
+        Args:
+            lateness: The float amount of seconds the poll was started after its due time
+
+        Returns:
+        void
+        """
+        self.polls += 1
+        self.lateness_total += lateness
+        self.lateness_max = max(self.lateness_max, lateness)
+
+    def _schedule(self, poller, due_time):
+        """
+        This method pushes a new heap entry for the Poller and registers it as the current one. The scheduler Thread
+        is being woken up, in case the new entry is the earliest. It has to be called while holding the condition
+        Args:
+            poller: The Poller object to be scheduled
+            due_time: The monotonic time of the next poll
+
+        Returns:
+        void
+        """
+        sequence = next(self._sequence)
+        self.registry[poller] = sequence
+        heapq.heappush(self.heap, (due_time, sequence, poller))
+        if self.heap[0][1] == sequence:
+            self.condition.notify_all()
+
+    def __len__(self):
+        return len(self.registry)
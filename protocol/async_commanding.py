@@ -0,0 +1,604 @@
+"""
+The asyncio versions of the commanding protocol.
+
+The AsyncCommandingHandler and the AsyncCommandingClient implement the exact same protocol as the Thread based
+CommandingHandler and CommandingClient (and can therefore be combined with them), but work on the StreamReader and
+StreamWriter objects of asyncio instead of blocking Connection objects. This way asyncio based services can issue and
+serve commands without blocking the event loop and without offloading the communication to Threads.
+
+The form layer is not duplicated: The forms are being split into chunks by the FormSerializer and assembled by the
+FormParser, which are the same non blocking building blocks the CommandingServer uses, and the received forms are
+being processed by the CommandProcessor, which is shared with the CommandingHandler.
+
+EXAMPLE
+    server = await asyncio.start_server(
+        lambda reader, writer: AsyncCommandingHandler(reader, writer, context).run(), "127.0.0.1", 5000
+    )
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", 5000)
+    client = AsyncCommandingClient(reader, writer, context)
+    await client.start()
+    value = await client.call("time")
+"""
+from network.form import FormSerializer
+from network.form import FormParser
+
+from network.protocol.commanding import CommandProcessor
+from network.protocol.commanding import CommandForm
+from network.protocol.commanding import BatchCommandForm
+from network.protocol.commanding import ReturnForm
+from network.protocol.commanding import ErrorForm
+from network.protocol.commanding import StreamItemForm
+from network.protocol.commanding import Hello
+
+import asyncio
+import time
+
+
+class AsyncCommandingBase:
+    """
+    BASE CLASS
+    The base class for the asyncio implementations of the commanding protocol. It implements the basic building blocks
+    of the communication, which are the request/ack exchange and the transmission and reception of forms, as
+    coroutines on top of a StreamReader and StreamWriter.
+    """
+    def __init__(self, reader, writer, command_context, separation="$separation$", timeout=10):
+        self.reader = reader
+        self.writer = writer
+        self.command_context = command_context
+        self.separation = separation
+        self.timeout = timeout
+        # The data received from the reader, but not yet processed
+        self.buffer = bytearray()
+        # The features, that can be used on the connection, known after the handshake
+        self.features = frozenset()
+        # The round trip time measured by the last ping, the time the ping has been sent and the amount of pings of
+        # the remote side, that still have to be answered
+        self.rtt = None
+        self.ping_timestamp = None
+        self.pending_pongs = 0
+
+    async def send_request(self):
+        """
+        This method sends a 'request' line and then waits until the 'ack' line has been received. Pings of the remote
+        side are answered along with the next request, as for the CommandingClient
+        Raises:
+            ValueError: In case the received string is not the ack string
+        Returns:
+        void
+        """
+        await self.send(b"pong\n" * self.pending_pongs + b"request\n")
+        self.pending_pongs = 0
+        line_string = await self.wait_line()
+        while line_string in ("ping", "pong"):
+            await self.handle_ping_line(line_string, False)
+            line_string = await self.wait_line()
+        if line_string != "ack":
+            raise ValueError("The ack was not replied")
+
+    async def wait_request(self):
+        """
+        This method waits an indefinite amount of time for the 'request' line and replies with the 'ack' line
+        Raises:
+            ValueError: In case the received string was not the request string
+        Returns:
+        void
+        """
+        line_string = await self.wait_line()
+        while line_string in ("ping", "pong"):
+            await self.handle_ping_line(line_string)
+            line_string = await self.wait_line()
+        if line_string != "request":
+            raise ValueError("The client has sent wrong request identifier")
+        await self.send(b"ack\n")
+
+    async def handle_ping_line(self, line_string, immediate=True):
+        """
+        This method handles a received ping or pong line, in the same way as the CommandingBase
+        Args:
+            line_string: The received line, either 'ping' or 'pong'
+            immediate: The boolean value of whether the pong can be sent right away
+
+        Returns:
+        void
+        """
+        if line_string == "ping":
+            if immediate:
+                await self.send(b"pong\n")
+            else:
+                self.pending_pongs += 1
+        elif self.ping_timestamp is not None:
+            self.rtt = time.perf_counter() - self.ping_timestamp
+            self.ping_timestamp = None
+
+    async def wait_line(self):
+        """
+        This method waits until a complete line has been received and returns it without the new line character
+        Returns:
+        The received string
+        """
+        index = self.buffer.find(b"\n")
+        while index == -1:
+            await self._receive()
+            index = self.buffer.find(b"\n")
+        line = bytes(self.buffer[:index]).decode()
+        del self.buffer[:index + 1]
+        return line
+
+    async def send(self, data):
+        """
+        This method writes the data to the stream and waits until it has been flushed
+        Args:
+            data: The bytes to be sent
+
+        Returns:
+        void
+        """
+        self.writer.write(data)
+        await self.writer.drain()
+
+    async def receive_hello(self):
+        """
+        This coroutine receives the binary hello of the remote side, with the timeout of the object
+        Raises:
+            ValueError: In case the received data is not a hello
+            TimeoutError: In case the hello did not arrive in time
+        Returns:
+        The Hello object
+        """
+        while len(self.buffer) < Hello.size:
+            await asyncio.wait_for(self._receive(), self.timeout)
+        hello = Hello.decode(bytes(self.buffer[:Hello.size]))
+        del self.buffer[:Hello.size]
+        return hello
+
+    async def validate(self):
+        """
+        The handler and the client have to implement this coroutine to exchange the hello, see the Hello class
+        Returns:
+        void
+        """
+        raise NotImplementedError()
+
+    async def _send_form(self, form):
+        """
+        This method transmits the given form, by sending the chunks of the FormSerializer one by one and waiting for
+        the ACK of the remote side after each one of them
+        Args:
+            form: The Form object to be transmitted
+
+        Returns:
+        void
+        """
+        for chunk in FormSerializer(form, self.separation).chunks():
+            await self.send(chunk)
+            await self._wait_ack()
+
+    async def _receive_form(self):
+        """
+        This method receives a form, by feeding the received data into a FormParser and replying with the ACKs the
+        parser demands
+        Returns:
+        The received Form object
+        """
+        parser = FormParser(self.separation)
+        acks = parser.feed(bytes(self.buffer))
+        self.buffer.clear()
+        while True:
+            if acks != 0:
+                await self.send(b"ack" * acks)
+            if parser.finished:
+                break
+            await self._receive()
+            acks = parser.feed(bytes(self.buffer))
+            self.buffer.clear()
+        # The data exceeding the form is kept for the next read
+        self.buffer = parser.buffer
+        return parser.form
+
+    async def _wait_ack(self):
+        """
+        This method waits for the ACK of the remote side, with the timeout of the object
+        Raises:
+            TimeoutError: In case the ACK did not arrive in time
+            ValueError: In case something other than the ACK was received
+        Returns:
+        void
+        """
+        while len(self.buffer) < 3:
+            await asyncio.wait_for(self._receive(), self.timeout)
+        if bytes(self.buffer[:3]) != b"ack":
+            raise ValueError("Incorrect ACK sent")
+        del self.buffer[:3]
+
+    async def _receive(self):
+        """
+        This method reads the next data from the stream into the buffer
+        Raises:
+            EOFError: In case the stream has been closed
+        Returns:
+        void
+        """
+        data = await self.reader.read(65536)
+        if not data:
+            raise EOFError("The connection was closed after receiving {} bytes".format(len(self.buffer)))
+        self.buffer += data
+
+    async def close(self):
+        """
+        This method closes the underlying stream
+        Returns:
+        void
+        """
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+    @property
+    def command_context_class(self):
+        """
+        The class of the command context the object is based on
+        Returns:
+        The class object of the command context
+        """
+        return self.command_context.__class__
+
+
+class AsyncCommandingHandler(AsyncCommandingBase):
+    """
+    The asyncio version of the CommandingHandler. The coroutine 'run' serves a single connection, which makes it
+    suitable as the callback for asyncio.start_server. Commands of the command context may be coroutine functions, in
+    which case they are awaited within the event loop.
+    """
+    def __init__(self, reader, writer, command_context, separation="$separation$", timeout=10):
+        AsyncCommandingBase.__init__(self, reader, writer, command_context, separation, timeout)
+        self.processor = CommandProcessor(command_context)
+        self.running = True
+
+    async def run(self):
+        """
+        This coroutine first validates the command context with the client and then serves the requests of the
+        client until the connection is closed or the handler is stopped
+        Returns:
+        void
+        """
+        try:
+            await self.validate()
+            while self.running:
+                await self.wait_request()
+                received_time = time.perf_counter()
+                form = await self._receive_form()
+                for response in await self.processor.process_async(form, received_time):
+                    await self._send_form(response)
+        except (EOFError, OSError, ValueError, asyncio.TimeoutError):
+            # A violation of the protocol leaves the stream out of sync, it is treated like a disconnect
+            pass
+        finally:
+            await self.close()
+
+    async def validate(self):
+        """
+        This coroutine performs the handshake with the client, in the same way as the CommandingHandler
+        Raises:
+            ConnectionAbortedError: In case the client does not have the same protocol version and command set
+        Returns:
+        void
+        """
+        hello = await self.receive_hello()
+        answer, self.processor = Hello.answer(self.command_context, hello, self.processor)
+        await self.send(answer.encode())
+        answer.check(hello)
+        self.features = answer.features
+
+    def stop(self):
+        """
+        This method stops the handler after the current request has been served
+        Returns:
+        void
+        """
+        self.running = False
+
+
+class AsyncCommandingClient(AsyncCommandingBase):
+    """
+    The asyncio version of the CommandingClient. Commands are issued by awaiting the 'call' coroutine. As the protocol
+    only allows a single command exchange at a time on one connection, concurrent calls are being serialized by a lock.
+
+    CANCELLATION
+    An exchange, which has been started, is always completed, even if the awaiting call is being cancelled (for
+    example by asyncio.wait_for), because stopping in the middle would leave the stream out of sync. In case the
+    exchange itself fails, the stream can not be used anymore: The client is being marked as broken, closed and all
+    the following calls raise a ConnectionError.
+    """
+    def __init__(self, reader, writer, command_context, separation="$separation$", timeout=10,
+                 resumption_token=None):
+        AsyncCommandingBase.__init__(self, reader, writer, command_context, separation, timeout)
+        # The token for resuming the session on the handler side, see the CommandingClient
+        self.resumption_token = resumption_token
+        self.resumed = False
+        self.lock = asyncio.Lock()
+        # Whether an exchange has failed in between, leaving the stream out of sync
+        self.broken = False
+        # The list of tuples (command_name, exception) of the deferred errors, which the handler attached to responses
+        self.deferred_errors = []
+
+    async def start(self):
+        """
+        This coroutine has to be awaited before the first call, it validates the command context with the handler
+        Returns:
+        void
+        """
+        await self.validate()
+
+    async def call(self, command_name, *pos_args, **kw_args):
+        """
+        This coroutine issues the command with the given name and arguments on the remote handler and returns the
+        return value of the command or raises the exception, that occurred in the remote execution
+        Args:
+            command_name: The string name of the command to execute
+            *pos_args: The positional arguments of the command
+            **kw_args: The keyword arguments of the command
+
+        Returns:
+        The return value of the command
+        """
+        return await self.execute_command(command_name, list(pos_args), kw_args)
+
+    async def notify(self, command_name, *pos_args, **kw_args):
+        """
+        This coroutine issues the command with the return mode 'none', which means the handler does not send a
+        response and the coroutine returns as soon as the command form has been transmitted
+        Args:
+            command_name: The string name of the command to execute
+            *pos_args: The positional arguments of the command
+            **kw_args: The keyword arguments of the command
+
+        Returns:
+        void
+        """
+        await self.execute_command(command_name, list(pos_args), kw_args, return_mode="none")
+
+    async def execute_command(self, command_name, pos_args, kw_args, return_mode="reply", error_mode="reply",
+                              timeout=None):
+        """
+        This coroutine issues the command on the remote handler, with the same parameters as the 'execute_command'
+        method of the CommandingClient. With a timeout the command is sent with the according deadline and the
+        coroutine raises a TimeoutError at the deadline, the exchange itself is being completed in the background
+        as described for the cancellation.
+        Raises:
+            TimeoutError: In case the deadline passed before the response has been received
+        Args:
+            command_name: The string name of the command to execute
+            pos_args: The pos args list
+            kw_args: The kw args dict
+            return_mode: The string return mode of the command, either 'reply' or 'none'
+            error_mode: The string error mode of the command, either 'reply' or 'deferred'
+            timeout: The float amount of seconds the command may take, None for no deadline
+
+        Returns:
+        The return value of the command, None for the return mode 'none'
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        command_form = CommandForm(command_name, pos_args, kw_args, return_mode, error_mode, deadline)
+        if timeout is None:
+            return await self._exchange(command_form)
+        return await asyncio.wait_for(self._exchange(command_form), timeout)
+
+    async def execute_template(self, template, pos_args, kw_args, timeout=None):
+        """
+        This coroutine issues the command compiled into the given CommandTemplate with the given arguments, just like
+        'execute_command' with the command name and the modes of the template
+        Raises:
+            TimeoutError: In case the deadline passed before the response has been received
+        Args:
+            template: The CommandTemplate of the command
+            pos_args: The pos args list
+            kw_args: The kw args dict
+            timeout: The float amount of seconds the command may take, None for no deadline
+
+        Returns:
+        The return value of the command, None for the return mode 'none'
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        command_form = template.create(pos_args, kw_args, deadline)
+        if timeout is None:
+            return await self._exchange(command_form)
+        return await asyncio.wait_for(self._exchange(command_form), timeout)
+
+    async def ping(self):
+        """
+        This coroutine sends a ping to the handler and returns the round trip time, once the pong has been received.
+        The ping waits for the exchange in progress, as it may only be sent in between two exchanges. Pings of the
+        handler are only being answered with the next exchange, as the client does not read while it is idle.
+        Raises:
+            TimeoutError: In case the pong did not arrive within the timeout of the client
+            ConnectionError: In case the client is broken
+        Returns:
+        The float round trip time in seconds
+        """
+        if self.broken:
+            raise ConnectionError("The client is broken by a previously failed exchange")
+        return await asyncio.shield(self._ping())
+
+    async def _ping(self):
+        """
+        This coroutine performs the ping exchange while holding the lock. A failure in between marks the client as
+        broken and closes it.
+        Returns:
+        The float round trip time in seconds
+        """
+        async with self.lock:
+            if self.broken:
+                raise ConnectionError("The client is broken by a previously failed exchange")
+            try:
+                self.ping_timestamp = time.perf_counter()
+                await self.send(b"pong\n" * self.pending_pongs + b"ping\n")
+                self.pending_pongs = 0
+                line_string = await asyncio.wait_for(self.wait_line(), self.timeout)
+                while line_string == "ping":
+                    await self.handle_ping_line(line_string)
+                    line_string = await asyncio.wait_for(self.wait_line(), self.timeout)
+                if line_string != "pong":
+                    raise ValueError("The pong was not replied")
+                await self.handle_ping_line(line_string)
+                return self.rtt
+            except BaseException:
+                self.broken = True
+                await self.close()
+                raise
+
+    async def stream(self, command_name, *pos_args, **kw_args):
+        """
+        This async generator issues a generator command on the remote handler and yields the items as they arrive.
+        The next item is only being received, once the previous one has been consumed, so the consumer controls the
+        pace of the handler. The connection is reserved for the stream until it has been exhausted, a stream, that
+        is closed early, is being drained to keep the stream in sync.
+        Examples:
+            async for line in client.stream("read_lines", "log.txt"):
+                print(line)
+        Args:
+            command_name: The string name of the command to execute
+            *pos_args: The positional arguments of the command
+            **kw_args: The keyword arguments of the command
+
+        Returns:
+        The async generator of the items
+        """
+        command_form = CommandForm(command_name, list(pos_args), kw_args)
+        async with self.lock:
+            if self.broken:
+                raise ConnectionError("The client is broken by a previously failed exchange")
+            response = None
+            try:
+                await self.send_request()
+                await self._send_form(command_form.form)
+                response = await self._receive_form()
+                while response.title == "STREAMITEM":
+                    yield StreamItemForm(response).item
+                    response = await self._receive_form()
+            except BaseException:
+                # Draining the remaining forms of a stream, that has been closed early
+                try:
+                    while response is not None and response.title == "STREAMITEM":
+                        response = await self._receive_form()
+                except BaseException:
+                    response = None
+                if response is None:
+                    self.broken = True
+                    await self.close()
+                raise
+        self.deferred_errors += ErrorForm.deferred_errors(response)
+        if response.title != "STREAMEND":
+            yield self.command_context.execute_form(response)
+
+    async def execute_batch(self, calls, return_mode="reply", error_mode="reply", timeout=None):
+        """
+        This coroutine sends all the given calls within a single BatchCommandForm and returns the list of results,
+        where a failed call is represented by its exception. With a timeout the batch is sent with the according
+        deadline, the same way as with 'execute_command'
+        Raises:
+            TimeoutError: In case the deadline passed before the results have been received
+        Args:
+            calls: A CommandBatch or a list of (command_name, pos_args, kw_args) tuples
+            return_mode: The string return mode of the batch, either 'reply' or 'none'
+            error_mode: The string error mode of the batch, with 'deferred' a failed call results in None
+            timeout: The float amount of seconds the whole batch may take, None for no deadline
+
+        Returns:
+        The list of results in the order of the calls
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        batch_form = BatchCommandForm(list(calls), return_mode=return_mode, error_mode=error_mode, deadline=deadline)
+        if timeout is None:
+            return await self._exchange(batch_form)
+        return await asyncio.wait_for(self._exchange(batch_form), timeout)
+
+    async def fetch_errors(self):
+        """
+        This coroutine returns all the deferred errors of the commands issued by this client, the ones already
+        attached to previous responses as well as the ones the handler still holds
+        Returns:
+        The list of tuples (command_name, exception) in the order the errors occurred
+        """
+        deferred_list = await self.execute_command(CommandProcessor.fetch_errors_command, [], {})
+        errors, self.deferred_errors = self.deferred_errors, []
+        return errors + ErrorForm._procure_deferred_errors(deferred_list)
+
+    async def _exchange(self, commanding_form):
+        """
+        This coroutine performs the complete exchange of a request for the given commanding form and executes the
+        received response with the command context. The exchange is shielded from the cancellation of the caller.
+        Raises:
+            ConnectionError: In case the client is broken by a previously failed exchange
+        Args:
+            commanding_form: The CommandForm or BatchCommandForm to send
+
+        Returns:
+        The result of the response
+        """
+        if self.broken:
+            raise ConnectionError("The client is broken by a previously failed exchange")
+        response = await asyncio.shield(self._transfer(commanding_form))
+        if response is None:
+            return None
+        self.deferred_errors += ErrorForm.deferred_errors(response)
+        return self.command_context.execute_form(response)
+
+    async def _transfer(self, commanding_form):
+        """
+        This coroutine sends the commanding form and receives the response form. A failure in between marks the
+        client as broken and closes it.
+        Args:
+            commanding_form: The CommandForm or BatchCommandForm to send
+
+        Returns:
+        The response Form, None in case the form does not get a reply
+        """
+        async with self.lock:
+            if self.broken:
+                raise ConnectionError("The client is broken by a previously failed exchange")
+            try:
+                await self.send_request()
+                await self._send_form(commanding_form.form)
+                if not commanding_form.replies:
+                    return None
+                return await self._receive_response()
+            except BaseException:
+                self.broken = True
+                await self.close()
+                raise
+
+    async def _receive_response(self):
+        """
+        This coroutine receives the response form of a call. In case a generator command has been called the regular
+        way instead of with 'stream', the items are being collected into a list, which is returned as the response,
+        as if the command had returned the list, the same way the CommandingClient does it.
+        Returns:
+        The response Form
+        """
+        response = await self._receive_form()
+        items = []
+        while response.title == "STREAMITEM":
+            items.append(StreamItemForm(response).item)
+            response = await self._receive_form()
+        if response.title == "STREAMEND":
+            return ReturnForm(items).form
+        return response
+
+    async def validate(self):
+        """
+        This coroutine performs the handshake with the handler, in the same way as the CommandingClient
+        Raises:
+            ConnectionAbortedError: In case the handler does not have the same protocol version and command set
+        Returns:
+        void
+        """
+        hello = Hello(self.command_context.fingerprint, token=self.resumption_token)
+        await self.send(hello.encode())
+        answer = await self.receive_hello()
+        hello.check(answer)
+        self.features = answer.features
+        self.resumed = answer.resumed
+        self.resumption_token = answer.token
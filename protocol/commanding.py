@@ -8,17 +8,70 @@ WHAT TO MAKE THE COMMANDING PROTOCOL BETTER?
 from network.form import Form
 from network.form import FormTransmitterThread
 from network.form import FormReceiverThread
+from network.form import FormSerializer
+from network.form import FormParser
+from network.form import FormTemplate
+from network.form import JsonAppendixEncoder
 
 from network.polling import GenericPoller
-
+from network.polling import adaptive_interval_generator
+from network.tracing import get_tracer
+from network.metrics import MetricsRegistry
+
+import collections
+import itertools
+import hashlib
+import secrets
+import struct
+import json
 import threading
+import selectors
+import select
+import inspect
+import asyncio
+import builtins
+import socket
 import random
 import queue
 import time
+import ssl
 
 # THE COMMANDING PROTOCOL
 
 
+class CommandLookupError(AttributeError):
+    """
+    This exception is raised, when a command is requested, which is not implemented by the command context. It is a
+    subclass of AttributeError, as unknown commands used to surface as the AttributeError of the method lookup.
+    """
+    pass
+
+
+def cacheable(ttl=None):
+    """
+    This function creates a decorator, which marks a command method of a CommandContext subclass as cacheable. The
+    result of a cacheable command only depends on its arguments, which means the result of a call can be reused for
+    calls with the same arguments for the given time to live.
+    Examples:
+        class LookupContext(CommandContext):
+
+            @cacheable(ttl=60)
+            def command_lookup(self, key):
+                ...
+    Args:
+        ttl: The amount of seconds a result stays valid, None for no time limit
+
+    Returns:
+    The decorator function
+    """
+    def decorator(method):
+        method.cacheable_ttl = ttl
+        method.cacheable = True
+        return method
+
+    return decorator
+
+
 class CommandContext:
     """
     BASE CLASS
@@ -30,14 +83,191 @@ class CommandContext:
     subclass inherit from this CommandContext class and adding new methods, whose names start with 'command' and an
     underscore, followed by the (exact!) name of the command whose functionality is to be implemented:
     Example: def command_print(self, pos_args, kw_args): ...
+    The command methods may also be coroutine functions (async def), which are awaited by the AsyncCommandingHandler
+    and run to completion by the Thread based handlers.
+    Commands may also be generator functions, in which case the items are being streamed to the client one by one,
+    see 'execute_stream' of the CommandingClient.
+    Commands, that have a 'cancel_token' parameter, get a CancellationToken for the deadline of the call passed to
+    it, which they can check to stop early.
+    Commands, whose results only depend on their arguments, can be marked with the 'cacheable' decorator, so that the
+    CommandingClient serves repeated calls from its cache. On the handler side the response forms of those commands
+    are being cached in the 'result_cache' of the command context object, which means all the handlers serving the
+    same object share the results. In case the state, a cached result depends on, changes, the command context has to
+    call 'invalidate_results'.
 
     EXECUTING COMMANDS:
     The commandContext objects ca be used to directly execute commands, described by a CommandingForm sub class, by
     being passed to the execute method.
+
+    DISPATCH TABLE
+    The command methods are being collected once for every class, when the class is created, into the 'commands' dict,
+    which maps the command names to the methods and the 'command_signatures' dict, which maps the command names to
+    the signatures of the methods (without the self parameter). Looking up a command thus is a single dict access.
+    The 'fingerprint' of the class is a hash over the names and the parameters of all the commands. The handler and
+    the client compare the fingerprints on connect, which means they are compatible, as long as they implement the
+    same command set, no matter the name or the module of the command context classes.
+    Notes:
+        Command methods added to the class after it has been created are not part of the dispatch table, unless the
+        table is being rebuilt with 'build_command_table'.
+
+    SESSIONS
+    The handlers serving the command context object register the state of their connection in the 'sessions' store,
+    so that a reconnecting client can resume its session with the resumption token, see Hello.
+
+    METRICS
+    Executing a CommandForm updates the 'metrics' registry of the command context object with the call, the error,
+    the execution time and the size of the request appendix. The handlers add the time the call waited before its
+    execution and the sizes of the responses. The metrics can be exported with 'metrics.snapshot()' or
+    'metrics.prometheus()'. Setting 'collect_metrics' to False disables the collection.
     """
+    # The dispatch table, mapping the command names to the command methods of the class
+    commands = {}
+    # The signatures of the command methods, without the self parameter
+    command_signatures = {}
+    # The command names of the cacheable commands, mapped to the time to live of their results
+    cacheable_commands = {}
+    # The 16 bytes hash of the command set
+    fingerprint = bytes(16)
+    # The bounds of the result cache, which is shared by all the handlers serving the command context object
+    result_cache_size = 4096
+    result_cache_memory = 8 * 1024 * 1024
+    _result_cache_lock = threading.Lock()
+    # The max amount of sessions, which can be resumed
+    session_capacity = 1024
+    # Whether the executions are being recorded in the metrics registry
+    collect_metrics = True
+
     def __init__(self):
         pass
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.build_command_table()
+
+    @classmethod
+    def build_command_table(cls):
+        """
+        This method builds the dispatch table of the class, by collecting all the methods, whose names start with the
+        command prefix, including the inherited ones
+        Returns:
+        void
+        """
+        prefix = cls.assemble_command_name("")
+        commands = {}
+        command_signatures = {}
+        cacheable_commands = {}
+        for method_name in dir(cls):
+            if not method_name.startswith(prefix):
+                continue
+            # The descriptor is stored as it is, so that static methods can be bound correctly as well
+            method = inspect.getattr_static(cls, method_name)
+            if not callable(getattr(cls, method_name)):
+                continue
+            command_name = method_name[len(prefix):]
+            commands[command_name] = method
+            command_signatures[command_name] = cls._procure_command_signature(method)
+            function = getattr(method, "__func__", method)
+            if getattr(function, "cacheable", False):
+                cacheable_commands[command_name] = function.cacheable_ttl
+        cls.commands = commands
+        cls.command_signatures = command_signatures
+        cls.cacheable_commands = cacheable_commands
+        cls.fingerprint = cls._procure_fingerprint(command_signatures)
+
+    @staticmethod
+    def _procure_fingerprint(command_signatures):
+        """
+        This function creates the hash of the command set from the names of the commands and the names and kinds of
+        their parameters. The defaults and annotations are left out, as their string representation might differ
+        between processes.
+        Args:
+            command_signatures: The dict mapping the command names to their signatures
+
+        Returns:
+        The 16 bytes fingerprint
+        """
+        lines = []
+        for command_name in sorted(command_signatures):
+            parameters = command_signatures[command_name].parameters.values()
+            lines.append("{}({})".format(command_name, ",".join(
+                "{}:{}".format(parameter.name, parameter.kind.name) for parameter in parameters
+            )))
+        return hashlib.blake2b("\n".join(lines).encode(), digest_size=16).digest()
+
+    @property
+    def result_cache(self):
+        """
+        The cache for the response forms of the cacheable commands. It is created on the first access, as subclasses
+        are not required to call the constructor of the base class
+        Returns:
+        The CommandCache object
+        """
+        try:
+            return self.__dict__["_result_cache"]
+        except KeyError:
+            with self._result_cache_lock:
+                if "_result_cache" not in self.__dict__:
+                    self.__dict__["_result_cache"] = CommandCache(
+                        self.result_cache_size,
+                        self.result_cache_memory,
+                        lambda form: len(form.appendix_encoded) + len(form.body)
+                    )
+            return self.__dict__["_result_cache"]
+
+    @property
+    def sessions(self):
+        """
+        The store of the sessions of the connections served for the command context object, which can be resumed by
+        a reconnecting client. It is created on the first access, like the result cache
+        Returns:
+        The SessionStore object
+        """
+        try:
+            return self.__dict__["_sessions"]
+        except KeyError:
+            with self._result_cache_lock:
+                if "_sessions" not in self.__dict__:
+                    self.__dict__["_sessions"] = SessionStore(self.session_capacity)
+            return self.__dict__["_sessions"]
+
+    @property
+    def metrics(self):
+        """
+        The registry of the metrics of the commands executed for the command context object. It is created on the
+        first access, like the result cache
+        Returns:
+        The MetricsRegistry object
+        """
+        try:
+            return self.__dict__["_metrics"]
+        except KeyError:
+            with self._result_cache_lock:
+                if "_metrics" not in self.__dict__:
+                    self.__dict__["_metrics"] = MetricsRegistry()
+            return self.__dict__["_metrics"]
+
+    def invalidate_results(self, command_name=None):
+        """
+        This method removes the cached results of the command with the given name or of all the commands from the
+        result cache. It has to be called by the command context, whenever a change of its state makes the cached
+        results invalid.
+        Args:
+            command_name: The string name of the command, None to clear the whole cache
+
+        Returns:
+        void
+        """
+        self.result_cache.invalidate(command_name)
+
+    @classmethod
+    def list_commands(cls):
+        """
+        This method returns the names of all the commands implemented by the command context class
+        Returns:
+        The sorted list of the string command names
+        """
+        return sorted(cls.commands.keys())
+
     def execute_form(self, form):
         """
         A CommandingForm subclass can be passed to this method and the action corresponding to the type of form will be
@@ -50,31 +280,119 @@ class CommandContext:
         Either the return of the executed command or the return value of a remote executed function
         """
         if isinstance(form, Form):
-            if form.title == "COMMAND":
-                form = CommandForm(form)
-            elif form.title == "RETURN":
-                form = ReturnForm(form)
-            elif form.title == "ERROR":
-                form = ErrorForm(form)
+            form = CommandingBase.evaluate_commanding_form(form)
         if isinstance(form, CommandingForm):
             if isinstance(form, CommandForm):
-                # Getting the method, that actually executes the behaviour for that command
+                # Getting the method, that actually executes the behaviour for that command from the dispatch table
                 command = self.lookup_command(form.command_name)
+                # Commands accepting a cancellation token get one for the deadline of the form
+                kw_args = form.key_args
+                if self.accepts_cancel_token(form.command_name) and "cancel_token" not in kw_args:
+                    kw_args = dict(kw_args, cancel_token=CancellationToken(form.deadline))
                 # Executing the command with the pos and kw args
-                return command(*form.pos_args, **form.key_args)
+                if not self.collect_metrics:
+                    return command(*form.pos_args, **kw_args)
+                return self.execute_measured(form, command, kw_args)
+            elif isinstance(form, BatchCommandForm):
+                # Executing every call of the batch, an exception only fails the call, that raised it
+                return [self.execute_call(command_form) for command_form in form.command_forms()]
             elif isinstance(form, ReturnForm):
                 # Simply returning the value stored in the form
                 return form.return_value
+            elif isinstance(form, BatchReturnForm):
+                return form.results
+            elif isinstance(form, StreamItemForm):
+                return form.item
+            elif isinstance(form, StreamEndForm):
+                return None
             elif isinstance(form, ErrorForm):
                 raise form.exception
         else:
             raise TypeError("The form to execute is supposed to be a CommandingForm subclass")
 
+    def execute_measured(self, form, command, kw_args):
+        """
+        This method executes the command of the given CommandForm and records the call in the metrics. The execution
+        time of a coroutine command is being recorded, once the returned coroutine has been awaited. For a generator
+        command only the creation of the generator is being measured.
+        Args:
+            form: The CommandForm
+            command: The command method
+            kw_args: The keyword arguments for the command
+
+        Returns:
+        The return value of the command
+        """
+        metrics = self.metrics
+        command_name = form.command_name
+        metrics.count_call(command_name)
+        metrics.observe("request_bytes", command_name, len(form.form.appendix_encoded))
+        start = time.perf_counter()
+        try:
+            return_value = command(*form.pos_args, **kw_args)
+        except Exception as exception:
+            metrics.count_error(command_name, exception)
+            metrics.observe("execution_seconds", command_name, time.perf_counter() - start)
+            raise
+        if inspect.isawaitable(return_value):
+            return self._await_measured(command_name, return_value, start)
+        metrics.observe("execution_seconds", command_name, time.perf_counter() - start)
+        return return_value
+
+    async def _await_measured(self, command_name, awaitable, start):
+        """
+        This method awaits the return value of a coroutine command and records the execution in the metrics
+        Args:
+            command_name: The string name of the command
+            awaitable: The awaitable returned by the command
+            start: The float perf_counter timestamp of the start of the execution
+
+        Returns:
+        The result of the awaitable
+        """
+        try:
+            return await awaitable
+        except Exception as exception:
+            self.metrics.count_error(command_name, exception)
+            raise
+        finally:
+            self.metrics.observe("execution_seconds", command_name, time.perf_counter() - start)
+
+    def execute_call(self, command_form):
+        """
+        This method executes a single CommandForm and returns the exception object instead of raising it in case the
+        command fails. This is how the calls of a batch are being executed.
+        Args:
+            command_form: The CommandForm to execute
+
+        Returns:
+        The return value of the command or the exception, that was raised by it
+        """
+        try:
+            return self.execute_form(command_form)
+        except Exception as exception:
+            return exception
+
+    @classmethod
+    def accepts_cancel_token(cls, command_name):
+        """
+        This method returns whether the command with the given name has a 'cancel_token' parameter, in which case a
+        CancellationToken is being passed to it on execution
+        Args:
+            command_name: The string name of the command
+
+        Returns:
+        The boolean value
+        """
+        signature = cls.command_signatures.get(command_name)
+        return signature is not None and "cancel_token" in signature.parameters
+
     def lookup_command(self, command_name):
         """
-        This method will use the command name given and first assemble the corresponding method name for that command
-        name and then it will attempt to get the attribute of this very command context object. If a method exists,
-        that implements the given command name, then the method will return the function object of that method.
+        This method looks up the method implementing the command with the given name in the dispatch table of the
+        class and returns it bound to this very command context object.
+        Raises:
+            CommandLookupError: In case the command context does not implement the command
         Args:
             command_name: The command name to which the method/ function object is requested
 
@@ -82,10 +400,29 @@ class CommandContext:
         The function object of the internal command context method with the name specified by the command name
         """
         try:
-            command_method_name = self.assemble_command_name(command_name)
-            return getattr(self, command_method_name)
-        except AttributeError as attribute_error:
-            raise attribute_error
+            method = self.commands[command_name]
+        except KeyError:
+            raise CommandLookupError("The command '{}' is not implemented by {}".format(
+                command_name, self.__class__.__name__
+            ))
+        return method.__get__(self, self.__class__)
+
+    @staticmethod
+    def _procure_command_signature(method):
+        """
+        This function returns the signature of the command method as it is called, which means without the self
+        parameter for a regular method and without the cls parameter for a class method
+        Args:
+            method: The command method as it is stored in the class dict
+
+        Returns:
+        The inspect.Signature object
+        """
+        if isinstance(method, staticmethod):
+            return inspect.signature(method.__func__)
+        function = method.__func__ if isinstance(method, classmethod) else method
+        signature = inspect.signature(function)
+        return signature.replace(parameters=list(signature.parameters.values())[1:])
 
     @staticmethod
     def assemble_command_name(command_name):
@@ -120,6 +457,10 @@ class CommandContext:
         return time.time()
 
 
+# The base class is not created through __init_subclass__, thus its dispatch table has to be built explicitly
+CommandContext.build_command_table()
+
+
 class CommandingForm:
     """
     INTERFACE
@@ -129,8 +470,8 @@ class CommandingForm:
     been given, which the form is supposed to contain.
 
     BASIC DESIGN
-    This base class of those from wrappers has to be passed, whats called the spec dictionary, which is the dictionary,
-    that contains all the parameters, which together completely describe the specific instance of the commanding form
+    Every sub class of those from wrappers has what is called the spec dictionary, which is the dictionary, that
+    contains all the parameters, which together completely describe the specific instance of the commanding form
     sub class. The dictionary is a substitute for using real attributes one could say.
     This base class then implements all the methods, effectively making the class a dict referential as well, allowing
     direct indexing and iteration on that 'attribute-spec' dict.
@@ -164,25 +505,54 @@ class CommandingForm:
     the basic structure:
     - Title: The title tells which type CommandingForm has created the Form, by a string in caps
     - Body: The body specifies general information in dictionary like format, separated by newline characters. Each
-      each line in the body is separated by a ':' character between the key and the value of the dict like relation.
-      This also implicates, that a value in the body cannot possibly contain a ':' character!
+      each line in the body is separated by the first ':' character between the key and the value of the dict like
+      relation. Thus a key cannot contain a ':' character, but the value can, and neither can contain a newline
     - Appendix: This is a python dictionary object, serialized, and can contain everything possible according to the
       limitations of the encoder and is absolutely up to the specific sub class
 
+    RECEIVED FORMS
+    Every sub class is registered with its title in the 'form_classes' dict upon creation, so that a received Form
+    is mapped to its wrapper class with a single lookup. A wrapper created from a received Form keeps that very Form
+    object, instead of building a new one from the extracted parameters, which would encode the appendix again.
+
+    MEMORY
+    As there can be many thousands of commanding forms queued at the same time, the wrappers do not have an instance
+    dict. Each sub class declares a slot for every key of its spec dict, named like the key with a leading
+    underscore, and assigns those slots in its constructor before calling the constructor of this base class. The
+    '_spec' dict is assembled from the slots on demand. The slots reference the same objects as the appendix of the
+    form, so nothing is being stored twice.
+
     Attributes:
         form: The actual Form object, that has to be created to be sent over the network
-        _spec: The dict containing all the attributes
+        _spec: The dict containing all the attributes, assembled from the slots
     """
-    def __init__(self, spec_dict):
-        self._spec = spec_dict
-        # Adding the title title of the form to the spec dict
-        self._spec["title"] = self.procure_title()
+    __slots__ = ("form",)
 
-        # Checking if the actually is a dict
-        self._check_spec()
+    # The dict, which maps the title of each sub class to the sub class itself
+    form_classes = {}
 
-        # Building the form according to the specific implementations
-        self.form = self.build_form()
+    def __init_subclass__(cls, **kwargs):
+        """
+        This method is being called for every new sub class of CommandingForm and derives the title of the sub class
+        from its name once and registers the class with that title, so neither has to be done again per message
+        Args:
+            **kwargs: The keyword arguments of the class creation
+
+        Returns:
+        void
+        """
+        super().__init_subclass__(**kwargs)
+        # Ripping the class name of the Form sub string, leaving only the purpose of the sub class in upper case
+        cls.form_title = cls.__name__[:-len("Form")].upper()
+        CommandingForm.form_classes[cls.form_title] = cls
+        # The keys of the spec dict are the names of the slots of the sub classes without the leading underscore
+        slot_names = [name for base in reversed(cls.__mro__) for name in vars(base).get("__slots__", ())]
+        cls.spec_keys = tuple(name[1:] for name in slot_names if name != "form")
+
+    def __init__(self, form=None):
+        # The slots of the spec have already been assigned by the sub class. Building the form according to the
+        # specific implementations, unless the object has been created from a received form, which is used as it is
+        self.form = self.build_form() if form is None else form
 
     def build_form(self):
         """
@@ -213,19 +583,12 @@ class CommandingForm:
         therefore the class name.
         The class name has to have the format '<Purpose>Form', where purpose is a single word briefly describing
         what the specific sub class is being used for. And exactly that substring is calculated and in all-upper-case
-        used as the title for each of those Forms
+        used as the title for each of those Forms. The title is calculated only once, when the sub class is created
 
         Returns:
         The string title of the form. (Only characters, all upper case)
         """
-        # Getting the class name of the specific sub class
-        class_name_string = str(self.__class__)
-        # Ripping the class name of the Form sub string, leaving only the substring that specifies the purpose of the
-        # sub class
-        title_string = class_name_string.replace("<class '", "").replace("Form'>", "")
-        # Making it all upper case
-        title_string_upper = title_string.upper()
-        return title_string_upper
+        return self.form_title
 
     def procure_body(self):
         """
@@ -269,14 +632,14 @@ class CommandingForm:
         if isinstance(other, CommandingForm):
 
             # Simply checking if the two spec dictionaries are the same
-            return dict(self) == dict(other)
+            return self._spec == other._spec
 
         elif isinstance(other, Form):
 
             # Creating a CommandingForm object of the type on which this method is called from the given form
             other_commanding_form = self.__class__.from_form(other)
             # Now Comparing the spec dicts of those two CommandingForms
-            return dict(self) == dict(other_commanding_form)
+            return self._spec == other_commanding_form._spec
 
         else:
             return False
@@ -284,26 +647,43 @@ class CommandingForm:
     def __dict__(self):
         """
         The CommandingForm base class dictates, that every subclass has to manage the specific data meant to be
-        wrapped into a form for network transmission in a dictionary, mor specifically the _spec dictionary
-        as a instance attribute. When calling the dict conversion on a CommandingForm this underlying dictionary
-        can be returned directly.
+        wrapped into a form for network transmission in a dictionary, mor specifically the _spec dictionary,
+        which is assembled from the slots of the object. When calling the dict conversion on a CommandingForm this
+        dictionary can be returned directly.
 
         Returns:
         The dictionary, upon which's entries the CommandingForm is based on
         """
         return self._spec
 
+    @property
+    def _spec(self):
+        """
+        The dict with all the attributes of the CommandingForm, which is being assembled from the slots on every
+        access, the title included
+        Returns:
+        The spec dict
+        """
+        spec = {key: getattr(self, "_" + key) for key in self.spec_keys}
+        spec["title"] = self.form_title
+        return spec
+
     def __getitem__(self, item):
         """
         The CommandingForm base class dictates, that every subclass is based on a dictionary, more specifically
-
+        Raises:
+            KeyError: In case the item is not a key of the spec dict
         Args:
             item: The string key for the item to get from the internal dictionary
 
         Returns:
         The dict value of the key, whatever the type may be
         """
-        return self._spec[item]
+        if item == "title":
+            return self.form_title
+        if item not in self.spec_keys:
+            raise KeyError(item)
+        return getattr(self, "_" + item)
 
     def __contains__(self, item):
         """
@@ -315,7 +695,7 @@ class CommandingForm:
         Returns:
         The boolean value of whether or not the string key is part of the object
         """
-        return item in self._spec.keys()
+        return item == "title" or item in self.spec_keys
 
     def __str__(self):
         raise NotImplementedError()
@@ -381,28 +761,16 @@ class CommandingForm:
         if form.title != title:
             raise ValueError("The given form is NOT a '{}' form".format(title))
 
-    def _check_spec(self):
-        """
-        This method checks the type of the spec dict in the way, that it raises an erro in case the _spec attribute
-        is not a dict.
-        Raises:
-            TypeError: In case the _spec attribute is not a dict
-        Returns:
-        void
-        """
-        if not isinstance(self._spec, dict):
-            raise TypeError("The spec of CommandingForm has to be dict")
-
     @staticmethod
     def _procure_body_dict(form):
         """
         This function takes a Form object as input and then attempts to turn the body into a dictionary, by
         interpreting the individual lines of the body string as key value pairs of strings, which are separated by
-        a ':' character. Thus if the given Form ought to be a valid command form, each line in the body has to have
-        exactly one of these separation character.
+        the first ':' character. Thus if the given Form ought to be a valid command form, each line in the body has to
+        have at least one of these separation character, all the following ones are part of the value.
         The resulting dict will have string keys and string values only.
         Raises:
-            ValueError: In case there is not exactly on ':' character in a line
+            ValueError: In case there is no ':' character in a line
         Args:
             form: The Form object, whose body is to be turned into a dict
 
@@ -412,36 +780,80 @@ class CommandingForm:
         body_dict = {}
 
         # Turning the body of the form into a dict in the way of taking each line of the line list as a key value pair
-        # separated by the ':' character
+        # separated by the first ':' character
         for line in form.body_list:
-            line_split = line.split(":")
+            key, separator, value = line.partition(":")
 
-            # Checking if there actually is exactly one separation character
-            if len(line_split) != 2:
-                raise ValueError("The body of command form has to be separated by exactlky one ':' character")
+            # Checking if there actually is a separation character
+            if not separator:
+                raise ValueError("The lines of the body of a commanding form have to contain a ':' character")
 
-            # Adding the key value tuple as item to the dict
-            body_dict[line_split[0]] = line_split[1]
+            body_dict[key] = value
 
         return body_dict
 
+
 class CommandForm(CommandingForm):
     """
     This is a sub class to the CommandingForm base class
-    """
-    def __init__(self, command, pos_args=[], kw_args={}, return_mode="reply", error_mode="reply"):
-        # Creating dictionary, which holds the parameters of the object
-        spec = {
-            "command": command,
-            "pos_args": pos_args,
-            "kw_args": kw_args,
-            "return_mode": return_mode,
-            "error_mode": error_mode
-        }
 
-        # Passing the dict to the constructor of the base class, as it is assigned as the instance attribute _spec
-        # there, also base class provides key indexing magic method for the instance with that dict
-        CommandingForm.__init__(self, spec)
+    RETURN MODES
+    - reply: The handler sends the return value back as a ReturnForm (or the error as an ErrorForm)
+    - none: Fire and forget, the handler does not send any response at all and the client does not wait for one
+
+    ERROR MODES
+    - reply: An exception of the command is sent back as an ErrorForm instead of the ReturnForm
+    - deferred: An exception of the command is collected by the handler. Instead of sending an ErrorForm for every
+      failure, all the collected errors are attached to the next response sent over the connection or are returned
+      by the reserved 'fetch_errors' command
+
+    DEADLINE
+    The optional deadline is the absolute time (seconds since the epoch) until which the client is interested in the
+    result. The handler does not start a command, whose deadline has already passed, but answers it with a
+    TimeoutError. Commands, that accept a 'cancel_token' parameter, get a CancellationToken for the deadline, so they
+    can stop early. As the deadline is compared to the clock of the handler, the clocks of both sides have to be
+    synchronized reasonably well.
+
+    HEADER
+    The body of a command form is the header of the command. When receiving, it is parsed in a single pass over the
+    body lines, each line being split at the first ':' character only, so the values can contain any character except
+    for the newline. The 'header_fields' dict maps the keys of the body lines to the parameters of the command form,
+    lines with unknown keys are ignored.
+    """
+    __slots__ = ("_command", "_pos_args", "_kw_args", "_return_mode", "_error_mode", "_deadline")
+
+    # The possible values for the return mode
+    return_modes = ("reply", "none")
+    # The possible values for the error mode
+    error_modes = ("reply", "deferred")
+    # The keys of the body lines mapped to the names of the parameters of the command form
+    header_fields = {
+        "command": "command",
+        "return": "return_mode",
+        "error": "error_mode",
+        "deadline": "deadline"
+    }
+
+    def __init__(self, command, pos_args=[], kw_args={}, return_mode="reply", error_mode="reply", deadline=None):
+        # In case a Form object has been passed instead of the command name, all the parameters are being extracted
+        # from that form, which is then kept as the form of the object
+        form = None
+        if isinstance(command, Form):
+            form = command
+            command, pos_args, kw_args, return_mode, error_mode, deadline = self._procure_parameters(form)
+        self._check_return_mode(return_mode)
+        self._check_error_mode(error_mode)
+
+        # Assigning the slots, which hold the parameters of the object
+        self._command = command
+        self._pos_args = pos_args
+        self._kw_args = kw_args
+        self._return_mode = return_mode
+        self._error_mode = error_mode
+        self._deadline = deadline
+
+        # The base class provides the key indexing magic method for the instance with the spec dict of those slots
+        CommandingForm.__init__(self, form)
 
     def procure_body(self):
         """
@@ -456,29 +868,31 @@ class CommandForm(CommandingForm):
         # Creating the line list for the form body with the relevant information about the command name, the return
         # mode and the error mode. Then returning that list so it can be used as the body parameter for the Form constr.
         body_line_list = [
-            self._procure_body_line("command"),
-            self._procure_body_line("return_mode"),
-            self._procure_body_line("error_mode")
+            self._procure_body_line("command", self.command_name),
+            self._procure_body_line("return", self.return_mode),
+            self._procure_body_line("error", self.error_mode),
+            self._procure_body_line("pos_args", self._procure_pos_args_length())
         ]
+        # The deadline line is only added, if there is one, the repr keeps the full precision of the float
+        if self.deadline is not None:
+            body_line_list.append(self._procure_body_line("deadline", repr(self.deadline)))
 
         return body_line_list
 
-    def _procure_body_line(self, key):
+    @staticmethod
+    def _procure_body_line(name, value):
         """
-        This method takes the string key of a entry of the spec dict and therefore the name of a attrubute if the
-        object and then merges this string key with the value into a single string, separated by the ':' character,
-        after calling the string conversion in the value.
-        Raise:
-            KeyError: In case the the specified string does not specify an actual parameter in the dict
+        This method takes the string name of a body entry and the value to be transmitted for it and merges them into a
+        single string, separated by the ':' character, after calling the string conversion on the value.
         Args:
-            key: The string name of a attribute of the object, which is in the spec dict, that is supposed to be merged
-                with its value into a line for the body of the form.
+            name: The string name of the body entry, which will later be used as the key of the body dict
+            value: The value of the entry, which is being converted into a string
 
         Returns:
-        The string, that consists if both the given string key and the corresponding value of the spec dict
+        The string, that consists of both the given name and the string version of the value
         """
-        # Simply Joining the key and the value of the chosen entry of the spec dict with the ':' string as separator
-        line_string = ':'.join([key, self[key]])
+        # Simply Joining the name and the value of the entry with the ':' string as separator
+        line_string = ':'.join([name, str(value)])
         return line_string
 
     def procure_appendix(self):
@@ -532,25 +946,52 @@ class CommandForm(CommandingForm):
     def error_mode(self):
         """
         A string flag, which signals, which behaviour for an eventual exception/error is desired for the server
-        side of the execution. At this point there is the only option 'reply' which will cause the server to send
-        back the error as a separate form.
+        side of the execution. The option 'reply' will cause the server to send back the error as a separate form,
+        with the option 'deferred' the error is being collected by the server and reported in bulk later on.
 
         Returns:
         The string flag for the error behaviour
         """
-        return self["error_mode"]
+        return self._error_mode
 
     @property
     def return_mode(self):
         """
         A string flag, which signals, which behaviour for the return value of the command call is desired from the
-        server side of the execution. At the moment there is the only option 'reply', which will cause the server
-        to send the return of the command call back as a separate form.
+        server side of the execution. The option 'reply' will cause the server to send the return of the command call
+        back as a separate form, with the option 'none' no response is being sent at all.
 
         Returns:
         The string flag for the return behaviour
         """
-        return self["return_mode"]
+        return self._return_mode
+
+    @property
+    def replies(self):
+        """
+        The boolean value of whether the handler sends a response for this form
+        Returns:
+        bool
+        """
+        return self.return_mode != "none"
+
+    @property
+    def deadline(self):
+        """
+        The absolute time in seconds since the epoch, after which the result of the command is of no interest anymore
+        Returns:
+        The float deadline, None if the command has no deadline
+        """
+        return self._deadline
+
+    @property
+    def expired(self):
+        """
+        The boolean value of whether the deadline of the command has already passed
+        Returns:
+        bool
+        """
+        return self.deadline is not None and time.time() >= self.deadline
 
     @property
     def kw_args(self):
@@ -562,7 +1003,17 @@ class CommandForm(CommandingForm):
         Returns:
         The dict, which represents the kw args for the command call
         """
-        return self["kw_args"]
+        return self._kw_args
+
+    @property
+    def key_args(self):
+        """
+        Alias for the 'kw_args' property, which is used by the CommandContext, when the command is being executed
+
+        Returns:
+        The dict, which represents the kw args for the command call
+        """
+        return self.kw_args
 
     @property
     def pos_args(self):
@@ -574,7 +1025,7 @@ class CommandForm(CommandingForm):
         Returns:
         The list of elements used as the positional arguments of the function
         """
-        return self["pos_args"]
+        return self._pos_args
 
     @property
     def command_name(self):
@@ -585,7 +1036,7 @@ class CommandForm(CommandingForm):
         Returns:
         The string command name of the command to be executed
         """
-        return self["command_name"]
+        return self._command
 
     def __str__(self):
         # TODO: Write str method for COmmand Form
@@ -603,24 +1054,127 @@ class CommandForm(CommandingForm):
         Returns:
         The CommandForm object from the form
         """
+        return CommandForm(form)
+
+    @classmethod
+    def from_template(cls, template, pos_args, kw_args, deadline=None):
+        """
+        This function creates a CommandForm for a call of the command compiled into the given CommandTemplate. Other
+        than the constructor, the modes are not checked again and the form is created from the FormTemplate of the
+        command template, so only the lines for the amount of pos args and the deadline and the appendix with the
+        arguments are being created.
+        Args:
+            template: The CommandTemplate of the command
+            pos_args: The pos args list
+            kw_args: The kw args dict
+            deadline: The float deadline of the command, None for no deadline
+
+        Returns:
+        The CommandForm object
+        """
+        command_form = cls.__new__(cls)
+        command_form._command = template.command
+        command_form._pos_args = pos_args
+        command_form._kw_args = kw_args
+        command_form._return_mode = template.return_mode
+        command_form._error_mode = template.error_mode
+        command_form._deadline = deadline
+
+        # The lines following the fixed lines of the template in the same order as created by 'procure_body'
+        body_lines = ["pos_args:{}".format(len(pos_args))]
+        if deadline is not None:
+            body_lines.append("deadline:{!r}".format(deadline))
+        appendix = {"pos_args": pos_args, "kw_args": kw_args}
+        command_form.form = template.form_template.create_form(body_lines, appendix)
+        return command_form
+
+    @classmethod
+    def _check_return_mode(cls, return_mode):
+        """
+        This function checks if the given return mode is one of the supported ones
+        Raises:
+            ValueError: In case the return mode is not supported
+        Args:
+            return_mode: The string return mode
+
+        Returns:
+        void
+        """
+        if return_mode not in cls.return_modes:
+            raise ValueError("The return mode '{}' is not supported".format(return_mode))
+
+    @classmethod
+    def _check_error_mode(cls, error_mode):
+        """
+        This function checks if the given error mode is one of the supported ones
+        Raises:
+            ValueError: In case the error mode is not supported
+        Args:
+            error_mode: The string error mode
+
+        Returns:
+        void
+        """
+        if error_mode not in cls.error_modes:
+            raise ValueError("The error mode '{}' is not supported".format(error_mode))
+
+    @staticmethod
+    def _procure_parameters(form):
+        """
+        This function takes a Form object and first checks if it is actually meant to be a CommandForm. If it is, all
+        the parameters, which are needed to create a CommandForm wrapper are being extracted from the Form and returned
+        as a tuple.
+        Raises:
+            TypeError: In case the passed object is not a Form
+            ValueError: In case the Form is not a command form
+        Args:
+            form: The Form object from which to extract the parameters
+
+        Returns:
+        The tuple (command_name, pos_args, kw_args, return_mode, error_mode, deadline)
+        """
         # Checking if the form even is a Form
         CommandForm._check_form(form)
         # Checking if the form is even meant to be a commanding form
-        CommandForm._check_title(form)
+        CommandForm._check_title(form, "COMMAND")
 
-        # Getting the command name and the error and return mode from the body by using a dict, that was created from
-        # the body string, by applying the CommandForm rules for creation
-        body_dict = CommandForm._procure_body_dict(form)
-        command_name = body_dict["command"]
-        error_mode = body_dict["error_mode"]
-        return_mode = body_dict["return_mode"]
+        # Getting the command name, the error and return mode and the deadline from the body in a single pass
+        header = CommandForm.parse_header(form.body)
 
         # Getting the pos and the kw args
         pos_args, kw_args = CommandForm._procure_args(form)
 
-        # Creating the CommandForm object from that and returning that
-        command_form = CommandForm(command_name, pos_args, kw_args, error_mode=error_mode, return_mode=return_mode)
-        return command_form
+        return header["command"], pos_args, kw_args, header["return_mode"], header["error_mode"], header["deadline"]
+
+    @staticmethod
+    def parse_header(body):
+        """
+        This function parses the body string of a command form in a single pass over its lines. Each line is split
+        at its first ':' character only, so the values can contain ':' characters as well.
+        Raises:
+            ValueError: In case a line does not contain a ':' character or the command name is missing
+        Args:
+            body: The body string of the command form
+
+        Returns:
+        The dict with the items 'command', 'return_mode', 'error_mode' (all strings) and 'deadline' (float or None)
+        """
+        header = {"return_mode": "reply", "error_mode": "reply", "deadline": None}
+        header_fields = CommandForm.header_fields
+        for line in body.split("\n"):
+            key, separator, value = line.partition(":")
+            if not separator:
+                raise ValueError("The lines of the body of a command form have to contain a ':' character")
+            field = header_fields.get(key)
+            if field is not None:
+                header[field] = value
+
+        if "command" not in header:
+            raise ValueError("The body of the command form does not contain the command name")
+        # The deadline is the only field, which is not a string
+        if header["deadline"] is not None:
+            header["deadline"] = float(header["deadline"])
+        return header
 
     @staticmethod
     def _procure_args(form):
@@ -653,17 +1207,78 @@ class CommandForm(CommandingForm):
             raise ValueError("The appendix of the command form does not contain the args")
 
 
+class CommandTemplate:
+    """
+    GENERAL
+    A CommandTemplate is a command compiled once for a loop, which issues the same command with the same return and
+    error mode over and over again, while only the arguments change. The title and the body lines with the command
+    name and the modes are being checked and encoded only once by a FormTemplate. Every call then only creates the
+    lines for the amount of pos args and the deadline and encodes the appendix with the arguments. The forms created
+    from a template are regular CommandForms and are received and executed by the handler just like those.
+    Examples:
+        template = CommandTemplate("add")
+        for i in range(1000):
+            client.execute_template(template, [i], {"b": 1})
+
+    Attributes:
+        command: The string name of the command
+        return_mode: The string return mode of the command, either 'reply' or 'none'
+        error_mode: The string error mode of the command, either 'reply' or 'deferred'
+        form_template: The FormTemplate of the command forms
+    """
+    def __init__(self, command, return_mode="reply", error_mode="reply", appendix_encoder=JsonAppendixEncoder):
+        CommandForm._check_return_mode(return_mode)
+        CommandForm._check_error_mode(error_mode)
+        self.command = command
+        self.return_mode = return_mode
+        self.error_mode = error_mode
+        self.form_template = FormTemplate("COMMAND", [
+            CommandForm._procure_body_line("command", command),
+            CommandForm._procure_body_line("return", return_mode),
+            CommandForm._procure_body_line("error", error_mode)
+        ], appendix_encoder)
+
+    def create(self, pos_args=(), kw_args=None, deadline=None):
+        """
+        This method creates the CommandForm for a call of the command with the given arguments
+        Args:
+            pos_args: The pos args list
+            kw_args: The kw args dict, None for no kw args
+            deadline: The float deadline of the command, None for no deadline
+
+        Returns:
+        The CommandForm object
+        """
+        return CommandForm.from_template(self, list(pos_args), {} if kw_args is None else kw_args, deadline)
+
+    @property
+    def replies(self):
+        """
+        The boolean value of whether the handler sends a response for the commands of this template
+        Returns:
+        bool
+        """
+        return self.return_mode != "none"
+
+
 class ReturnForm(CommandingForm):
     """
     pass
     """
+    __slots__ = ("_return_value", "_return_type")
+
     def __init__(self, return_value):
-        # Creating the dict with all the attributes, that define the object
-        spec = {
-            "return_value": return_value,
-            "return_type": type(return_value)
-        }
-        CommandingForm.__init__(self, spec)
+        # In case a Form object has been passed, the return value is being extracted from that form
+        form = None
+        if isinstance(return_value, Form):
+            form = return_value
+            self._check_title(form, "RETURN")
+            return_value = self._procure_return_value(form)
+
+        # Assigning the slots with all the attributes, that define the object
+        self._return_value = return_value
+        self._return_type = type(return_value)
+        CommandingForm.__init__(self, form)
 
     def procure_body(self):
         """
@@ -695,7 +1310,7 @@ class ReturnForm(CommandingForm):
         Returns:
         The return value, whatever that may be
         """
-        return self["return_value"]
+        return self._return_value
 
     @property
     def return_type(self):
@@ -704,7 +1319,7 @@ class ReturnForm(CommandingForm):
         Returns:
         A type object
         """
-        return self["return_type"]
+        return self._return_type
 
     def __str__(self):
         pass
@@ -722,17 +1337,9 @@ class ReturnForm(CommandingForm):
         Returns:
         The ReturnForm created from the Form
         """
-        # Checking if the passed object is a form
+        # Checking if the passed object is a form, the rest is done by the constructor
         ReturnForm._check_form(form)
-        # Checking if the given form is actually meant to be a return form by checking the title
-        ReturnForm._check_title(form, "RETURN")
-
-        # Getting the return value from the form
-        return_value = ReturnForm._procure_return_value(form)
-        # Creating the return form wrapper from that value and returning that
-        return_form = ReturnForm(return_value)
-
-        return return_form
+        return ReturnForm(form)
 
     @staticmethod
     def _procure_return_value(form):
@@ -762,15 +1369,22 @@ class ErrorForm(CommandingForm):
     """
 
     """
+    __slots__ = ("_exception", "_exception_type", "_exception_message")
+
     def __init__(self, exception):
-        # Creating the spec dict with the actual exception object, the string name and the string message
-        spec = {
-            "exception": exception,
-            "exception_type": self._procure_exception_name(exception),
-            "exception_message": self._procure_exception_message(exception)
-        }
-        # Init super class with the created spec
-        CommandingForm.__init__(self, spec)
+        # In case a Form object has been passed, the exception is being restored from the body of that form
+        form = None
+        if isinstance(exception, Form):
+            form = exception
+            self._check_title(form, "ERROR")
+            exception = self._procure_exception(form)
+
+        # Assigning the slots with the actual exception object, the string name and the string message
+        self._exception = exception
+        self._exception_type = self._procure_exception_name(exception)
+        self._exception_message = self._procure_exception_message(exception)
+        # Init super class
+        CommandingForm.__init__(self, form)
 
     def procure_appendix(self):
         """
@@ -806,9 +1420,9 @@ class ErrorForm(CommandingForm):
     def _procure_exception_message_line(self):
         """
         This method creates the string version of the exception message, that can be put as a line in the body of
-        the form. The Commanding protocol works by separating items of the body by new lines and separating the key
-        from the value with a ':' character, thus this method removes those character from the message string and
-        returns that safe string.
+        the form. The Commanding protocol works by separating items of the body by new lines, thus this method
+        removes those character from the message string and returns that safe string. As the key is separated from
+        the value by the first ':' character, the message can contain ':' characters.
 
         Returns:
         The string of the error message, safe for use in the body of the form
@@ -816,8 +1430,7 @@ class ErrorForm(CommandingForm):
         # Getting the string of the exception message
         message_line = self.exception_message
 
-        # There shall be no newline character and no ":" due to the rules of the commanding protocol
-        message_line = message_line.replace(":", ";")
+        # There shall be no newline character due to the rules of the commanding protocol
         message_line = message_line.replace("\n", " ")
 
         return message_line
@@ -871,7 +1484,7 @@ class ErrorForm(CommandingForm):
         Returns:
         The exception, that is subject to this object
         """
-        return self["exception"]
+        return self._exception
 
     @property
     def exception_class_name(self):
@@ -882,7 +1495,7 @@ class ErrorForm(CommandingForm):
         Returns:
         The string class name of the exception, which is subject to this object
         """
-        return self["exception_type"]
+        return self._exception_type
 
     @property
     def exception_message(self):
@@ -893,7 +1506,7 @@ class ErrorForm(CommandingForm):
         Returns:
         The string of the message
         """
-        return self["exception_message"]
+        return self._exception_message
 
     def __str__(self):
         pass
@@ -902,8 +1515,8 @@ class ErrorForm(CommandingForm):
     def from_form(form):
         """
         This function creates a new ErrorForm wrapper object from an already existing form, created from a ErrorForm.
-        The name and the message string of the error in the forms body are being used to create a dynamic eval statement
-        of a new created Exception message of the type defined by the name string and the given message.
+        The name and the message string of the error in the forms body are being used to create a new Exception of the
+        type defined by the name string with the given message.
         The function will also check first if the passed object is even a form and if this form is actually meant to be
         an ErrorForm
         Args:
@@ -913,58 +1526,1328 @@ class ErrorForm(CommandingForm):
         The created ErrorForm object
         """
         ErrorForm._check_form(form)
-        ErrorForm._check_title(form, "ERROR")
+        return ErrorForm(form)
+
+    @staticmethod
+    def _procure_exception(form):
+        """
+        This function takes the name and the message string of the error from the body of the given form and creates
+        a new exception object from it. The exception class is looked up by its name in the builtins and this module,
+        in case the name is unknown, a plain Exception is being created.
+        Args:
+            form: The Form object, that was created from an ErrorForm
 
+        Returns:
+        The exception object described by the form
+        """
         body_dict = ErrorForm._procure_body_dict(form)
         error_name = body_dict["name"]
         error_message = body_dict["message"]
+        return ErrorForm._create_exception(error_name, error_message)
 
-        exception = eval("""{}("{}")""".format(error_name, error_message))
-        return ErrorForm(exception)
+    @staticmethod
+    def _create_exception(error_name, error_message):
+        """
+        This function creates a new exception object from the string name of the exception class and the message.
+        The exception class is looked up by its name in the builtins and this module, instead of evaluating the string
+        received from the remote side. In case the name is unknown or the exception class can not be created from the
+        message alone (UnicodeDecodeError for example needs five arguments), a plain Exception is being created, whose
+        message starts with the name of the original exception.
+        Args:
+            error_name: The string name of the exception class
+            error_message: The string message of the exception
 
+        Returns:
+        The exception object
+        """
+        exception_class = globals().get(error_name, getattr(builtins, error_name, None))
+        if not (isinstance(exception_class, type) and issubclass(exception_class, Exception)):
+            return Exception("{}: {}".format(error_name, error_message))
+        try:
+            return exception_class(error_message)
+        except Exception:
+            return Exception("{}: {}".format(error_name, error_message))
 
-class CommandingBase(threading.Thread):
+    @staticmethod
+    def deferred_errors(form):
+        """
+        This function returns the deferred errors, which the handler has attached to the appendix of a response form
+        under the key 'deferred'. A response without deferred errors results in an empty list.
+        Args:
+            form: The response Form object
 
-    def __init__(self, connection, command_context, separation="$separation$"):
-        threading.Thread.__init__(self)
-        self.connection = connection
-        self.separation = separation
-        self.command_context = command_context
+        Returns:
+        The list of tuples (command_name, exception)
+        """
+        if not isinstance(form.appendix, dict):
+            return []
+        return ErrorForm._procure_deferred_errors(form.appendix.get("deferred", []))
 
-    def send_request(self):
+    @staticmethod
+    def _procure_deferred_list(errors):
         """
-        This method sends a 'request' string over the connection and then waits an indefinite amount of time until a
-        line string has been received. If the received string is the 'ack' string, the methods exists, in case not, an
-        exception is being raised.
-        Raises:
-            ValueError: In case the received string is not the ack string
+        This function turns the deferred errors into a list, which can be appendix encoded
+        Examples:
+            [("divide", ZeroDivisionError("division by zero"))] -> [["divide", "ZeroDivisionError", "division by zero"]]
+        Args:
+            errors: The list of tuples (command_name, exception)
+
         Returns:
-        void
+        The list with a list of the command name, the exception class name and the message for every error
         """
-        # Sending a request to the other side of the connection
-        self.connection.sendall_string("request\n")
-        # Waiting for the ack
-        line_string = self.wait_line()
-        if line_string != "ack":
-            raise ValueError("The ack was not replied")
+        deferred_list = []
+        for command_name, exception in errors:
+            error_name = ErrorForm._procure_exception_name(exception)
+            error_message = ErrorForm._procure_exception_message(exception)
+            deferred_list.append([command_name, error_name, error_message])
+        return deferred_list
 
-    def wait_request(self):
+    @staticmethod
+    def _procure_deferred_errors(deferred_list):
         """
-        This method waits an indefinite amount of time for a new line to be received over the connection, then checks
-        if the received string is a 'request' string. In case it is, an 'ack' string will be sent back to the client,
-        which signals, that the actual form can now be transmitted.
-        Raises:
-            ValueError: In case the received string was not the request string
+        This function restores the deferred errors from the list created by '_procure_deferred_list'
+        Args:
+            deferred_list: The list with a list of the command name, the exception class name and the message
+
         Returns:
-        void
+        The list of tuples (command_name, exception)
         """
-        # Waiting for a line to be received by the connection
-        line_string = self.wait_line()
-        if line_string != "request":
+        errors = []
+        for command_name, error_name, error_message in deferred_list:
+            errors.append((command_name, ErrorForm._create_exception(error_name, error_message)))
+        return errors
+
+
+class BatchCommandForm(CommandingForm):
+    """
+    The BatchCommandForm carries an ordered list of command calls, which are all executed by the handler in one go.
+    This way N commands only need a single request, form exchange and response instead of N of them. The handler
+    answers a BatchCommandForm with a single BatchReturnForm, which contains a result or an error for every call.
+    With the error mode 'deferred' the result of a failed call is None and its error is being reported in bulk, see
+    the error modes of the CommandForm.
+    The optional deadline applies to the batch as a whole, like the deadline of a CommandForm: A batch, whose deadline
+    has passed is not executed at all, but answered with a TimeoutError. The calls of the batch get the deadline for
+    their cancellation tokens.
+    Examples:
+        BatchCommandForm([("time", [], {}), ("print", ["hello"], {"end": ""})])
+    """
+    __slots__ = ("_calls", "_return_mode", "_error_mode", "_deadline")
+
+    def __init__(self, calls, return_mode="reply", error_mode="reply", deadline=None):
+        # In case a Form object has been passed, the parameters are being extracted from that form
+        form = None
+        if isinstance(calls, Form):
+            form = calls
+            calls, return_mode, error_mode, deadline = self._procure_parameters(form)
+        CommandForm._check_return_mode(return_mode)
+        CommandForm._check_error_mode(error_mode)
+
+        self._calls = [self._procure_call(call) for call in calls]
+        self._return_mode = return_mode
+        self._error_mode = error_mode
+        self._deadline = deadline
+        CommandingForm.__init__(self, form)
+
+    def procure_body(self):
+        """
+        The body of the batch contains the return and error mode and the amount of calls in the batch
+        Returns:
+        The list with string lines, that specify the body of the Form
+        """
+        body_line_list = [
+            CommandForm._procure_body_line("return", self.return_mode),
+            CommandForm._procure_body_line("error", self.error_mode),
+            CommandForm._procure_body_line("calls", len(self.calls))
+        ]
+        if self.deadline is not None:
+            body_line_list.append(CommandForm._procure_body_line("deadline", repr(self.deadline)))
+        return body_line_list
+
+    def procure_appendix(self):
+        """
+        The appendix contains the list of the calls, where each call is a list of the command name, the pos args list
+        and the kw args dict
+        Returns:
+        The dict object to be used as the appendix of the form object
+        """
+        return {"calls": [list(call) for call in self.calls]}
+
+    @property
+    def calls(self):
+        """
+        The list of tuples (command_name, pos_args, kw_args), one for every command to be executed in that order
+        Returns:
+        list
+        """
+        return self._calls
+
+    @property
+    def error_mode(self):
+        """
+        The string flag for the error behaviour of the batch
+        Returns:
+        string
+        """
+        return self._error_mode
+
+    @property
+    def return_mode(self):
+        """
+        The string flag for the return behaviour of the batch
+        Returns:
+        string
+        """
+        return self._return_mode
+
+    @property
+    def deadline(self):
+        """
+        The absolute time (seconds since the epoch), until which the client is interested in the results of the batch
+        Returns:
+        The float deadline, None if the batch has no deadline
+        """
+        return self._deadline
+
+    @property
+    def expired(self):
+        """
+        The boolean value of whether the deadline of the batch has already passed
+        Returns:
+        bool
+        """
+        return self.deadline is not None and time.time() >= self.deadline
+
+    @property
+    def replies(self):
+        """
+        The boolean value of whether the handler sends a response for this form
+        Returns:
+        bool
+        """
+        return self.return_mode != "none"
+
+    def command_forms(self):
+        """
+        This method creates a CommandForm for every call of the batch, which has the deadline of the batch
+        Returns:
+        The list of CommandForm objects
+        """
+        return [
+            CommandForm(command_name, pos_args, kw_args, deadline=self.deadline)
+            for command_name, pos_args, kw_args in self.calls
+        ]
+
+    def __str__(self):
+        pass
+
+    @staticmethod
+    def from_form(form):
+        """
+        This function creates the BatchCommandForm wrapper from a Form object
+        Args:
+            form: The Form object to turn into a BatchCommandForm
+
+        Returns:
+        The BatchCommandForm object
+        """
+        BatchCommandForm._check_form(form)
+        return BatchCommandForm(form)
+
+    @staticmethod
+    def _procure_call(call):
+        """
+        This function turns a call given as a sequence of the command name and optionally the pos args and kw args
+        into the tuple (command_name, pos_args, kw_args)
+        Raises:
+            ValueError: In case the call does not consist of one to three elements
+        Args:
+            call: The string command name or a sequence with the command name, the pos args and the kw args
+
+        Returns:
+        The tuple (command_name, pos_args, kw_args)
+        """
+        if isinstance(call, str):
+            call = [call]
+        if not 1 <= len(call) <= 3:
+            raise ValueError("A call of a batch has to consist of the command name, pos args and kw args")
+        command_name = call[0]
+        pos_args = list(call[1]) if len(call) > 1 else []
+        kw_args = dict(call[2]) if len(call) > 2 else {}
+        return command_name, pos_args, kw_args
+
+    @staticmethod
+    def _procure_parameters(form):
+        """
+        This function extracts the parameters for the BatchCommandForm from a Form object
+        Raises:
+            ValueError: In case the form is not a batch command form or the appendix does not contain the calls
+        Args:
+            form: The Form object
+
+        Returns:
+        The tuple (calls, return_mode, error_mode, deadline)
+        """
+        BatchCommandForm._check_form(form)
+        BatchCommandForm._check_title(form, "BATCHCOMMAND")
+        body_dict = BatchCommandForm._procure_body_dict(form)
+
+        if not isinstance(form.appendix, dict) or "calls" not in form.appendix:
+            raise ValueError("The appendix of the batch command form does not contain the calls")
+        deadline = body_dict.get("deadline")
+        if deadline is not None:
+            deadline = float(deadline)
+        return form.appendix["calls"], body_dict["return"], body_dict["error"], deadline
+
+
+class BatchReturnForm(CommandingForm):
+    """
+    The BatchReturnForm is the response to a BatchCommandForm. It contains the results of all the calls of the batch
+    in the same order, where the result of a call is either its return value or the exception it raised.
+    In the appendix every result is a dict with either the 'return' key for the return value or the 'error' key for
+    the list of the exception class name and the message.
+    """
+    __slots__ = ("_results",)
+
+    def __init__(self, results):
+        # In case a Form object has been passed, the results are being extracted from that form
+        form = None
+        if isinstance(results, Form):
+            form = results
+            results = self._procure_results(form)
+
+        self._results = list(results)
+        CommandingForm.__init__(self, form)
+
+    def procure_body(self):
+        """
+        The body only contains the amount of results
+        Returns:
+        The list with the line string
+        """
+        return [CommandForm._procure_body_line("results", len(self.results))]
+
+    def procure_appendix(self):
+        """
+        The appendix contains the list with a dict for every result.
+        Examples:
+            appendix = {"results": [{"return": 12}, {"error": ["ValueError", "wrong value"]}]}
+        Returns:
+        The dict object to be used as the appendix of the form object
+        """
+        result_list = []
+        for result in self.results:
+            if isinstance(result, Exception):
+                error_name = ErrorForm._procure_exception_name(result)
+                error_message = ErrorForm._procure_exception_message(result)
+                result_list.append({"error": [error_name, error_message]})
+            else:
+                result_list.append({"return": result})
+        return {"results": result_list}
+
+    @property
+    def results(self):
+        """
+        The list of the results of the batch calls, each one being either the return value or the exception
+        Returns:
+        list
+        """
+        return self._results
+
+    def __str__(self):
+        pass
+
+    @staticmethod
+    def from_form(form):
+        """
+        This function creates the BatchReturnForm wrapper from a Form object
+        Args:
+            form: The Form object to turn into a BatchReturnForm
+
+        Returns:
+        The BatchReturnForm object
+        """
+        BatchReturnForm._check_form(form)
+        return BatchReturnForm(form)
+
+    @staticmethod
+    def _procure_results(form):
+        """
+        This function extracts the list of results from the appendix of the form, restoring the exceptions
+        Raises:
+            ValueError: In case the form is not a batch return form or the appendix does not contain the results
+        Args:
+            form: The Form object
+
+        Returns:
+        The list of results
+        """
+        BatchReturnForm._check_form(form)
+        BatchReturnForm._check_title(form, "BATCHRETURN")
+        if not isinstance(form.appendix, dict) or "results" not in form.appendix:
+            raise ValueError("The appendix of the batch return form does not contain the results")
+
+        results = []
+        for result in form.appendix["results"]:
+            if "error" in result:
+                results.append(ErrorForm._create_exception(*result["error"]))
+            else:
+                results.append(result["return"])
+        return results
+
+
+class StreamItemForm(CommandingForm):
+    """
+    The StreamItemForm carries a single item yielded by a generator command. The handler sends one of those forms for
+    every item, as soon as it has been yielded, and concludes the stream with a StreamEndForm (or an ErrorForm in
+    case the generator raised an exception).
+    """
+    __slots__ = ("_item",)
+
+    def __init__(self, item):
+        # In case a Form object has been passed, the item is being extracted from that form
+        form = None
+        if isinstance(item, Form):
+            form = item
+            item = self._procure_item(form)
+
+        self._item = item
+        CommandingForm.__init__(self, form)
+
+    def procure_body(self):
+        """
+        The body only contains the type of the item
+        Returns:
+        The list with the line string
+        """
+        return [CommandForm._procure_body_line("type", type(self.item))]
+
+    def procure_appendix(self):
+        """
+        The appendix contains the item with the key 'item'
+        Returns:
+        The dict object to be used as the appendix of the form object
+        """
+        return {"item": self.item}
+
+    @property
+    def item(self):
+        """
+        The item yielded by the generator command
+        Returns:
+        The item, whatever that may be (It has to be appendix encoded)
+        """
+        return self._item
+
+    def __str__(self):
+        pass
+
+    @staticmethod
+    def from_form(form):
+        """
+        This function creates the StreamItemForm wrapper from a Form object
+        Args:
+            form: The Form object to turn into a StreamItemForm
+
+        Returns:
+        The StreamItemForm object
+        """
+        StreamItemForm._check_form(form)
+        return StreamItemForm(form)
+
+    @staticmethod
+    def _procure_item(form):
+        """
+        This function extracts the item from the appendix of the form
+        Raises:
+            ValueError: In case the form is not a stream item form or the appendix does not contain the item
+        Args:
+            form: The Form object
+
+        Returns:
+        The item
+        """
+        StreamItemForm._check_form(form)
+        StreamItemForm._check_title(form, "STREAMITEM")
+        if not isinstance(form.appendix, dict) or "item" not in form.appendix:
+            raise ValueError("The appendix of the stream item form does not contain the item")
+        return form.appendix["item"]
+
+
+class StreamEndForm(CommandingForm):
+    """
+    The StreamEndForm concludes the stream of StreamItemForms sent for a generator command. It carries the amount of
+    items, that have been sent.
+    """
+    __slots__ = ("_count",)
+
+    def __init__(self, count):
+        # In case a Form object has been passed, the count is being extracted from that form
+        form = None
+        if isinstance(count, Form):
+            form = count
+            StreamEndForm._check_title(form, "STREAMEND")
+            count = int(StreamEndForm._procure_body_dict(form)["items"])
+
+        self._count = count
+        CommandingForm.__init__(self, form)
+
+    def procure_body(self):
+        """
+        The body only contains the amount of items of the stream
+        Returns:
+        The list with the line string
+        """
+        return [CommandForm._procure_body_line("items", self.count)]
+
+    def procure_appendix(self):
+        """
+        The appendix of the stream end is not being used
+        Returns:
+        An empty dict
+        """
+        return {}
+
+    @property
+    def count(self):
+        """
+        The int amount of items, that have been sent in the stream
+        Returns:
+        int
+        """
+        return self._count
+
+    def __str__(self):
+        pass
+
+    @staticmethod
+    def from_form(form):
+        """
+        This function creates the StreamEndForm wrapper from a Form object
+        Args:
+            form: The Form object to turn into a StreamEndForm
+
+        Returns:
+        The StreamEndForm object
+        """
+        StreamEndForm._check_form(form)
+        return StreamEndForm(form)
+
+
+class CancellationToken:
+    """
+    The CancellationToken is passed to commands, which accept a 'cancel_token' parameter. Long running commands are
+    supposed to check it every now and then and stop early, once it has been cancelled. A token is cancelled, when
+    the deadline of the command has passed or when 'cancel' has been called explicitly, for example by a command
+    context, that is being shut down.
+    Examples:
+        def command_crunch(self, items, cancel_token=None):
+            for item in items:
+                cancel_token.raise_if_cancelled()
+                ...
+    """
+    def __init__(self, deadline=None):
+        self.deadline = deadline
+        self._cancelled = False
+
+    def cancel(self):
+        """
+        This method cancels the token, no matter the deadline
+        Returns:
+        void
+        """
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        """
+        The boolean value of whether the token has been cancelled or its deadline has passed
+        Returns:
+        bool
+        """
+        return self._cancelled or (self.deadline is not None and time.time() >= self.deadline)
+
+    @property
+    def remaining(self):
+        """
+        The amount of seconds until the deadline, which is never negative
+        Returns:
+        The float amount of seconds, None if there is no deadline
+        """
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.time())
+
+    def raise_if_cancelled(self):
+        """
+        This method raises a TimeoutError in case the token has been cancelled
+        Raises:
+            TimeoutError: In case the token has been cancelled
+        Returns:
+        void
+        """
+        if self.cancelled:
+            raise TimeoutError("The command has been cancelled")
+
+
+class CommandProcessor:
+    """
+    GENERAL
+    The CommandProcessor implements, what the handler side of the commanding protocol does with a Form, that has been
+    received from a client: The form is being wrapped into the according CommandingForm, executed by the command
+    context and then the response forms are being created, which have to be sent back to the client.
+    The processor does not perform any I/O itself, which means the very same processing can be used by the
+    CommandingHandler Thread, which serves a single connection, as well as by the CommandingServer, which serves many
+    connections from a single Thread.
+
+    DEFERRED ERRORS
+    The errors of commands with the error mode 'deferred' are being collected by the processor. As those errors belong
+    to the client, that issued the commands, there has to be one processor per connection. The collected errors are
+    attached to the appendix of the next response form under the key 'deferred', or returned as the return value of
+    the reserved command 'fetch_errors', whatever comes first.
+    A client issuing fire and forget commands might never fetch the errors, thus at most 'max_deferred_errors' errors
+    are being kept. Beyond that the oldest errors are being dropped and counted by 'dropped_errors'.
+
+    RESULT CACHE
+    The response forms of the commands, which are marked as cacheable by the command context are being stored in the
+    result cache of the command context. A cache hit is answered with the very same Form object, which means the
+    appendix does not have to be encoded again. The call is being recorded in the metrics all the same, only without
+    an execution time.
+
+    STREAMS
+    In case a command returns a generator, the responses are not a list, but a generator of forms itself: For every
+    item yielded by the command a StreamItemForm is being created, at the time the handler is ready to transmit it,
+    and the stream is concluded by a StreamEndForm. That way the items do not have to fit in memory all at once and
+    the first item is sent before the command has finished. An exception raised by the generator ends the stream
+    with the ErrorForm.
+
+    DEADLINES
+    A CommandForm, whose deadline has already passed, when it is about to be executed, is not executed at all, but
+    answered with a TimeoutError. Coroutine commands are being cancelled at the deadline and a stream is ended with
+    a TimeoutError, once the deadline passes in between two items. Regular commands can only be stopped by themselves,
+    using the CancellationToken.
+    """
+    # The name of the reserved command, which returns the collected deferred errors
+    fetch_errors_command = "fetch_errors"
+
+    def __init__(self, command_context, max_deferred_errors=1024):
+        self.command_context = command_context
+        # The tuples (command_name, exception) of the failed commands with the error mode 'deferred', the deque drops
+        # the oldest errors, once the max amount has been reached
+        self.deferred_errors = collections.deque(maxlen=max_deferred_errors)
+        self.dropped_errors = 0
+
+    def process(self, form, received_time=None):
+        """
+        This method processes the given Form, by executing it on the command context. The return value of the command
+        will be wrapped into a ReturnForm, an eventual exception into an ErrorForm.
+        Notes:
+            In case the command is a coroutine function, the coroutine is being run to completion in a new event loop,
+            which means it will block the calling Thread. The AsyncCommandingHandler uses 'process_async' instead.
+        Args:
+            form: The Form object received from the client
+            received_time: The float perf_counter timestamp, at which the call has been received. The time until
+                the execution is being recorded as the queue wait in the metrics of the command context
+
+        Returns:
+        The list of Form objects, which have to be sent back to the client in that order
+        """
+        commanding_form, return_value, start, responses = self.begin_processing(form, received_time)
+        if responses is None:
+            try:
+                if isinstance(commanding_form, BatchCommandForm):
+                    return_value = [
+                        asyncio.run(self._await_call(result)) if inspect.isawaitable(result) else result
+                        for result in return_value
+                    ]
+                elif inspect.isawaitable(return_value):
+                    return_value = asyncio.run(self._await(return_value, self._remaining(commanding_form)))
+            except Exception as exception:
+                responses = self.respond_error(commanding_form, exception)
+        return self.finish_processing(commanding_form, return_value, start, responses)
+
+    async def process_async(self, form, received_time=None):
+        """
+        This method is the coroutine version of 'process'. Commands, which are coroutine functions are being awaited
+        within the running event loop
+        Args:
+            form: The Form object received from the client
+            received_time: The float perf_counter timestamp, at which the call has been received
+
+        Returns:
+        The list of Form objects, which have to be sent back to the client in that order
+        """
+        commanding_form, return_value, start, responses = self.begin_processing(form, received_time)
+        if responses is None:
+            try:
+                if isinstance(commanding_form, BatchCommandForm):
+                    return_value = [await self._await_call(result) for result in return_value]
+                elif inspect.isawaitable(return_value):
+                    return_value = await self._await(return_value, self._remaining(commanding_form))
+            except Exception as exception:
+                responses = self.respond_error(commanding_form, exception)
+        return self.finish_processing(commanding_form, return_value, start, responses)
+
+    def begin_processing(self, form, received_time):
+        """
+        This method performs the first part of 'process' and 'process_async', which is the same for both, up to the
+        point, where the awaitables returned by the command have to be resolved: The form is being evaluated, the
+        queue wait recorded and the result either taken from the result cache or produced by executing the form.
+        Args:
+            form: The Form object received from the client
+            received_time: The float perf_counter timestamp, at which the call has been received
+
+        Returns:
+        The tuple (commanding_form, return_value, start, responses). The start is the perf_counter timestamp of the
+        execution in case the tracer is enabled. The responses are not None only in case the processing is already
+        done, which is the case for a cache hit or an error
+        """
+        commanding_form = None
+        try:
+            # Creating the commanding form wrapper from the plain form and executing it
+            commanding_form = CommandingBase.evaluate_commanding_form(form)
+            self.record_wait(commanding_form, received_time)
+            cache_key = self.result_cache_key(commanding_form)
+            if cache_key is not None:
+                try:
+                    responses = [self.command_context.result_cache.get(cache_key)]
+                except KeyError:
+                    pass
+                else:
+                    self.record_cache_hit(commanding_form)
+                    return commanding_form, None, None, responses
+            start = time.perf_counter() if get_tracer().enabled else None
+            return commanding_form, self.execute(commanding_form), start, None
+        except Exception as exception:
+            return commanding_form, None, None, self.respond_error(commanding_form, exception)
+
+    def finish_processing(self, commanding_form, return_value, start, responses):
+        """
+        This method performs the last part of 'process' and 'process_async', once the return value has been resolved:
+        The execution is being traced, the response forms are being created and recorded in the metrics and the
+        deferred errors are being attached.
+        Args:
+            commanding_form: The commanding form received from the client
+            return_value: The resolved return value of the execution, the list of results for a batch
+            start: The float perf_counter timestamp of the start of the execution, None if the tracer is disabled
+            responses: The list of response forms, in case the processing is already done, None otherwise
+
+        Returns:
+        The list of Form objects, which have to be sent back to the client in that order
+        """
+        if responses is None:
+            try:
+                if start is not None:
+                    self.trace_execution(get_tracer(), commanding_form, start)
+                if isinstance(commanding_form, BatchCommandForm):
+                    responses = self.respond_batch(commanding_form, return_value)
+                else:
+                    responses = self.respond(commanding_form, return_value)
+            except Exception as exception:
+                responses = self.respond_error(commanding_form, exception)
+        self.record_responses(commanding_form, responses)
+        return self.attach_deferred_errors(responses)
+
+    def execute(self, commanding_form):
+        """
+        This method executes the commanding form with the command context. Only the reserved 'fetch_errors' command
+        is executed by the processor itself, as the deferred errors are stored here.
+        Args:
+            commanding_form: The commanding form received from the client
+
+        Returns:
+        The return value of the execution
+        """
+        if isinstance(commanding_form, (CommandForm, BatchCommandForm)) and commanding_form.expired:
+            raise TimeoutError("The deadline of the {} has passed before its execution".format(
+                self.describe(commanding_form)
+            ))
+        if isinstance(commanding_form, CommandForm) and commanding_form.command_name == self.fetch_errors_command:
+            return ErrorForm._procure_deferred_list(self.drain_deferred_errors())
+        return self.command_context.execute_form(commanding_form)
+
+    def record_wait(self, commanding_form, received_time):
+        """
+        This method records the time between the reception of a command and the start of its execution in the
+        metrics of the command context
+        Args:
+            commanding_form: The commanding form received from the client
+            received_time: The float perf_counter timestamp of the reception or None, in case it is unknown
+
+        Returns:
+        void
+        """
+        if received_time is not None and self.command_context.collect_metrics and \
+                isinstance(commanding_form, CommandForm):
+            self.command_context.metrics.observe(
+                "queue_wait_seconds", commanding_form.command_name, time.perf_counter() - received_time
+            )
+
+    def record_cache_hit(self, commanding_form):
+        """
+        This method records a call, which has been answered from the result cache, in the metrics of the command
+        context. The call and the size of its request are being recorded like for an executed call, only the
+        execution time is missing, as the command has not been executed
+        Args:
+            commanding_form: The CommandForm received from the client
+
+        Returns:
+        void
+        """
+        if self.command_context.collect_metrics:
+            metrics = self.command_context.metrics
+            metrics.count_call(commanding_form.command_name)
+            metrics.observe("request_bytes", commanding_form.command_name, len(commanding_form.form.appendix_encoded))
+
+    def record_responses(self, commanding_form, responses):
+        """
+        This method records the size of the encoded appendices of the responses to a command in the metrics of the
+        command context. The items of a stream are not being recorded
+        Args:
+            commanding_form: The commanding form received from the client
+            responses: The list of response forms
+
+        Returns:
+        void
+        """
+        if isinstance(responses, list) and self.command_context.collect_metrics and \
+                isinstance(commanding_form, CommandForm):
+            self.command_context.metrics.observe(
+                "response_bytes", commanding_form.command_name, sum(len(form.appendix_encoded) for form in responses)
+            )
+
+    @staticmethod
+    def trace_execution(tracer, commanding_form, start):
+        """
+        This method reports the successful execution of a command to the tracer as the phase 'execute_command', in
+        case the tracer is enabled. The command name is passed as the attribute 'command', a batch as 'batch'
+        Args:
+            tracer: The Tracer object
+            commanding_form: The executed commanding form
+            start: The float perf_counter timestamp of the start of the execution
+
+        Returns:
+        void
+        """
+        if tracer.enabled:
+            command_name = getattr(commanding_form, "command_name", "batch")
+            tracer.record("execute_command", start, time.perf_counter(), {"command": command_name})
+
+    def defer_error(self, command_name, exception):
+        """
+        This method adds an error to the collected deferred errors
+        Args:
+            command_name: The string name of the command, that failed
+            exception: The exception raised by the command
+
+        Returns:
+        void
+        """
+        if len(self.deferred_errors) == self.deferred_errors.maxlen:
+            self.dropped_errors += 1
+        self.deferred_errors.append((command_name, exception))
+
+    def drain_deferred_errors(self):
+        """
+        This method returns all the collected deferred errors and empties the collection
+        Returns:
+        The list of tuples (command_name, exception)
+        """
+        errors = list(self.deferred_errors)
+        self.deferred_errors.clear()
+        return errors
+
+    def attach_deferred_errors(self, responses):
+        """
+        This method attaches the collected deferred errors to the appendix of the first response form. In case there
+        are no responses or the responses are a stream, the errors stay collected until the next response.
+        Args:
+            responses: The list of response Form objects
+
+        Returns:
+        The list of response Form objects
+        """
+        # The errors can not be attached to a stream, they are kept for the next response in that case
+        if not isinstance(responses, list) or len(responses) == 0 or len(self.deferred_errors) == 0:
+            return responses
+        form = responses[0]
+        appendix = dict(form.appendix)
+        appendix["deferred"] = ErrorForm._procure_deferred_list(self.drain_deferred_errors())
+        return [Form(form.title, form.body, appendix)] + responses[1:]
+
+    def respond(self, commanding_form, return_value):
+        """
+        This method creates the response forms for the return value of a successfully executed command. In case the
+        form does not want a reply, there is no response at all.
+        Args:
+            commanding_form: The CommandForm, which was executed
+            return_value: The value returned by the command
+
+        Returns:
+        The list of Form objects to be sent back
+        """
+        if inspect.isgenerator(return_value):
+            return self.respond_stream(commanding_form, return_value)
+        if not self.replies(commanding_form):
+            return []
+        form = ReturnForm(return_value).form
+        cache_key = self.result_cache_key(commanding_form)
+        if cache_key is not None:
+            ttl = self.command_context.cacheable_commands[commanding_form.command_name]
+            self.command_context.result_cache.put(cache_key, form, ttl)
+        return [form]
+
+    def respond_stream(self, commanding_form, generator):
+        """
+        This method creates the response forms for a command, which returned a generator. In case the form does not
+        want a reply, the generator is being exhausted right away, as fire and forget commands have to be executed
+        completely all the same.
+        Args:
+            commanding_form: The CommandForm, which was executed
+            generator: The generator returned by the command
+
+        Returns:
+        The generator of Form objects to be sent back
+        """
+        if not self.replies(commanding_form):
+            for item in generator:
+                pass
+            return []
+        return self._stream_forms(commanding_form, generator)
+
+    def _stream_forms(self, commanding_form, generator):
+        """
+        This generator yields a StreamItemForm for every item of the command generator and a StreamEndForm at last.
+        In case the command generator raises an exception, the stream is being ended with the error response.
+        Args:
+            commanding_form: The CommandForm, which was executed
+            generator: The generator returned by the command
+
+        Returns:
+        The generator of Form objects
+        """
+        count = 0
+        try:
+            for item in generator:
+                yield StreamItemForm(item).form
+                count += 1
+                if getattr(commanding_form, "expired", False):
+                    generator.close()
+                    raise TimeoutError("The deadline of the stream has passed after {} items".format(count))
+        except Exception as exception:
+            yield from self.respond_error(commanding_form, exception)
+            return
+        yield StreamEndForm(count).form
+
+    def result_cache_key(self, commanding_form):
+        """
+        This method returns the key for the result cache of the command context, in case the response for the given
+        commanding form can be cached. That is only the case for commands marked as cacheable, whose errors are
+        replied and whose arguments can be json encoded. Commands without reply are never answered from the cache, as
+        the client does not wait for a response.
+        Args:
+            commanding_form: The commanding form received from the client
+
+        Returns:
+        The key for the result cache or None in case the response can not be cached
+        """
+        if not isinstance(commanding_form, CommandForm) or commanding_form.error_mode != "reply":
+            return None
+        if not commanding_form.replies:
+            return None
+        if commanding_form.command_name not in self.command_context.cacheable_commands:
+            return None
+        return CommandCache.key(commanding_form.command_name, commanding_form.pos_args, commanding_form.kw_args)
+
+    def respond_batch(self, commanding_form, results):
+        """
+        This method creates the response forms for the results of a batch. With the error mode 'deferred' the
+        exceptions of failed calls are being collected and replaced by None.
+        Args:
+            commanding_form: The BatchCommandForm, which was executed
+            results: The list with the return value or the exception for every call of the batch
+
+        Returns:
+        The list of Form objects to be sent back
+        """
+        # The results of generator commands are being sent as lists within a batch
+        for index, result in enumerate(results):
+            if inspect.isgenerator(result):
+                try:
+                    results[index] = list(result)
+                except Exception as exception:
+                    results[index] = exception
+        if commanding_form.error_mode == "deferred":
+            for index, result in enumerate(results):
+                if isinstance(result, Exception):
+                    self.defer_error(commanding_form.calls[index][0], result)
+                    results[index] = None
+        if not self.replies(commanding_form):
+            return []
+        return [BatchReturnForm(results).form]
+
+    def respond_error(self, commanding_form, exception):
+        """
+        This method creates the response forms for an exception, that occurred while processing a received form. As
+        the client does not wait for a response of a form with the return mode 'none', the error can not be sent in
+        that case either. With the error mode 'deferred' the error is being collected and the command is answered as
+        if it returned None.
+        Args:
+            commanding_form: The commanding form, which failed. None in case the form could not even be evaluated
+            exception: The exception object
+
+        Returns:
+        The list of Form objects to be sent back
+        """
+        if getattr(commanding_form, "error_mode", "reply") == "deferred":
+            self.defer_error(getattr(commanding_form, "command_name", "batch"), exception)
+            return self.respond(commanding_form, None)
+        if not self.replies(commanding_form):
+            return []
+        return [ErrorForm(exception).form]
+
+    @staticmethod
+    def replies(commanding_form):
+        """
+        This function returns whether a response has to be sent for the given commanding form
+        Args:
+            commanding_form: The commanding form, which was received or None if the received form was invalid
+
+        Returns:
+        The boolean value of whether to send a response
+        """
+        return getattr(commanding_form, "replies", True)
+
+    @staticmethod
+    async def _await_call(result):
+        """
+        Awaits the result of a single batch call in case it is awaitable, returning the exception instead of raising it
+        Args:
+            result: The result of the call, as it was returned by the command context
+
+        Returns:
+        The return value or the exception of the call
+        """
+        if not inspect.isawaitable(result):
+            return result
+        try:
+            return await result
+        except Exception as exception:
+            return exception
+
+    @staticmethod
+    async def _await(awaitable, timeout=None):
+        """
+        Wraps any awaitable object into a coroutine, so it can be passed to asyncio.run
+        Raises:
+            TimeoutError: In case the awaitable did not finish within the timeout
+        Args:
+            awaitable: The awaitable object
+            timeout: The float amount of seconds after which the awaitable is being cancelled, None for no timeout
+
+        Returns:
+        The result of the awaitable
+        """
+        if timeout is None:
+            return await awaitable
+        return await asyncio.wait_for(awaitable, timeout)
+
+    @staticmethod
+    def describe(commanding_form):
+        """
+        This function returns the description of the given command or batch form for the error messages
+        Args:
+            commanding_form: The CommandForm or BatchCommandForm
+
+        Returns:
+        The string description
+        """
+        if isinstance(commanding_form, BatchCommandForm):
+            return "batch of {} calls".format(len(commanding_form.calls))
+        return "command '{}'".format(commanding_form.command_name)
+
+    @staticmethod
+    def _remaining(commanding_form):
+        """
+        This function returns the amount of seconds until the deadline of the given commanding form
+        Args:
+            commanding_form: The commanding form
+
+        Returns:
+        The float amount of seconds, which is never negative, None in case the form has no deadline
+        """
+        deadline = getattr(commanding_form, "deadline", None)
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.time())
+
+
+class Hello:
+    """
+    GENERAL
+    The Hello is the binary message, with which the client and the handler open a connection. The client sends its
+    hello right after connecting and the handler answers with its own hello, which makes the handshake a single round
+    trip of two small fixed size messages.
+
+    LAYOUT
+    The hello is packed with the struct format '!4sBBH16s16s' (40 bytes):
+    - magic: The bytes b"CMDH", which identify the protocol
+    - version: The protocol version, both sides have to speak the same version
+    - flags: Bit 0 is set in the answer of the handler, in case the session has been resumed
+    - features: The bit mask of the supported features. The answer of the handler contains the features supported by
+      both sides, which are the ones, that can be used on the connection
+    - fingerprint: The hash of the command set of the command context, see CommandContext
+    - token: The resumption token, all zero for none
+
+    RESUMPTION
+    The handler registers the session of every connection in the session store of the command context object and
+    answers with a token for it. A client, that reconnects, sends that token with its hello and the handler continues
+    the previous session instead of setting up a new one. The deferred errors, which were collected for the previous
+    connection, are thus not lost by reconnecting. A token can only be used once, the answer contains a new one.
+    """
+    magic = b"CMDH"
+    protocol_version = 1
+    layout = struct.Struct("!4sBBH16s16s")
+    size = layout.size
+    # The bits of the features
+    feature_bits = {
+        "batch": 1,
+        "stream": 2,
+        "deadline": 4,
+        "resume": 8
+    }
+    supported_features = frozenset(feature_bits)
+    # The flag bit of the answer, that signals, that the session has been resumed
+    resumed_flag = 1
+
+    def __init__(self, fingerprint, features=None, token=None, resumed=False, version=protocol_version):
+        self.fingerprint = fingerprint
+        self.features = self.supported_features if features is None else frozenset(features)
+        self.token = token
+        self.resumed = resumed
+        self.version = version
+
+    def encode(self):
+        """
+        This method packs the hello into its binary form
+        Returns:
+        The bytes of the hello
+        """
+        features = 0
+        for feature in self.features:
+            features |= self.feature_bits[feature]
+        flags = self.resumed_flag if self.resumed else 0
+        token = bytes(16) if self.token is None else self.token
+        return self.layout.pack(self.magic, self.version, flags, features, self.fingerprint, token)
+
+    @staticmethod
+    def decode(data):
+        """
+        This function unpacks a hello from its binary form. Unknown feature bits are being ignored, as they belong to
+        a newer version of the other side
+        Raises:
+            ValueError: In case the data is not a hello
+        Args:
+            data: The bytes of the hello
+
+        Returns:
+        The Hello object
+        """
+        if len(data) != Hello.size:
+            raise ValueError("The hello has to be {} bytes long".format(Hello.size))
+        magic, version, flags, feature_mask, fingerprint, token = Hello.layout.unpack(data)
+        if magic != Hello.magic:
+            raise ValueError("The remote side does not speak the commanding protocol")
+        features = [feature for feature, bit in Hello.feature_bits.items() if feature_mask & bit]
+        token = None if token == bytes(16) else token
+        return Hello(fingerprint, features, token, bool(flags & Hello.resumed_flag), version)
+
+    @staticmethod
+    def answer(command_context, hello, processor):
+        """
+        This function creates the answer of the handler to the hello of a client. In case the client sent a valid
+        resumption token, the processor of the previous session is being returned instead of the given one. In case
+        the client is not compatible, the answer is being created all the same, so that the client can tell the
+        reason, but no session is being registered.
+        Args:
+            command_context: The command context object of the handler
+            hello: The Hello received from the client
+            processor: The CommandProcessor of the new connection
+
+        Returns:
+        The tuple (answer, processor) with the Hello to send back and the processor to use for the connection
+        """
+        answer = Hello(command_context.fingerprint, hello.features & Hello.supported_features)
+        if not answer.compatible(hello):
+            return answer, processor
+        if "resume" in answer.features:
+            resumed = None if hello.token is None else command_context.sessions.resume(hello.token)
+            if resumed is not None:
+                processor = resumed
+                answer.resumed = True
+            answer.token = command_context.sessions.register(processor)
+        return answer, processor
+
+    def compatible(self, other):
+        """
+        This method returns whether the other side of the connection is compatible to this side
+        Args:
+            other: The Hello of the other side
+
+        Returns:
+        The boolean value
+        """
+        return self.version == other.version and self.fingerprint == other.fingerprint
+
+    def check(self, other):
+        """
+        This method checks, whether the other side of the connection is compatible to this side
+        Raises:
+            ConnectionAbortedError: In case the protocol versions or the command sets do not match
+        Args:
+            other: The Hello of the other side
+
+        Returns:
+        void
+        """
+        if self.version != other.version:
+            raise ConnectionAbortedError("The protocol versions {} and {} do not match".format(
+                self.version, other.version
+            ))
+        if self.fingerprint != other.fingerprint:
+            raise ConnectionAbortedError("The client and server do not have the same command set")
+
+
+class SessionStore:
+    """
+    The SessionStore keeps the CommandProcessor objects of the connections by their resumption tokens, so that a
+    reconnecting client can continue its session. The store is bounded, once the capacity has been reached the least
+    recently registered session is being dropped. Tokens are random and can only be used once.
+    """
+    def __init__(self, capacity=1024):
+        self.capacity = capacity
+        self.sessions = collections.OrderedDict()
+        self.lock = threading.Lock()
+
+    def register(self, processor):
+        """
+        This method adds the processor of a connection to the store
+        Args:
+            processor: The CommandProcessor of the connection
+
+        Returns:
+        The 16 bytes resumption token
+        """
+        token = secrets.token_bytes(16)
+        with self.lock:
+            self.sessions[token] = processor
+            while len(self.sessions) > self.capacity:
+                self.sessions.popitem(last=False)
+        return token
+
+    def resume(self, token):
+        """
+        This method removes the processor of the session with the given token from the store and returns it
+        Args:
+            token: The resumption token
+
+        Returns:
+        The CommandProcessor, None in case the token is unknown or the session has been dropped
+        """
+        with self.lock:
+            return self.sessions.pop(token, None)
+
+    def __len__(self):
+        return len(self.sessions)
+
+
+class CommandingBase(threading.Thread):
+
+    def __init__(self, connection, command_context, separation="$separation$"):
+        threading.Thread.__init__(self)
+        self.connection = connection
+        self.separation = separation
+        self.command_context = command_context
+        # The features, that can be used on the connection, known after the handshake
+        self.features = frozenset()
+        # The round trip time measured by the last ping in seconds, the time the ping has been sent and the amount of
+        # pings of the remote side, that still have to be answered
+        self.rtt = None
+        self.ping_timestamp = None
+        self.pending_pongs = 0
+
+    def send_request(self):
+        """
+        This method sends a 'request' string over the connection and then waits an indefinite amount of time until a
+        line string has been received. If the received string is the 'ack' string, the methods exists, in case not, an
+        exception is being raised. The pongs for the pings, that the remote side sent in the meantime, are being sent
+        along with the request, a ping crossing the request is answered with the next request or when idle.
+        Raises:
+            ValueError: In case the received string is not the ack string
+        Returns:
+        void
+        """
+        # Sending a request to the other side of the connection
+        self.connection.sendall_string("pong\n" * self.pending_pongs + "request\n")
+        self.pending_pongs = 0
+        # Waiting for the ack
+        line_string = self.wait_line()
+        while line_string in ("ping", "pong"):
+            self.handle_ping_line(line_string, False)
+            line_string = self.wait_line()
+        if line_string != "ack":
+            raise ValueError("The ack was not replied")
+
+    def wait_request(self):
+        """
+        This method waits an indefinite amount of time for a new line to be received over the connection, then checks
+        if the received string is a 'request' string. In case it is, an 'ack' string will be sent back to the client,
+        which signals, that the actual form can now be transmitted.
+        Raises:
+            ValueError: In case the received string was not the request string
+        Returns:
+        void
+        """
+        # Waiting for a line to be received by the connection, pings are being answered in between
+        line_string = self.wait_line()
+        while line_string in ("ping", "pong"):
+            self.handle_ping_line(line_string)
+            line_string = self.wait_line()
+        if line_string != "request":
             raise ValueError("The client has sent wrong request identifier")
         # Sending the ack in response
         self.send_ack()
 
+    def send_ping(self):
+        """
+        This method sends a ping line to the remote side, which answers it with a pong line. A ping may only be sent
+        in between the exchanges, where the remote side could also receive a request.
+        Returns:
+        void
+        """
+        self.ping_timestamp = time.perf_counter()
+        self.connection.sendall_string("ping\n")
+
+    def handle_ping_line(self, line_string, immediate=True):
+        """
+        This method handles a ping or pong line received from the remote side. A ping is being answered with a pong,
+        either right away or, in case a request is currently waiting for its ack, before the next request. A pong
+        completes the round trip of the last ping sent.
+        Args:
+            line_string: The received line, either 'ping' or 'pong'
+            immediate: The boolean value of whether the pong can be sent right away
+
+        Returns:
+        void
+        """
+        if line_string == "ping":
+            if immediate:
+                self.connection.sendall_string("pong\n")
+            else:
+                self.pending_pongs += 1
+        elif self.ping_timestamp is not None:
+            self.rtt = time.perf_counter() - self.ping_timestamp
+            self.ping_timestamp = None
+
     def send_ack(self):
         """
         This method will send the string 'ack' over the connection object followed by a new line character. An ack is
@@ -984,20 +2867,34 @@ class CommandingBase(threading.Thread):
         """
         return self.connection.wait_string_until_character("\n")
 
-    def send_command_context_type(self):
+    def send_hello(self, hello):
         """
-        This method will send the string representation of the command context class, so that on the remote side of the
-        communication it can be compared, if the server and client are on the same page
+        This method sends the binary hello over the connection
+        Args:
+            hello: The Hello object
+
         Returns:
+        void
+        """
+        self.connection.sendall_bytes(hello.encode())
+
+    def receive_hello(self, timeout):
+        """
+        This method receives the binary hello of the remote side
+        Raises:
+            ValueError: In case the received data is not a hello
+        Args:
+            timeout: The float amount of seconds to wait for the hello
 
+        Returns:
+        The Hello object
         """
-        command_context_type_string = str(self.command_context_class) + "\n"
-        self.connection.sendall_string(command_context_type_string)
+        return Hello.decode(self.connection.receive_length_bytes(Hello.size, timeout))
 
     def validate(self):
         """
-        This function shall be used by the handler as well as the client as the method with which they compare the type
-        of command context on which they are based, to validate if a successful communication is possible
+        This function shall be used by the handler as well as the client as the method with which they exchange the
+        hello, to validate if a successful communication is possible
         Returns:
         void
         """
@@ -1015,8 +2912,9 @@ class CommandingBase(threading.Thread):
         """
         transmitter = FormTransmitterThread(self.connection, form, self.separation)
         transmitter.start()
-        while not transmitter.finished:
-            time.sleep(0.001)
+        transmitter.join()
+        # In case the transmission failed, the exception of the Thread is being raised here
+        transmitter.raise_exception()
 
     @property
     def command_context_class(self):
@@ -1046,21 +2944,22 @@ class CommandingBase(threading.Thread):
         """
         if not isinstance(form, Form):
             raise TypeError("Only Form objects can be evaluated to CommandingForm objects")
-        if form.title == "COMMAND":
-            return CommandForm(form)
-        elif form.title == "RETURN":
-            return ReturnForm(form)
-        elif form.title == "ERROR":
-            return ErrorForm(form)
-        else:
-            raise ValueError("The received form '{}' is not a commanding form")
+        # Looking up the wrapper class by the title in the registry of the CommandingForm sub classes
+        commanding_form_class = CommandingForm.form_classes.get(form.title)
+        if commanding_form_class is None:
+            raise ValueError("The received form '{}' is not a commanding form".format(form.title))
+        return commanding_form_class(form)
 
 
 class CommandingHandler(CommandingBase):
 
-    def __init__(self, connection, command_context):
+    def __init__(self, connection, command_context, timeout=10):
         # Initializing the super class
         CommandingBase.__init__(self, connection, command_context)
+        # The amount of seconds to wait for the hello of the client
+        self.timeout = timeout
+        # The processor, which executes the received forms and creates the responses
+        self.processor = CommandProcessor(command_context)
 
         # Setting the running state variable to True
         self.running = True
@@ -1086,22 +2985,17 @@ class CommandingHandler(CommandingBase):
             self.validate()
             while self.running:
                 self.wait_request()
+                received_time = time.perf_counter()
 
                 # Receiving the form
                 receiver = FormReceiverThread(self.connection, self.separation)
                 receiver.start()
                 form = receiver.receive_form()
-                # Creating the commanding form wrapper from the plain form
-                commanding_form = self.evaluate_commanding_form(form)
-                # Executing the commanding form
-                try:
-                    return_value = self.execute_form(commanding_form)
-                    response = ReturnForm(return_value)
-                except Exception as exception:
-                    response = ErrorForm(exception)
-                # Sending the response form over a form transmitter Thread
-                self._send_form(response.form)
-        except ConnectionAbortedError:
+                # Executing the form and sending the response forms over a form transmitter Thread
+                for response in self.processor.process(form, received_time):
+                    self._send_form(response)
+        except (EOFError, OSError):
+            # The connection was closed, either by the client or by stopping the handler
             pass
 
     def execute_form(self, commanding_form):
@@ -1117,19 +3011,42 @@ class CommandingHandler(CommandingBase):
 
     def validate(self):
         """
-        This method checks, if the server and the client have the same command context to work with
+        This method performs the handshake with the client: The hello of the client is being answered with the own
+        hello, which resumes the previous session of the client in case it sent a valid resumption token. The answer
+        is being sent even if the client is not compatible, so it can tell the reason.
+        Raises:
+            ConnectionAbortedError: In case the client does not have the same protocol version and command set
+            TimeoutError: In case the hello of the client did not arrive within the timeout of the handler
         Returns:
         void
         """
-        # Sending the type of command context in which the server is based on to the client
-        self.send_command_context_type()
-        # Receiving the type of command context on which the client is based on from the client
-        line_string = self.connection.receive_line(10)
-        if str(self.command_context_class) != line_string:
-            raise ConnectionAbortedError("The client and server do not have the same command context")
+        # The receptions of a SocketConnection only check the timeout in between the received chunks, which is why a
+        # client, that does not send anything at all, is only noticed by the timeout of the socket itself
+        sock = getattr(self.connection, "sock", None)
+        if sock is not None:
+            sock.settimeout(self.timeout)
+        try:
+            hello = self.receive_hello(self.timeout)
+        finally:
+            if sock is not None:
+                sock.settimeout(None)
+        answer, self.processor = Hello.answer(self.command_context, hello, self.processor)
+        self.send_hello(answer)
+        answer.check(hello)
+        self.features = answer.features
 
     def stop(self):
+        """
+        This method stops the handler, by setting the running flag to False and closing the socket of the connection.
+        The socket is being shut down before closing, as only that wakes up a receive call, that is currently blocking.
+        Returns:
+        void
+        """
         self.running = False
+        try:
+            self.connection.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
         self.connection.sock.close()
 
     def _check_command_context(self):
@@ -1142,109 +3059,1145 @@ class CommandingHandler(CommandingBase):
             raise TypeError("The command context parameter of the Commanding server has to be CommandContext")
 
 
+class CommandBatch:
+    """
+    A CommandBatch is used to build up a list of command calls, which are then executed with a single round trip by
+    the 'execute_batch' method of the CommandingClient. Iterating the batch yields the (command_name, pos_args,
+    kw_args) tuples of the calls in the order they were added.
+    Examples:
+        batch = CommandBatch()
+        batch.add("time")
+        batch.add("print", ["hello"], {"end": ""})
+        results = client.execute_batch(batch)
+    """
+    def __init__(self):
+        self.calls = []
+
+    def add(self, command_name, pos_args=None, kw_args=None):
+        """
+        This method adds a call to the batch
+        Args:
+            command_name: The string name of the command
+            pos_args: The pos args list
+            kw_args: The kw args dict
+
+        Returns:
+        The int index of the call, which is also the index of its result in the result list
+        """
+        self.calls.append((command_name, list(pos_args or []), dict(kw_args or {})))
+        return len(self.calls) - 1
+
+    def __iter__(self):
+        return iter(self.calls)
+
+    def __len__(self):
+        return len(self.calls)
+
+
+class CallQueue:
+    """
+    GENERAL
+    The CallQueue is the scheduling queue for the calls of the CommandingClient. Calls are being taken out by their
+    priority, where a lower value means a higher priority, and in the order they were put in within the same priority.
+    To prevent calls of a low priority from starving, while there are always calls of a higher priority, the queue
+    supports aging: The effective priority of a call is its priority minus the aging factor times the seconds the call
+    has already been waiting.
+
+    FULL POLICIES
+    The queue is bounded by the max size. Putting a call into a full queue either
+    - block: waits until there is space again
+    - drop: discards the call, the put method returns False and the 'dropped' counter is incremented
+    - raise: raises the queue.Full exception
+
+    METRICS
+    The 'metrics' method returns the current depth of the queue, the maximum depth reached, the amount of dropped
+    calls and the time the calls have spent in the queue until they were taken out.
+    """
+    # The possible values for the full policy
+    full_policies = ("block", "drop", "raise")
+
+    def __init__(self, maxsize=10, full_policy="block", aging=0.0):
+        if full_policy not in self.full_policies:
+            raise ValueError("The full policy '{}' is not supported".format(full_policy))
+        self.maxsize = maxsize
+        self.full_policy = full_policy
+        self.aging = aging
+        # A deque for every priority, containing the tuples (enqueue_time, item) in the order they were put in. The
+        # oldest call of every priority is always at the front of its deque
+        self.levels = {}
+        self.depth = 0
+        self.condition = threading.Condition()
+
+        self.max_depth = 0
+        self.dropped = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def put(self, item, priority=1, timeout=None):
+        """
+        This method puts the item with the given priority into the queue. The behaviour in case the queue is full
+        depends on the full policy of the queue.
+        Raises:
+            queue.Full: With the full policy 'raise' in case the queue is full, with the policy 'block' in case the
+                queue is still full after the timeout
+        Args:
+            item: The item to be put into the queue
+            priority: The priority of the item, a lower value meaning a higher priority
+            timeout: The maximum amount of seconds to wait for space with the policy 'block', None to wait forever
+
+        Returns:
+        The boolean value of whether the item has been put into the queue
+        """
+        with self.condition:
+            if self.maxsize > 0 and self.depth >= self.maxsize:
+                if self.full_policy == "drop":
+                    self.dropped += 1
+                    return False
+                if self.full_policy == "raise":
+                    raise queue.Full()
+                if not self.condition.wait_for(lambda: self.depth < self.maxsize, timeout):
+                    raise queue.Full()
+            level = self.levels.setdefault(priority, collections.deque())
+            level.append((time.monotonic(), item))
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+            self.condition.notify_all()
+            return True
+
+    def get(self, block=True, timeout=None):
+        """
+        This method takes the next item out of the queue. The next item is the front item of the priority level
+        with the lowest effective priority, which is the priority reduced by the aging of its waiting time.
+        Raises:
+            queue.Empty: In case the queue is empty and not blocking or still empty after the timeout
+        Args:
+            block: The boolean value of whether to wait for an item in case the queue is empty
+            timeout: The maximum amount of seconds to wait, None to wait forever
+
+        Returns:
+        The tuple (priority, item)
+        """
+        with self.condition:
+            if self.depth == 0:
+                if not block or not self.condition.wait_for(lambda: self.depth != 0, timeout):
+                    raise queue.Empty()
+            now = time.monotonic()
+            priority = min(self.levels, key=lambda p: (p - self.aging * (now - self.levels[p][0][0]), p))
+            level = self.levels[priority]
+            enqueue_time, item = level.popleft()
+            if len(level) == 0:
+                del self.levels[priority]
+            self.depth -= 1
+
+            wait_time = now - enqueue_time
+            self.wait_count += 1
+            self.wait_total += wait_time
+            self.wait_max = max(self.wait_max, wait_time)
+            self.condition.notify_all()
+            return priority, item
+
+    def get_nowait(self):
+        """
+        This method takes the next item out of the queue without waiting
+        Raises:
+            queue.Empty: In case the queue is empty
+        Returns:
+        The tuple (priority, item)
+        """
+        return self.get(block=False)
+
+    def empty(self):
+        return self.depth == 0
+
+    def full(self):
+        return 0 < self.maxsize <= self.depth
+
+    def qsize(self):
+        return self.depth
+
+    def metrics(self):
+        """
+        This method returns the metrics of the queue
+        Returns:
+        The dict with the keys depth, max_depth, dropped, wait_count, wait_mean and wait_max, the wait times in seconds
+        """
+        with self.condition:
+            return {
+                "depth": self.depth,
+                "max_depth": self.max_depth,
+                "dropped": self.dropped,
+                "wait_count": self.wait_count,
+                "wait_mean": self.wait_total / self.wait_count if self.wait_count != 0 else 0.0,
+                "wait_max": self.wait_max
+            }
+
+    def __len__(self):
+        return self.depth
+
+
+class CommandCache:
+    """
+    GENERAL
+    The CommandCache stores the results of cacheable commands, so that repeated calls with the same arguments do not
+    have to be executed again. The CommandingClient uses it to not even send those calls to the handler, the command
+    context uses it to share the response forms between all the handlers serving it.
+    The key of a result is the command name together with the canonical json string of the pos args and kw args, which
+    means the order of the kw args does not matter.
+    The cache is bounded by its max size and optionally by a memory limit, dropping the least recently used results
+    first, and every result expires after the time to live of its command.
+    Notes:
+        The cached objects are returned as they are, a caller modifying a returned list or dict modifies the cached
+        result as well.
+    """
+    def __init__(self, maxsize=256, memory_limit=None, sizeof=None):
+        self.maxsize = maxsize
+        # The max amount of bytes for all the results and the function calculating the amount for a single result
+        self.memory_limit = memory_limit
+        self.sizeof = sizeof if sizeof is not None else lambda value: 0
+        self.memory = 0
+        # The dict with the keys, mapped to the tuples (expiration_time, value, size), in the order of the last usage
+        self.entries = collections.OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """
+        This method returns the cached result for the given key
+        Raises:
+            KeyError: In case there is no valid result for the key
+        Args:
+            key: The key as created by the 'key' method
+
+        Returns:
+        The cached result
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+                self.misses += 1
+                if entry is not None:
+                    self._remove(key)
+                raise KeyError(key)
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value, ttl=None):
+        """
+        This method stores the result for the given key, dropping the least recently used results in case the cache is
+        full. A single result exceeding the memory limit is not being stored at all.
+        Args:
+            key: The key as created by the 'key' method
+            value: The result of the command
+            ttl: The amount of seconds the result stays valid, None for no time limit
+
+        Returns:
+        void
+        """
+        expiration_time = None if ttl is None else time.monotonic() + ttl
+        size = self.sizeof(value)
+        if self.memory_limit is not None and size > self.memory_limit:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (expiration_time, value, size)
+            self.memory += size
+            while len(self.entries) > self.maxsize or self._exceeds_memory_limit():
+                self._remove(next(iter(self.entries)))
+
+    def invalidate(self, command_name=None):
+        """
+        This method removes the cached results of the command with the given name or all the results
+        Args:
+            command_name: The string name of the command, None to clear the whole cache
+
+        Returns:
+        void
+        """
+        with self.lock:
+            if command_name is None:
+                self.entries.clear()
+                self.memory = 0
+                return
+            for key in [key for key in self.entries if key[0] == command_name]:
+                self._remove(key)
+
+    def _remove(self, key):
+        """
+        This method removes the entry for the key, the lock has to be held by the caller
+        Args:
+            key: The key of the entry
+
+        Returns:
+        void
+        """
+        self.memory -= self.entries.pop(key)[2]
+
+    def _exceeds_memory_limit(self):
+        return self.memory_limit is not None and self.memory > self.memory_limit
+
+    @staticmethod
+    def key(command_name, pos_args, kw_args):
+        """
+        This function creates the key for a call
+        Args:
+            command_name: The string name of the command
+            pos_args: The pos args list
+            kw_args: The kw args dict
+
+        Returns:
+        The tuple (command_name, args_string), None in case the arguments can not be json encoded
+        """
+        try:
+            args_string = json.dumps([pos_args, kw_args], sort_keys=True, separators=(",", ":"))
+        except (TypeError, ValueError):
+            return None
+        return command_name, args_string
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class InFlightCall:
+    """
+    An InFlightCall represents a call of the CommandingClient, which has been issued, but whose response has not yet
+    been received. Identical calls issued in the meantime wait for the very same call to finish, instead of being sent
+    to the handler again, and then all receive its result or exception.
+    """
+    def __init__(self):
+        self.event = threading.Event()
+        self.return_value = None
+        self.exception = None
+
+    def finish(self, return_value=None, exception=None):
+        """
+        This method sets the outcome of the call and wakes up all the waiting callers
+        Args:
+            return_value: The return value of the command
+            exception: The exception raised by the command, None if it succeeded
+
+        Returns:
+        void
+        """
+        self.return_value = return_value
+        self.exception = exception
+        self.event.set()
+
+    def wait(self, timeout=None):
+        """
+        This method waits until the call has finished and then returns its return value or raises its exception
+        Raises:
+            TimeoutError: In case the call did not finish within the timeout
+        Args:
+            timeout: The float amount of seconds to wait at most, None to wait until the call has finished
+
+        Returns:
+        The return value of the command
+        """
+        if not self.event.wait(timeout):
+            raise TimeoutError("The call in flight has not finished within the timeout")
+        if self.exception is not None:
+            raise self.exception
+        return self.return_value
+
+
+class CommandStream:
+    """
+    GENERAL
+    The CommandStream is the iterator returned by the 'execute_stream' method of the CommandingClient. It yields the
+    items of a generator command, as they are being received by the client Thread.
+
+    FLOW CONTROL
+    The received items are being buffered in a bounded queue. Once the buffer is full, the client Thread waits with
+    acknowledging the next item, until the consumer took an item out of the buffer, which in turn stops the handler
+    from producing further items. Consumers, that are not interested in the remaining items have to call 'close',
+    so that the client Thread discards them instead of waiting.
+    """
+    def __init__(self, buffer_size=16):
+        self.items = queue.Queue(buffer_size)
+        self.closed = False
+        # The amount of items received so far
+        self.count = 0
+        # The exception, that stopped the client Thread, before the stream was complete
+        self.error = None
+
+    def put(self, item):
+        """
+        This method is called by the client Thread for every received item and waits, while the buffer is full
+        Args:
+            item: The received item
+
+        Returns:
+        void
+        """
+        self.count += 1
+        self._put(("item", item))
+
+    def finish(self, response):
+        """
+        This method is called by the client Thread with the form, that concluded the stream. A ReturnForm is the
+        response of a command, that did not return a generator, its return value is yielded as the only item. An
+        ErrorForm causes the exception to be raised by the iteration.
+        Args:
+            response: The Form concluding the stream
+
+        Returns:
+        void
+        """
+        commanding_form = CommandingBase.evaluate_commanding_form(response)
+        if isinstance(commanding_form, ReturnForm):
+            self.put(commanding_form.return_value)
+        if isinstance(commanding_form, ErrorForm):
+            self._put(("error", commanding_form.exception))
+        else:
+            self._put(("end", None))
+
+    def close(self):
+        """
+        This method stops the stream for the consumer, the remaining items are being discarded by the client Thread
+        Returns:
+        void
+        """
+        self.closed = True
+
+    def abort(self, exception):
+        """
+        This method is called, when the client Thread stopped because of the given exception. The consumer first gets
+        the items, that are still buffered and then the exception is being raised
+        Args:
+            exception: The exception, that stopped the client Thread
+
+        Returns:
+        void
+        """
+        self.error = exception
+
+    def _put(self, entry):
+        while not self.closed:
+            try:
+                self.items.put(entry, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            raise StopIteration
+        while True:
+            try:
+                kind, value = self.items.get(timeout=0.05)
+                break
+            except queue.Empty:
+                if self.error is not None:
+                    self.closed = True
+                    raise ConnectionError("The client stopped during the stream") from self.error
+        if kind == "item":
+            return value
+        self.closed = True
+        if kind == "error":
+            raise value
+        raise StopIteration
+
+
+class ResponseStore:
+    """
+    GENERAL
+    The ResponseStore keeps the responses received by the CommandingClient until they are collected by the callers,
+    identified by their call id. As non blocking callers might never collect their responses, the store is bounded:
+    A response is being dropped, once it is older than the time to live or the capacity of the store is exceeded.
+    The amount of dropped responses is counted by the 'evicted' attribute. The ids of the evicted responses are being
+    remembered (as many as the capacity), so that a caller waiting for an evicted response can be told so, instead of
+    waiting forever.
+
+    EVICTION POLICIES
+    - oldest: To make room for a new response, the oldest response in the store is being dropped
+    - newest: A new response, which does not fit into the store is being dropped itself
+    """
+    # The possible values for the eviction policy
+    eviction_policies = ("oldest", "newest")
+
+    def __init__(self, capacity=1024, ttl=None, eviction_policy="oldest"):
+        if eviction_policy not in self.eviction_policies:
+            raise ValueError("The eviction policy '{}' is not supported".format(eviction_policy))
+        self.capacity = capacity
+        self.ttl = ttl
+        self.eviction_policy = eviction_policy
+        # The amount of responses, which have been dropped without being collected
+        self.evicted = 0
+        # The dicts with the call ids as keys, keeping the insertion order, which is the order of the arrival
+        self.responses = collections.OrderedDict()
+        self.evicted_ids = collections.OrderedDict()
+        # The ids of the calls, whose callers stopped waiting, their responses are being discarded on arrival
+        self.abandoned_ids = set()
+        self.lock = threading.Lock()
+
+    def put(self, call_id, response):
+        """
+        This method adds the response for the given call id to the store, evicting expired responses first and then
+        either the oldest response or the new one itself in case the store is full
+        Args:
+            call_id: The id of the call, the response belongs to
+            response: The response object
+
+        Returns:
+        void
+        """
+        with self.lock:
+            if call_id in self.abandoned_ids:
+                self.abandoned_ids.discard(call_id)
+                return
+            now = time.monotonic()
+            self._evict_expired(now)
+            if len(self.responses) >= self.capacity:
+                if self.eviction_policy == "newest":
+                    self._mark_evicted(call_id)
+                    return
+                self._mark_evicted(self.responses.popitem(last=False)[0])
+            self.responses[call_id] = (now, response)
+
+    def pop(self, call_id):
+        """
+        This method returns the response for the given call id and removes it from the store
+        Raises:
+            KeyError: In case there is no response for the call id
+        Args:
+            call_id: The id of the call
+
+        Returns:
+        The response object
+        """
+        with self.lock:
+            self._evict_expired(time.monotonic())
+            return self.responses.pop(call_id)[1]
+
+    def abandon(self, call_id):
+        """
+        This method tells the store, that nobody is going to collect the response for the given call id anymore. The
+        response is being removed, in case it has already arrived, otherwise it is being discarded once it arrives.
+        Args:
+            call_id: The id of the call
+
+        Returns:
+        void
+        """
+        with self.lock:
+            if self.responses.pop(call_id, None) is None:
+                self.abandoned_ids.add(call_id)
+
+    def is_evicted(self, call_id):
+        """
+        This method returns whether the response for the given call id has been dropped without being collected
+        Args:
+            call_id: The id of the call
+
+        Returns:
+        The boolean value
+        """
+        with self.lock:
+            self._evict_expired(time.monotonic())
+            return call_id in self.evicted_ids
+
+    def _evict_expired(self, now):
+        """
+        This method drops all the responses, which are older than the time to live. As the responses are ordered by
+        their arrival, only the front of the dict has to be checked.
+        Args:
+            now: The current monotonic time
+
+        Returns:
+        void
+        """
+        if self.ttl is None:
+            return
+        while len(self.responses) != 0:
+            call_id, (timestamp, response) = next(iter(self.responses.items()))
+            if now - timestamp < self.ttl:
+                break
+            del self.responses[call_id]
+            self._mark_evicted(call_id)
+
+    def _mark_evicted(self, call_id):
+        """
+        This method counts an evicted response and remembers its call id, forgetting the oldest ids beyond the capacity
+        Args:
+            call_id: The id of the call, whose response has been dropped
+
+        Returns:
+        void
+        """
+        self.evicted += 1
+        self.evicted_ids[call_id] = None
+        while len(self.evicted_ids) > self.capacity:
+            self.evicted_ids.popitem(last=False)
+
+    def __contains__(self, call_id):
+        with self.lock:
+            self._evict_expired(time.monotonic())
+            return call_id in self.responses
+
+    def __len__(self):
+        return len(self.responses)
+
+
 class CommandingClient(CommandingBase):
 
     def __init__(self, connection, command_context, separation="$separation$", timeout=10, polling_interval=None,
-                 queue_size=10):
+                 queue_size=10, response_capacity=1024, response_ttl=None, eviction_policy="oldest",
+                 queue_policy="block", priority_aging=0.0, cache_size=256, coalesced_commands=(), resumption_token=None,
+                 max_polling_interval=None, polling_jitter=0.1):
         CommandingBase.__init__(self, connection, command_context, separation)
         self.timeout = timeout
+        # The token for resuming the session on the handler side. After the handshake it is the token of the current
+        # session, which can be passed to the client of a new connection to continue the session
+        self.resumption_token = resumption_token
+        self.resumed = False
 
         self.last_activity_timestamp = None
+        self.last_poll_timestamp = None
         self.idle_time = 0
+        # The polling interval is the initial one, while the connection stays idle the interval grows up to the max
+        # polling interval. Every interval is randomized by the jitter fraction
         self._polling_interval = polling_interval
+        self._max_polling_interval = max_polling_interval
+        self._polling_jitter = polling_jitter
         interval_generator = self.build_interval_generator()
         polling_function = self.build_polling_function()
         self.poller = GenericPoller(self.connection, interval_generator, polling_function)
 
-        # The attribute to store the size of the queue
-        self.queue_size = queue_size
-        self.response_dict = {}
-        self.call_queue = queue.PriorityQueue(10)
-        self.running = False
+        # The attribute to store the size of the queue
+        self.queue_size = queue_size
+        # The store for the received responses, until they are collected with their call id
+        self.response_store = ResponseStore(response_capacity, response_ttl, eviction_policy)
+        # The cache for the results of the commands marked as cacheable by the command context
+        self.command_cache = CommandCache(cache_size)
+        # The names of the commands, whose identical in flight calls are being coalesced. The calls currently in
+        # flight are stored by the same key as the cached results
+        self.coalesced_commands = set(coalesced_commands)
+        self.in_flight = {}
+        self.in_flight_lock = threading.Lock()
+        # The amount of calls, that have not been sent, because an identical call was already in flight
+        self.coalesced = 0
+        # The CommandStream objects of the calls issued with 'execute_stream', by their call id
+        self.streams = {}
+        # The call ids are simply counted up, which makes them unique for the lifetime of the client
+        self._call_ids = itertools.count(1)
+        self.call_queue = CallQueue(queue_size, queue_policy, priority_aging)
+        # The list of tuples (command_name, exception) of the deferred errors, which the handler attached to responses
+        self.deferred_errors = []
+        # The deferred errors are added by the Thread and taken out by the callers of 'fetch_errors'
+        self.deferred_lock = threading.Lock()
+        # The exception, that stopped the Thread, the callers waiting for a response are failed with it
+        self.error = None
+        self.running = False
+
+    def run(self):
+        self.running = True
+        try:
+            self.validate()
+            self.update_last_activity_time()
+            self.last_poll_timestamp = self.last_activity_timestamp
+            while self.running:
+                # Waiting for the next call, the queue wakes the Thread up as soon as a call has been put in
+                try:
+                    call = self.call_queue.get(timeout=0.01)
+                except queue.Empty:
+                    # Answering the pings, that the handler sent while the client was idle
+                    self.receive_idle()
+                    # Updating the idle time
+                    now = time.time()
+                    self.idle_time = now - self.last_activity_timestamp
+                    # First checking if the object actually has polling enabled and then if the connection has been
+                    # silent for the polling interval. The traffic of the commands proves the liveness just as well,
+                    # thus the interval is measured from the last command or poll, whichever is later. The poll is a
+                    # ping, which only costs a few bytes. It does not count as activity, so that the interval backs off
+                    silent_time = now - max(self.last_activity_timestamp, self.last_poll_timestamp)
+                    if self.is_polling and self.poller.is_interval_match(silent_time, update=True)[0]:
+                        self.poller.poll()
+                        self.last_poll_timestamp = time.time()
+                    continue
+
+                call_id, commanding_form = self.unpack_call(call)
+                # A call without a form is a ping, its response is the round trip time
+                if commanding_form is None:
+                    self.response_store.put(call_id, self.ping_now())
+                    self.update_last_activity_time()
+                    continue
+                # The deadline of the call might have passed, while it was waiting in the queue, it is not sent then
+                if getattr(commanding_form, "expired", False):
+                    self.expire_call(call_id, commanding_form)
+                    continue
+
+                tracer = get_tracer()
+                if tracer.enabled:
+                    attributes = {"command": getattr(commanding_form, "command_name", commanding_form.form.title)}
+                    start = time.perf_counter()
+                # Sending a request
+                self.send_request()
+                if tracer.enabled:
+                    end = time.perf_counter()
+                    tracer.record("send_request", start, end, attributes)
+                    start = end
+
+                # Sending the actual command form
+                self._send_form(commanding_form.form)
+                if tracer.enabled:
+                    end = time.perf_counter()
+                    tracer.record("send_command", start, end, attributes)
+                    start = end
+                # Forms with the return mode 'none' do not get a response, so there is nothing to wait for
+                if commanding_form.replies:
+                    # Receiving the return form and putting it into the list
+                    receiver = FormReceiverThread(self.connection, self.separation)
+                    receiver.start()
+                    response = receiver.receive_form()
+                    if tracer.enabled:
+                        tracer.record("receive_response", start, time.perf_counter(), attributes)
+                    # The items of a stream are passed on to the CommandStream or collected into a list
+                    if call_id in self.streams or response.title == "STREAMITEM":
+                        response = self.receive_stream(call_id, response)
+                        if response is None:
+                            self.update_last_activity_time()
+                            continue
+                    # Collecting the deferred errors, the handler might have attached to the response
+                    deferred_errors = ErrorForm.deferred_errors(response)
+                    if len(deferred_errors) != 0:
+                        with self.deferred_lock:
+                            self.deferred_errors.extend(deferred_errors)
+
+                    # Adding the response to the response store with the call id as the key
+                    self.response_store.put(call_id, response)
+
+                # Updating the last activity
+                self.update_last_activity_time()
+        except Exception as exception:
+            # The connection is out of sync or broken after an error in between an exchange, thus the Thread stops
+            # and the waiting callers are being failed instead of waiting forever
+            self.error = exception
+            self.running = False
+            for stream in list(self.streams.values()):
+                stream.abort(exception)
+
+    def ping(self, timeout=None):
+        """
+        This method sends a ping to the handler and returns the round trip time, once the pong has been received. The
+        ping is being sent by the client Thread in between two calls, so it does not disturb the command traffic.
+        Raises:
+            TimeoutError: In case the pong has not been received within the timeout
+            ConnectionError: In case the client Thread stopped because of an error
+        Args:
+            timeout: The float amount of seconds to wait for the pong, None to wait without limit
+
+        Returns:
+        The float round trip time in seconds, None in case the ping has been dropped by the full call queue
+        """
+        call_id = self._generate_id()
+        # The ping gets the highest priority, as it is supposed to measure the connection and not the queue
+        if not self.call_queue.put((call_id, None), 0):
+            return None
+        deadline = None if timeout is None else time.time() + timeout
+        return self.wait_raw_response(call_id, deadline)
+
+    def ping_now(self):
+        """
+        This method sends a ping and waits for the pong from within the client Thread. A ping, that the handler sent
+        in the meantime, is answered right away.
+        Raises:
+            TimeoutError: In case the pong did not arrive within the timeout of the client
+            ValueError: In case the handler sent something else
+        Returns:
+        The float round trip time in seconds
+        """
+        self.send_ping()
+        line_string = self.connection.receive_line(self.timeout)
+        while line_string != "pong":
+            if line_string != "ping":
+                raise ValueError("The pong was not replied")
+            self.handle_ping_line(line_string)
+            line_string = self.connection.receive_line(self.timeout)
+        self.handle_ping_line(line_string)
+        return self.rtt
+
+    def receive_idle(self):
+        """
+        This method is called by the client Thread, while there are no calls to be sent. It sends the pongs, which
+        are still due, and answers the pings of the handler, which have arrived. As the handler only sends pings, no
+        other data is expected, a closed connection is being detected right away.
+        Raises:
+            EOFError: In case the connection has been closed by the handler
+            ValueError: In case the handler sent something else than a ping
+        Returns:
+        void
+        """
+        if self.pending_pongs != 0:
+            self.connection.sendall_string("pong\n" * self.pending_pongs)
+            self.pending_pongs = 0
+        # A connection, which decrypts the data, may already have buffered the next ping, while the socket itself is
+        # not readable anymore
+        sock = getattr(self.connection, "sock", None)
+        while sock is not None and (self.connection.pending_bytes() or select.select([sock], [], [], 0)[0]):
+            line_string = self.wait_line()
+            if line_string not in ("ping", "pong"):
+                raise ValueError("The handler sent '{}' in between the exchanges".format(line_string))
+            self.handle_ping_line(line_string)
+
+    def expire_call(self, call_id, commanding_form):
+        """
+        This method answers a call, whose deadline has passed before it was sent, with a TimeoutError locally
+        Args:
+            call_id: The id of the call
+            commanding_form: The CommandForm of the call
+
+        Returns:
+        void
+        """
+        if not commanding_form.replies:
+            return
+        exception = TimeoutError("The deadline of the {} has passed before it was sent".format(
+            CommandProcessor.describe(commanding_form)
+        ))
+        response = ErrorForm(exception).form
+        stream = self.streams.pop(call_id, None)
+        if stream is not None:
+            stream.finish(response)
+        else:
+            self.response_store.put(call_id, response)
+
+    def execute_command(self, command_name, pos_args, kw_args, priority=1, blocking=True, return_mode="reply",
+                        error_mode="reply", timeout=None):
+        """
+        This method will send the command as a form over the connection and therefore issue the command on the remote
+        Handler. Depending on whether the method is executed as blocking or not, the method will either exit as void
+        after the command has been issued or wait for the response to be received and then execute the action specified
+        in the response form, thus either raising an error or returning the return value of the command
+        With the return mode 'none' the command is fire and forget: The handler does not send a response and the
+        method returns None right after the command has been queued, no matter the blocking flag. The same goes for
+        a command, which has been dropped by a full call queue with the queue policy 'drop'.
+        The results of blocking calls of commands, which are marked as cacheable by the command context, are being
+        stored in the command cache and repeated calls with the same arguments are served from there.
+        Blocking calls of the commands in 'coalesced_commands' are not sent again, while an identical call (same
+        command and arguments) is still in flight, instead they wait for that call and receive its outcome.
+        With a timeout the command is sent with the according deadline, which means the handler does not execute it
+        anymore once the deadline has passed and a blocking call raises a TimeoutError at the deadline.
+        Raises:
+            TimeoutError: In case the deadline passed before the response has been received
+            ConnectionError: In case the client Thread stopped because of an error
+        Args:
+            command_name: The string name of the command to execute
+            pos_args: The pos args list
+            kw_args: The kw args dict
+            blocking: The boolean value of whether the method should wait for the response to be returned and then
+                execute the the response or exit straight after issuing the command
+            return_mode: The string return mode of the command, either 'reply' or 'none'
+            error_mode: The string error mode of the command, either 'reply' or 'deferred'. Deferred errors are
+                being retrieved with 'fetch_errors'
+            timeout: The float amount of seconds the command may take, None for no deadline
+
+        Returns:
+        -
+        """
+        # Serving cacheable commands from the cache, the key is None for calls, which can not be cached
+        cache_key = None
+        cacheable_commands = self.command_context.cacheable_commands
+        if blocking and return_mode == error_mode == "reply" and command_name in cacheable_commands:
+            cache_key = self.command_cache.key(command_name, pos_args, kw_args)
+            if cache_key is not None:
+                try:
+                    return self.command_cache.get(cache_key)
+                except KeyError:
+                    pass
+
+        deadline = None if timeout is None else time.time() + timeout
+        command_form = CommandForm(command_name, pos_args, kw_args, return_mode, error_mode, deadline)
+        if blocking and return_mode == error_mode == "reply" and command_name in self.coalesced_commands:
+            flight_key = self.command_cache.key(command_name, pos_args, kw_args)
+            if flight_key is not None:
+                return_value = self.execute_coalesced(flight_key, command_form, priority, timeout)
+                if cache_key is not None:
+                    self.command_cache.put(cache_key, return_value, cacheable_commands[command_name])
+                return return_value
+
+        call_id = self.put_form(command_form, priority)
+        if call_id is None or not command_form.replies:
+            return None
+        if blocking:
+            return_value = self.wait_response(call_id, deadline)
+            if cache_key is not None:
+                ttl = self.command_context.cacheable_commands[command_name]
+                self.command_cache.put(cache_key, return_value, ttl)
+            return return_value
+        else:
+            return call_id
+
+    def execute_template(self, template, pos_args, kw_args, priority=1, blocking=True, timeout=None):
+        """
+        This method issues the command compiled into the given CommandTemplate with the given arguments. It behaves
+        like 'execute_command' with the command name and the modes of the template, except that the calls are neither
+        served from the command cache nor coalesced, as the template is meant for the fastest possible issuing of
+        the same command in a loop.
+        Raises:
+            TimeoutError: In case the deadline passed before the response has been received
+            ConnectionError: In case the client Thread stopped because of an error
+        Args:
+            template: The CommandTemplate of the command
+            pos_args: The pos args list
+            kw_args: The kw args dict
+            priority: The priority of the call in the call queue
+            blocking: The boolean value of whether the method should wait for the response
+            timeout: The float amount of seconds the command may take, None for no deadline
+
+        Returns:
+        The return value for a blocking call, the int call id for a non blocking call, None in case the template has
+        the return mode 'none' or the call has been dropped
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        command_form = template.create(pos_args, kw_args, deadline)
+        call_id = self.put_form(command_form, priority)
+        if call_id is None or not template.replies:
+            return None
+        if blocking:
+            return self.wait_response(call_id, deadline)
+        return call_id
+
+    def execute_stream(self, command_name, pos_args, kw_args, priority=1, buffer_size=16, timeout=None):
+        """
+        This method issues a generator command on the remote handler and returns a CommandStream, which yields the
+        items of the generator as they arrive. At most 'buffer_size' items are being received ahead of the consumer.
+        A command, which does not return a generator yields its return value as the only item.
+        Examples:
+            for line in client.execute_stream("read_lines", ["log.txt"], {}):
+                print(line)
+        Raises:
+            queue.Full: In case the call has been dropped by the full call queue
+        Args:
+            command_name: The string name of the command to execute
+            pos_args: The pos args list
+            kw_args: The kw args dict
+            priority: The priority of the call in the call queue
+            buffer_size: The max amount of received items, which have not yet been consumed
+            timeout: The float amount of seconds the whole stream may take, once the deadline passes the handler ends
+                the stream with a TimeoutError. None for no deadline
+
+        Returns:
+        The CommandStream object
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        command_form = CommandForm(command_name, pos_args, kw_args, deadline=deadline)
+        stream = CommandStream(buffer_size)
+        # The stream has to be registered before the call is queued, as the response might arrive at any time
+        call_id = self._generate_id()
+        self.streams[call_id] = stream
+        if self.put_form(command_form, priority, call_id) is None:
+            del self.streams[call_id]
+            raise queue.Full("The call has been dropped by the full call queue")
+        return stream
+
+    def receive_stream(self, call_id, response):
+        """
+        This method receives the remaining forms of a stream, that started with the given response. In case the call
+        was issued by 'execute_stream' the items are passed on to its CommandStream. Otherwise (the generator command
+        was issued with 'execute_command') the items are being collected into a list, which is returned as the
+        response, as if the command had returned the list.
+        Args:
+            call_id: The call id of the stream
+            response: The first Form received for the call
 
-    def run(self):
-        self.running = True
-        try:
-            self.validate()
-            while self.running:
-                # Check the Que not to be empty
-                if self.call_queue.empty():
-                    # Updating the idle time
-                    self.idle_time = time.time() - self.last_activity_timestamp
-                    # First checking if the object actually has polling enabled and then if the poller tells that the
-                    # interval for activity has been exceeded
-                    """
-                    if self.is_polling and self.poller.is_interval_match(self.idle_time, True):
-                        # Sending a request first
-                        self.send_request()
-                        # Polling and then updating the last activity time
-                        self.poller.poll()
-                        self.update_last_activity_time()
-                    """
-                else:
-                    call = self.call_queue.get()
+        Returns:
+        The response Form for the response store, None in case it has been passed on to a CommandStream
+        """
+        stream = self.streams.pop(call_id, None)
+        items = []
+        while response.title == "STREAMITEM":
+            item = StreamItemForm(response).item
+            if stream is None:
+                items.append(item)
+            else:
+                stream.put(item)
+            receiver = FormReceiverThread(self.connection, self.separation)
+            receiver.start()
+            response = receiver.receive_form()
+        if stream is not None:
+            stream.finish(response)
+            return None
+        if response.title == "STREAMEND":
+            return ReturnForm(items).form
+        return response
 
-                    # Sending a request
-                    self.send_request()
+    def execute_coalesced(self, flight_key, command_form, priority, timeout=None):
+        """
+        This method executes the command form, unless an identical call is already in flight, in which case the
+        method waits for that call and returns its return value or raises its exception.
+        Args:
+            flight_key: The key identifying identical calls, as created by CommandCache.key
+            command_form: The CommandForm to send
+            priority: The priority of the call in the call queue
+            timeout: The float amount of seconds to wait for the outcome at most, None to wait until it arrived
 
-                    # Sending the actual command form
-                    call_id, command_name, pos_args, kw_args = self.unpack_call(call)
-                    self._send_command(command_name, pos_args, kw_args)
-                    # Receiving the return form and putting it into the list
-                    receiver = FormReceiverThread(self.connection, self.separation)
-                    receiver.start()
-                    response = receiver.receive_form()
+        Returns:
+        The return value of the command
+        """
+        with self.in_flight_lock:
+            in_flight_call = self.in_flight.get(flight_key)
+            leading = in_flight_call is None
+            if leading:
+                in_flight_call = InFlightCall()
+                self.in_flight[flight_key] = in_flight_call
+            else:
+                self.coalesced += 1
+        if not leading:
+            return in_flight_call.wait(timeout)
+
+        return_value = None
+        exception = None
+        try:
+            call_id = self.put_form(command_form, priority)
+            if call_id is None:
+                raise queue.Full("The call has been dropped by the full call queue")
+            return_value = self.wait_response(call_id, command_form.deadline)
+            return return_value
+        except Exception as error:
+            exception = error
+            raise
+        finally:
+            # Removing the call before waking the waiting callers, so that calls issued from now on are sent again
+            with self.in_flight_lock:
+                del self.in_flight[flight_key]
+            in_flight_call.finish(return_value, exception)
+
+    def coalesce(self, command_name, enabled=True):
+        """
+        This method enables or disables the coalescing of identical in flight calls for the given command
+        Args:
+            command_name: The string name of the command
+            enabled: The boolean value of whether the calls are to be coalesced
 
-                    # Adding the response to the response dict with the call id as the key
-                    self.response_dict[call_id] = response
+        Returns:
+        void
+        """
+        if enabled:
+            self.coalesced_commands.add(command_name)
+        else:
+            self.coalesced_commands.discard(command_name)
 
-                    # Updating the last activity
-                    self.update_last_activity_time()
-        except:
-            pass
+    def invalidate_cache(self, command_name=None):
+        """
+        This method removes the cached results of the command with the given name or of all the commands
+        Args:
+            command_name: The string name of the command, None to clear the whole cache
 
-    def execute_command(self, command_name, pos_args, kw_args, priority=1, blocking=True):
+        Returns:
+        void
         """
-        This method will send the command as a form over the connection and therefore issue the command on the remote
-        Handler. Depending on whether the method is executed as blocking or not, the method will either exit as void
-        after the command has been issued or wait for the response to be received and then execute the action specified
-        in the response form, thus either raising an error or returning the return value of the command
+        self.command_cache.invalidate(command_name)
+
+    def execute_batch(self, calls, priority=1, blocking=True, return_mode="reply", error_mode="reply", timeout=None):
+        """
+        This method sends all the given calls within a single BatchCommandForm, so that they are executed by the remote
+        handler with only one round trip. The result is the list of the results of all the calls in the same order,
+        where a call, that failed is represented by the exception it raised (instead of the exception being raised).
+        With a timeout the batch is sent with the according deadline, the same way as with 'execute_command'.
+        Raises:
+            TimeoutError: In case the deadline passed before the results have been received
         Args:
-            command_name: The string name of the command to execute
-            pos_args: The pos args list
-            kw_args: The kw args dict
-            blocking: The boolean value of whether the method should wait for the response to be returned and then
-                execute the the response or exit straight after issuing the command
+            calls: A CommandBatch or a list of (command_name, pos_args, kw_args) tuples
+            priority: The priority of the batch in the call queue
+            blocking: The boolean value of whether the method should wait for the results or return the call id
+            return_mode: The string return mode of the batch, either 'reply' or 'none'
+            error_mode: The string error mode of the batch, with 'deferred' a failed call results in None and its
+                error is being retrieved with 'fetch_errors'
+            timeout: The float amount of seconds the whole batch may take, None for no deadline
 
         Returns:
-        -
+        The list of results in case of blocking, the call id otherwise
         """
-        call_id = self.put_call(command_name, pos_args, kw_args, priority)
+        deadline = None if timeout is None else time.time() + timeout
+        batch_form = BatchCommandForm(list(calls), return_mode=return_mode, error_mode=error_mode, deadline=deadline)
+        call_id = self.put_form(batch_form, priority)
+        if call_id is None or not batch_form.replies:
+            return None
         if blocking:
-            while not self.has_response(call_id):
-                time.sleep(0.001)
-            # Getting the Commanding form, that was sent as a response for the command from the buffer and then
-            # executing it via the command context object
-            response = self.get_response(call_id)
-            return self.command_context.execute_form(response)
+            return self.wait_response(call_id, deadline)
         else:
             return call_id
 
+    def fetch_errors(self):
+        """
+        This method returns all the deferred errors of the commands issued by this client. Those are the errors the
+        handler has already attached to previous responses and the errors the handler still holds, which are being
+        requested with the reserved 'fetch_errors' command.
+        Returns:
+        The list of tuples (command_name, exception) in the order the errors occurred
+        """
+        deferred_list = self.execute_command(CommandProcessor.fetch_errors_command, [], {})
+        with self.deferred_lock:
+            errors, self.deferred_errors = self.deferred_errors, []
+        return errors + ErrorForm._procure_deferred_errors(deferred_list)
+
+    def wait_response(self, call_id, deadline=None):
+        """
+        This method waits until the response for the given call id has been received and then executes the response
+        with the command context, thus either raising the error or returning the return value of the command.
+        Raises:
+            LookupError: In case the response has been evicted from the response store before it was collected
+            TimeoutError: In case the deadline passed before the response has been received
+            ConnectionError: In case the client Thread stopped because of an error
+        Args:
+            call_id: The id of the call, whose response to wait for
+            deadline: The absolute time (seconds since the epoch) until which to wait, None to wait without limit
+
+        Returns:
+        The return value of the command
+        """
+        # Getting the Commanding form, that was sent as a response for the command from the buffer and then
+        # executing it via the command context object
+        response = self.wait_raw_response(call_id, deadline)
+        return self.command_context.execute_form(response)
+
+    def wait_raw_response(self, call_id, deadline=None):
+        """
+        This method waits until the response for the given call id has been received and returns it as it is, see
+        'wait_response' for the exceptions
+        Args:
+            call_id: The id of the call, whose response to wait for
+            deadline: The absolute time (seconds since the epoch) until which to wait, None to wait without limit
+
+        Returns:
+        The response object from the response store
+        """
+        while not self.has_response(call_id):
+            if self.response_store.is_evicted(call_id):
+                raise LookupError("The response for the call {} has been evicted".format(call_id))
+            if self.error is not None:
+                raise ConnectionError("The client stopped because of an error") from self.error
+            if deadline is not None and time.time() >= deadline:
+                # The response might still arrive, it is being discarded then
+                self.response_store.abandon(call_id)
+                raise TimeoutError("The response for the call {} has not been received in time".format(call_id))
+            time.sleep(0.001)
+        return self.get_response(call_id)
+
     def validate(self):
         """
-        This method checks if the handler and the client have the same command context to work with. If that is not
-        the case an error will be raised, because the handler and client are incompatible.
+        This method performs the handshake with the handler: The client sends its hello, with the resumption token of
+        a previous session if there is one, and receives the answer of the handler, which contains the features
+        usable on the connection and the token for resuming this session later on.
         Raises:
-            ConnectionAbortedError: In case the handler and the client are based on different command contexts
+            ConnectionAbortedError: In case the handler does not have the same protocol version and command set
         Returns:
         void
         """
-        # Receiving the command context type string from the handler
-        line_string = self.connection.receive_line(10)
-        # Sending the own command context type over the connection
-        self.send_command_context_type()
-        if not line_string == str(self.command_context_class):
-            raise ConnectionAbortedError("The client and server do not have the same command context")
+        hello = Hello(self.command_context.fingerprint, token=self.resumption_token)
+        self.send_hello(hello)
+        answer = self.receive_hello(self.timeout)
+        hello.check(answer)
+        self.features = answer.features
+        self.resumed = answer.resumed
+        self.resumption_token = answer.token
 
     def get_response(self, call_id):
         """
@@ -1260,45 +4213,40 @@ class CommandingClient(CommandingBase):
         Returns:
         The response is a CommandingForm, usually of the type ReturnForm or ErrorForm
         """
-        # Getting the response and then deleting it from the dict
-        response = self.response_dict[call_id]
-        del self.response_dict[call_id]
-
-        return response
+        # Getting the response and at the same time deleting it from the store
+        return self.response_store.pop(call_id)
 
     def has_response(self, call_id):
         """
         If given the call id of a issued command to the client, this function will return whether or not the response
-        to that command call has already been received and therefore added to the response dict
+        to that command call has already been received and therefore added to the response store
         Args:
             call_id: The int id for the call for which to check if the response has already arrived
 
         Returns:
         The bool value of whether or not the response to the call correlating to the call id has already been received
         """
-        return call_id in self.response_dict.keys()
+        return call_id in self.response_store
 
     def unpack_call(self, call_tuple):
         """
         This method will take a call tuple, as it gets popped from the call queue, as the parameter and it will return
-        a tuple of the 4 values: call_id,  command_name, pos_args, kw_args
+        a tuple of the 2 values: call_id, commanding_form
         Args:
             call_tuple: The tuple in the way it was popped from the call queue
 
         Returns:
-        The tuple (call_id,  command_name, pos_args, kw_args) according to the call tuple passed to the method
+        The tuple (call_id, commanding_form) according to the call tuple passed to the method
         """
         call_id = call_tuple[1][0]
-        command_name = call_tuple[1][1]
-        pos_args = call_tuple[1][2]
-        kw_args = call_tuple[1][3]
-        return call_id, command_name, pos_args, kw_args
+        commanding_form = call_tuple[1][1]
+        return call_id, commanding_form
 
     def put_call(self, command_name, pos_args, kw_args, priority):
         """
         This method will put a request tuple into the request queue of the object, which consists of the command
         specification passed to this method as parameters.
-        Therefore a call id is created, which will be used to add the response to the response dict once the
+        Therefore a call id is created, which will be used to add the response to the response store once the
         response has been received.
         Args:
             command_name: The name of the command to execute
@@ -1307,14 +4255,32 @@ class CommandingClient(CommandingBase):
             priority: The priority of that command execution
 
         Returns:
-        The int call id, which will later be the id for the response object in the dict
+        The int call id, which will later be the id for the response object in the response store
+        """
+        command_form = CommandForm(command_name, pos_args, kw_args)
+        return self.put_form(command_form, priority)
+
+    def put_form(self, commanding_form, priority, call_id=None):
+        """
+        This method puts the given commanding form into the call queue, from where it is being sent by the Thread.
+        In case the queue is full, the behaviour depends on the queue policy of the client, see CallQueue.
+        Raises:
+            queue.Full: In case the queue is full and the queue policy is 'raise'
+        Args:
+            commanding_form: The CommandForm or BatchCommandForm to be sent
+            priority: The priority of the call
+            call_id: The id for the call, a new one is being generated by default
+
+        Returns:
+        The int call id, which will later be the id for the response object in the response store. None in case the
+        call has been dropped, because the queue was full
         """
         # Getting a id for the request
-        call_id = self._generate_id(command_name)
-        # Generating the request tuple
-        call = (priority, (call_id, command_name, pos_args, kw_args))
-        # Putting the request into the priority queue
-        self.call_queue.put(call)
+        if call_id is None:
+            call_id = self._generate_id()
+        # Putting the request into the call queue, which might drop it
+        if not self.call_queue.put((call_id, commanding_form), priority):
+            return None
 
         # Returning the request id, so that the response can be easily fetched from the dictionary
         return call_id
@@ -1327,35 +4293,38 @@ class CommandingClient(CommandingBase):
         Returns:
         The boolean property of whether or not polling is enabled
         """
-        return self._polling_interval is None
+        return self._polling_interval is not None
 
     def build_interval_generator(self):
         """
-        This function builds a new function internally, which has no parameters and acts as a generator, that
-        always yields the same value, which is the one specified by the polling interval attribute.
+        This function builds the generator function for the polling intervals. The interval starts with the polling
+        interval and backs off exponentially up to the max polling interval, as long as there are no commands.
+        Every command resets the interval. The intervals are randomized by the polling jitter and never shorter than
+        50 times the measured round trip time.
         Notes:
-            The function will, as a generator, always yield the value with which it was set up. Changing the polling
-            interval attribute will not change the generator function.
+            The generator is being set up with the values of the attributes at the time of the call. Changing the
+            polling interval attribute will not change the generator function.
         Returns:
         the function object, which is the generator for the interval value
         """
-        polling_interval = self._polling_interval
-        # Creates an internal function, that always yields the same value, which is the one in the interval attribute
-
-        def gen():
-            yield polling_interval
-
-        return gen
+        if not self.is_polling:
+            return lambda: itertools.repeat(None)
+        return adaptive_interval_generator(
+            self._polling_interval,
+            self._max_polling_interval,
+            jitter=self._polling_jitter,
+            idle_function=lambda: time.time() - self.last_activity_timestamp,
+            rtt_function=lambda: self.rtt
+        )
 
     def build_polling_function(self):
         """
-        This function creates a new function object, by using the already implemented poll procedure of the static
-        method '_poll_function' wrapped in a lambda expression, that hides the excess parameters which are based on
-        the attributes of the individual CommandClient instance
+        This function creates the polling function for the GenericPoller, which pings the handler. It is being called
+        by the client Thread, in between the exchanges.
         Returns:
-        The function object to be used as the polling function for the GenericPoller object, bing used for the polling##
+        The function object to be used as the polling function for the GenericPoller object
         """
-        return lambda conn: self._polling_function(conn, self.separation, self.timeout)
+        return lambda connection: self.ping_now()
 
     def update_last_activity_time(self):
         """
@@ -1401,30 +4370,6 @@ class CommandingClient(CommandingBase):
         """
         return random.randint(a, b)
 
-    @staticmethod
-    def _polling_function(connection, separation, timeout):
-        """
-        This method provides the basic function object for the polling function for the GenericPoller to perform the
-        polling operation. The function sends a CommandForm to the remote participant calling the time dummy function
-        to fetch the local time and send it back as a response.
-        Although this function has 3 parameters, where as the polling function is expected to implement the connection
-        parameter as the only one. This means this method has to be wrapped by a lambda function to preset the
-        attributes of the calling CommandClient as fix parameters.
-        Args:
-            connection: The connection object to perform the poll on
-            separation: The separation used by the CommandingClient
-            timeout: The timout specified by the CommandingClient
-
-        Returns:
-        void
-        """
-        form = CommandForm("time")
-        transmitter = FormTransmitterThread(connection, form, separation=separation, timeout=timeout)
-        transmitter.start()
-        receiver = FormReceiverThread(connection, separation=separation, timeout=timeout)
-        receiver.start()
-        receiver.receive_form()
-
     def _send_command(self, command_name, pos_args, kw_args):
         """
         This method will actually create a CommandForm with the given specification of the command name, positional
@@ -1441,20 +4386,579 @@ class CommandingClient(CommandingBase):
         command_form = CommandForm(command_name, pos_args, kw_args)
         self._send_form(command_form.form)
 
-    @staticmethod
-    def _generate_id(command_name):
+    def _generate_id(self):
+        """
+        This method returns the next call id. The ids are counted up for every call, so that two calls of the same
+        client never share an id, which could cause a caller to receive the response of another call.
+        Notes:
+            Advancing the itertools counter is atomic, so the method can be called from multiple Threads.
+        Returns:
+        The int call id
+        """
+        return next(self._call_ids)
+
+
+class CommandingSession:
+    """
+    GENERAL
+    A CommandingSession holds the state of a single client connection, which is being served by the CommandingServer.
+    As the server does not dedicate a Thread to every connection, the state of the protocol cannot be kept implicitly
+    in the call stack of a Thread (like it is done by the CommandingHandler), but has to be stored explicitly. The
+    session is fed with the bytes as they arrive and reacts by queueing the bytes to be sent in the 'outgoing' buffer.
+
+    STATES
+    - validate: Waiting for the hello of the client, which is answered with the hello of the server
+    - request: Waiting for the client to send the 'request' line, which is answered with the 'ack' line. In this state
+      the ping and pong lines are being handled as well
+    - form: Receiving the CommandForm, every part of the form being answered with an ACK
+    - execute: The form is being executed, the data received in the meantime is only being buffered
+    - respond: Transmitting the response forms, each chunk of a form has to be answered by an ACK of the client
+    """
+    def __init__(self, server, sock):
+        self.server = server
+        self.sock = sock
+        # The data received, but not yet processed and the data to be sent
+        self.buffer = bytearray()
+        self.outgoing = bytearray()
+        self.state = "validate"
+        # Every session has its own processor, as the processor keeps the deferred errors of the connection
+        self.processor = CommandProcessor(server.command_context)
+        # The features, that can be used on the connection, known after the handshake
+        self.features = frozenset()
+        # The monotonic time, at which the connection has been accepted, at which data has been received last, the
+        # time the unanswered ping has been sent and the round trip time measured by the last ping
+        self.accepted_time = time.monotonic()
+        self.last_activity = self.accepted_time
+        self.ping_timestamp = None
+        self.rtt = None
+        # The parser for the form currently being received
+        self.parser = None
+        # The chunks of the form currently being transmitted and the forms to be transmitted after that one
+        self.chunks = []
+        self.responses = iter([])
+        self.closed = False
+
+    def start(self):
+        """
+        This method starts the protocol for the session. As the client opens the handshake, there is nothing to be
+        sent before the hello of the client has been received.
+        Returns:
+        void
+        """
+        self.state = "validate"
+
+    def receive(self, data):
+        """
+        This method is called with the data, that was received from the client and processes as much of the buffered
+        data as possible according to the current state of the session.
+        Raises:
+            ConnectionAbortedError: In case the client does not have the same protocol version and command set
+            ValueError: In case the client violates the protocol
+        Args:
+            data: The bytes received from the socket
+
+        Returns:
+        void
+        """
+        self.buffer += data
+        if len(data) != 0:
+            self.last_activity = time.monotonic()
+        progress = True
+        while progress and not self.closed:
+            progress = self.advance()
+
+    def advance(self):
+        """
+        This method performs a single step of the protocol, if the buffered data allows it.
+        Returns:
+        The boolean value of whether a step could be performed
+        """
+        if self.state == "validate":
+            if len(self.buffer) < Hello.size:
+                return False
+            hello = Hello.decode(bytes(self.buffer[:Hello.size]))
+            del self.buffer[:Hello.size]
+            answer, self.processor = Hello.answer(self.server.command_context, hello, self.processor)
+            self.send(answer.encode())
+            answer.check(hello)
+            self.features = answer.features
+            self.state = "request"
+            return True
+
+        elif self.state == "request":
+            line = self.next_line()
+            if line is None:
+                return False
+            if line == "ping":
+                self.send(b"pong\n")
+                return True
+            if line == "pong":
+                if self.ping_timestamp is not None:
+                    self.rtt = time.monotonic() - self.ping_timestamp
+                    self.ping_timestamp = None
+                return True
+            if line != "request":
+                raise ValueError("The client has sent wrong request identifier")
+            self.send(b"ack\n")
+            self.parser = FormParser(self.server.separation)
+            self.state = "form"
+            return True
+
+        elif self.state == "form":
+            if len(self.buffer) == 0:
+                return False
+            # Handing all the buffered data to the parser, which keeps the data it could not process yet in its own
+            # buffer. Only after the form is finished, the data exceeding it is taken back
+            acks = self.parser.feed(bytes(self.buffer))
+            self.buffer.clear()
+            self.send(b"ack" * acks)
+            if self.parser.finished:
+                self.buffer = self.parser.buffer
+                self.state = "execute"
+                self.server.execute(self, self.parser.form)
+                self.parser = None
+                return True
+            return False
+
+        elif self.state == "respond":
+            if len(self.buffer) < 3:
+                return False
+            if bytes(self.buffer[:3]) != b"ack":
+                raise ValueError("Incorrect ACK sent")
+            del self.buffer[:3]
+            self.transmit()
+            return True
+
+        return False
+
+    def ping(self):
+        """
+        This method sends a ping to the client, in case the session is in between two exchanges and there is no ping
+        waiting for its pong already
+        Returns:
+        The boolean value of whether the ping has been sent
+        """
+        if self.state != "request" or len(self.buffer) != 0 or self.ping_timestamp is not None:
+            return False
+        self.ping_timestamp = time.monotonic()
+        self.send(b"ping\n")
+        return True
+
+    def is_unresponsive(self, timeout):
+        """
+        This method returns whether the client did not send anything for the given amount of seconds after the last
+        ping has been sent. Any data counts as a sign of life, as a ping crossing a request is only being answered
+        after the exchange.
+        Args:
+            timeout: The float amount of seconds
+
+        Returns:
+        The boolean value
+        """
+        if self.ping_timestamp is None or self.last_activity > self.ping_timestamp:
+            return False
+        return time.monotonic() - self.ping_timestamp > timeout
+
+    def respond(self, forms):
+        """
+        This method is being called with the response forms, once the execution of the received form has finished.
+        The transmission of the forms is being started and in case there are no forms to be sent, the session directly
+        goes back to waiting for the next request.
+        Args:
+            forms: The list of Form objects to be sent to the client or a generator of the forms of a stream, which
+                is being advanced within the server Thread, whenever the previous form has been transmitted
+
+        Returns:
+        void
+        """
+        self.responses = iter(forms)
+        self.state = "respond"
+        self.transmit()
+        # Data, that was received during the execution might be processable now
+        self.receive(b"")
+
+    def transmit(self):
+        """
+        This method sends the next chunk of the response, which is being called every time an ACK has been received.
+        After the last chunk of the last form has been acknowledged, the session goes back to the 'request' state.
+        Returns:
+        void
+        """
+        if len(self.chunks) == 0:
+            form = next(self.responses, None)
+            if form is not None:
+                self.chunks = FormSerializer(form, self.server.separation).chunks()
+        if len(self.chunks) == 0:
+            self.state = "request"
+        else:
+            self.send(self.chunks.pop(0))
+
+    def next_line(self):
+        """
+        This method removes the next line from the buffer and returns it as a string without the newline character
+        Returns:
+        The string line or None in case there is no complete line in the buffer yet
+        """
+        index = self.buffer.find(b"\n")
+        if index == -1:
+            return None
+        line = bytes(self.buffer[:index]).decode()
+        del self.buffer[:index + 1]
+        return line
+
+    def send(self, data):
+        """
+        This method queues the given data to be sent to the client and attempts to send it right away. Whatever could
+        not be sent without blocking stays in the outgoing buffer, which the server sends, once the socket is writable
+        Args:
+            data: The bytes to be sent
+
+        Returns:
+        void
+        """
+        if len(data) == 0:
+            return
+        self.outgoing += data
+        self.flush()
+
+    def flush(self):
+        """
+        This method sends as much of the outgoing buffer as possible without blocking and notifies the server about
+        whether there is still data left to be sent.
+        Returns:
+        void
+        """
+        try:
+            sent = self.sock.send(self.outgoing)
+            del self.outgoing[:sent]
+        except (BlockingIOError, InterruptedError, ssl.SSLWantReadError, ssl.SSLWantWriteError):
+            pass
+        self.server.update_interest(self)
+
+
+class CommandingServer(threading.Thread):
+    """
+    GENERAL
+    The CommandingServer is the counterpart to a whole set of CommandingClients. Other than the CommandingHandler,
+    which is a Thread dedicated to a single connection, being blocked in the receive calls most of the time, the
+    server listens on a socket and serves all the accepted connections from a single Thread, by multiplexing them
+    with the selectors module (which means epoll on linux). This way a big number of mostly idle clients does not
+    result in the same number of Threads.
+    The forms are being parsed incrementally as the bytes arrive and once a form has been received completely, it is
+    being executed by the command context and the response is being sent back, using the same protocol as the
+    CommandingHandler, so that the regular CommandingClient can be used to connect to the server.
+
+    EXECUTION
+    By default the commands are being executed directly within the server Thread, which is the fastest way for short
+    commands, but also means, that a long running command blocks all the other connections. For that case an
+    executor from the concurrent.futures module can be passed, on which the commands are being executed instead.
+    The items of generator commands are always being produced within the server Thread, one at a time, whenever the
+    client acknowledged the previous one.
+
+    LIVENESS
+    With a ping interval the server sends a ping to every connection, that has been idle for that long, and closes
+    the connections, which did not send anything within the ping timeout after the ping. The clients answer the
+    pings in between their exchanges, which means the ping timeout has to be longer than the longest command.
+    Independent of the pings, a connection, whose client did not complete the handshake within the timeout after it
+    has been accepted, is being closed.
+
+    TLS
+    With a server side SSLContext the accepted connections are being encrypted with TLS, so that TLSSocketConnections
+    can connect to the server. The handshake is performed implicitly by the first reads and writes on the non
+    blocking socket, while they report, that they have to wait for the socket. As all the connections share the
+    context, the clients can resume their sessions, when they reconnect. The data, that has already been decrypted
+    but not yet been read from the SSL object, is being read right away, as the socket does not become readable for
+    it.
+
+    Notes:
+        The server does not use the Connection abstraction, as those are blocking by design, but works on the non
+        blocking sockets directly.
+    """
+    def __init__(self, address, command_context, separation="$separation$", backlog=128, executor=None,
+                 select_timeout=0.1, ping_interval=None, ping_timeout=10, ssl_context=None, timeout=10):
+        threading.Thread.__init__(self)
+        self.command_context = command_context
+        self.ssl_context = ssl_context
+        self.separation = separation
+        self.executor = executor
+        self.select_timeout = select_timeout
+        self.ping_interval = ping_interval
+        self.ping_timeout = ping_timeout
+        self._next_ping_check = time.monotonic()
+        # The amount of seconds a client has for the handshake after the connection has been accepted
+        self.timeout = timeout
+        self._next_handshake_check = time.monotonic()
+
+        # Creating the listening socket, a string address is being interpreted as the path of a unix socket
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind(address)
+        self.sock.listen(backlog)
+        self.sock.setblocking(False)
+        self.address = self.sock.getsockname()
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.sock, selectors.EVENT_READ, "listen")
+        # The socket pair used to wake up the selector, when an execution in the executor has finished
+        self._wakeup_receiver, self._wakeup_sender = socket.socketpair()
+        self._wakeup_receiver.setblocking(False)
+        self.selector.register(self._wakeup_receiver, selectors.EVENT_READ, "wakeup")
+        self._completed = queue.SimpleQueue()
+
+        self.sessions = {}
+        self.running = False
+
+    def run(self):
+        """
+        The main loop of the server, which waits for events of all the sockets and dispatches them: The listening
+        socket accepts new connections, the wakeup socket signals finished executions and all other sockets belong
+        to a session, which is fed with the received data or whose pending data is being sent.
+        Returns:
+        void
+        """
+        self.running = True
+        try:
+            while self.running:
+                events = self.selector.select(self.select_timeout)
+                for key, mask in events:
+                    if key.data == "listen":
+                        self.accept()
+                    elif key.data == "wakeup":
+                        self.complete()
+                    else:
+                        self.handle(key.data, mask)
+                if self.ping_interval is not None and time.monotonic() >= self._next_ping_check:
+                    self.check_liveness()
+                if self.timeout is not None and time.monotonic() >= self._next_handshake_check:
+                    self.check_handshakes()
+        finally:
+            self.close()
+
+    def check_handshakes(self):
+        """
+        This method closes the sessions, whose clients did not complete the handshake within the timeout after the
+        connection has been accepted. As the sessions are only checked every fraction of the timeout, a session might
+        be closed a little later than that.
+        Returns:
+        void
+        """
+        now = time.monotonic()
+        self._next_handshake_check = now + self.timeout / 4
+        for session in list(self.sessions.values()):
+            if session.state == "validate" and now - session.accepted_time > self.timeout:
+                self.close_session(session)
+
+    def check_liveness(self):
+        """
+        This method pings the sessions, which have been idle for the ping interval and closes the sessions, that did
+        not answer their ping within the ping timeout. As the sessions are only checked every fraction of the
+        interval, a ping might be sent a little later than the interval.
+        Returns:
+        void
+        """
+        now = time.monotonic()
+        self._next_ping_check = now + min(self.ping_interval, self.ping_timeout) / 4
+        for session in list(self.sessions.values()):
+            if session.is_unresponsive(self.ping_timeout):
+                self.close_session(session)
+            elif now - session.last_activity >= self.ping_interval:
+                self._guard(session, session.ping)
+
+    def accept(self):
+        """
+        This method accepts all the pending connections on the listening socket and creates a session for each one
+        Returns:
+        void
+        """
+        while True:
+            try:
+                sock, address = self.sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            if sock.family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if self.ssl_context is not None:
+                sock = self.ssl_context.wrap_socket(sock, server_side=True, do_handshake_on_connect=False)
+            session = CommandingSession(self, sock)
+            self.sessions[sock.fileno()] = session
+            self.selector.register(sock, selectors.EVENT_READ, session)
+            self._guard(session, session.start)
+
+    def handle(self, session, mask):
+        """
+        This method handles the events of the socket of a session. Pending data is being sent if the socket is
+        writable and received data is being fed into the session.
+        Args:
+            session: The CommandingSession whose socket has an event
+            mask: The event mask of the selector
+
+        Returns:
+        void
+        """
+        if mask & selectors.EVENT_WRITE:
+            self._guard(session, session.flush)
+        if mask & selectors.EVENT_READ and not session.closed:
+            try:
+                data = session.sock.recv(65536)
+                # The SSL object may hold decrypted data beyond the requested size
+                pending = getattr(session.sock, "pending", None)
+                while data and pending is not None and pending():
+                    data += session.sock.recv(65536)
+            except (BlockingIOError, InterruptedError, ssl.SSLWantReadError, ssl.SSLWantWriteError):
+                return
+            except OSError:
+                data = b""
+            if not data:
+                self.close_session(session)
+                return
+            self._guard(session, session.receive, data)
+
+    def execute(self, session, form):
+        """
+        This method executes a received form for the given session. Without an executor the form is processed
+        directly, otherwise the processing is submitted to the executor and the response is being handed back to the
+        server Thread through the wakeup socket.
+        Args:
+            session: The CommandingSession, which received the form
+            form: The received Form object
+
+        Returns:
+        void
+        """
+        if self.executor is None:
+            session.respond(session.processor.process(form, time.perf_counter()))
+        else:
+            future = self.executor.submit(session.processor.process, form, time.perf_counter())
+            future.add_done_callback(lambda f: self._notify(session, f))
+
+    def complete(self):
+        """
+        This method is called in the server Thread when the wakeup socket is readable and passes the responses of all
+        the finished executions to their sessions.
+        Returns:
+        void
+        """
+        try:
+            while self._wakeup_receiver.recv(4096):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        while not self._completed.empty():
+            session, future = self._completed.get()
+            if not session.closed:
+                self._guard(session, session.respond, future.result())
+
+    def update_interest(self, session):
+        """
+        This method updates the events the selector waits for on the socket of a session: Besides being readable,
+        the socket has to be watched for being writable as long as there is still data pending to be sent.
+        Args:
+            session: The CommandingSession
+
+        Returns:
+        void
+        """
+        if session.closed:
+            return
+        events = selectors.EVENT_READ
+        if len(session.outgoing) != 0:
+            events |= selectors.EVENT_WRITE
+        if self.selector.get_key(session.sock).events != events:
+            self.selector.modify(session.sock, events, session)
+
+    def close_session(self, session):
+        """
+        This method closes the connection of the given session and removes it from the server
+        Args:
+            session: The CommandingSession to close
+
+        Returns:
+        void
+        """
+        if session.closed:
+            return
+        session.closed = True
+        self.sessions.pop(session.sock.fileno(), None)
+        self.selector.unregister(session.sock)
+        session.sock.close()
+
+    def stop(self):
+        """
+        This method stops the server. The main loop will exit and close all the connections. Stopping a server, whose
+        main loop has already exited and closed the wakeup socket, does nothing
+        Returns:
+        void
+        """
+        self.running = False
+        try:
+            self._wakeup_sender.send(b"\0")
+        except OSError:
+            pass
+
+    def close(self):
+        """
+        This method closes all the sessions, the listening socket and the selector
+        Returns:
+        void
+        """
+        for session in list(self.sessions.values()):
+            self.close_session(session)
+        self.selector.close()
+        self.sock.close()
+        self._wakeup_receiver.close()
+        self._wakeup_sender.close()
+
+    @property
+    def connection_count(self):
+        """
+        The int amount of connections, that are currently being served
+        Returns:
+        int
+        """
+        return len(self.sessions)
+
+    @property
+    def command_context_class(self):
+        """
+        The class of the command context, that the server is based on
+        Returns:
+        The class object of the command context
+        """
+        return self.command_context.__class__
+
+    def _notify(self, session, future):
         """
-        This function creates an id based on random modulo hashing
+        This method is the done callback of the futures of the executor. It is called from the executor Thread and
+        hands the finished future to the server Thread.
         Args:
-            command_name: The name of the command, for which to generate an id
+            session: The CommandingSession the execution belongs to
+            future: The finished future
 
         Returns:
-        A string containing a hey number, which is the id for the given command name, randomized
+        void
+        """
+        self._completed.put((session, future))
+        try:
+            self._wakeup_sender.send(b"\0")
+        except OSError:
+            pass
+
+    def _guard(self, session, function, *args):
         """
-        command_name_bytes = command_name.encode()
-        command_name_int = int.from_bytes(command_name_bytes, "big")
-        random_hash_key = random.randint(1, command_name_int)
-        call_id_int = command_name_int % random_hash_key
-        call_id_hex = hex(call_id_int)
-        return call_id_hex
+        This method calls the given function with the args and closes the session in case an exception occurs, so
+        that a single faulty connection does not terminate the whole server
+        Args:
+            session: The session, the function belongs to
+            function: The function to call
+            *args: The positional arguments for the function
 
+        Returns:
+        void
+        """
+        try:
+            function(*args)
+        except Exception:
+            self.close_session(session)
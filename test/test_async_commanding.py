@@ -0,0 +1,312 @@
+from network.protocol.async_commanding import AsyncCommandingHandler
+from network.protocol.async_commanding import AsyncCommandingClient
+from network.protocol.commanding import CommandContext
+from network.protocol.commanding import CommandingServer
+from network.protocol.commanding import Hello
+from network.protocol.commanding import CommandTemplate
+
+import unittest
+import asyncio
+import time
+
+
+class AsyncCommandContext(CommandContext):
+
+    async def command_sleep(self, duration):
+        """
+        A command, which is a coroutine function and returns the duration after sleeping it
+        Args:
+            duration: The float amount of seconds to sleep
+
+        Returns:
+        The duration
+        """
+        await asyncio.sleep(duration)
+        return duration
+
+    def command_add(self, a, b=0):
+        return a + b
+
+    def command_record(self, value):
+        self.records = getattr(self, "records", []) + [value]
+
+    def command_records(self):
+        return getattr(self, "records", [])
+
+
+class TestAsyncCommanding(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.command_context = AsyncCommandContext()
+        self.server = await asyncio.start_server(
+            lambda reader, writer: AsyncCommandingHandler(reader, writer, self.command_context).run(), "127.0.0.1", 0
+        )
+        address = self.server.sockets[0].getsockname()
+        reader, writer = await asyncio.open_connection(*address)
+        self.client = AsyncCommandingClient(reader, writer, self.command_context)
+        await self.client.start()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_call(self):
+        """
+        Testing a basic command call with positional and keyword arguments
+        Returns:
+        void
+        """
+        return_value = await self.client.call("add", 1, b=2)
+        self.assertEqual(return_value, 3)
+
+    async def test_template(self):
+        """
+        Testing if the commands of a template are executed with the arguments of each call
+        Returns:
+        void
+        """
+        template = CommandTemplate("add")
+        results = [await self.client.execute_template(template, [i], {"b": 1}) for i in range(3)]
+        self.assertListEqual(results, [1, 2, 3])
+
+    async def test_coroutine_command(self):
+        """
+        Testing if a command, which is a coroutine function, is awaited by the handler
+        Returns:
+        void
+        """
+        return_value = await self.client.call("sleep", 0.01)
+        self.assertEqual(return_value, 0.01)
+
+    async def test_concurrent_calls(self):
+        """
+        Testing if concurrent calls on the same client all receive their own response
+        Returns:
+        void
+        """
+        results = await asyncio.gather(*[self.client.call("add", i, b=i) for i in range(10)])
+        self.assertListEqual(results, [2 * i for i in range(10)])
+
+    async def test_batch(self):
+        """
+        Testing if a batch of calls is executed, awaiting the coroutine commands within the batch
+        Returns:
+        void
+        """
+        results = await self.client.execute_batch([("add", [1], {"b": 1}), ("sleep", [0.01], {}), ("add", ["a", 1])])
+        self.assertEqual(results[0], 2)
+        self.assertEqual(results[1], 0.01)
+        self.assertIsInstance(results[2], TypeError)
+
+    async def test_batch_timeout(self):
+        """
+        Testing if a batch raises a TimeoutError at the deadline, while the client stays usable
+        Returns:
+        void
+        """
+        start = time.time()
+        with self.assertRaises(TimeoutError):
+            await self.client.execute_batch([("sleep", [0.3], {}), ("add", [1], {})], timeout=0.05)
+        self.assertLess(time.time() - start, 0.2)
+        self.assertListEqual(await self.client.execute_batch([("add", [1], {"b": 2})], timeout=5), [3])
+        self.assertFalse(self.client.broken)
+
+    async def test_notify(self):
+        """
+        Testing if commands without reply are executed without disturbing the following calls
+        Returns:
+        void
+        """
+        for i in range(3):
+            self.assertIsNone(await self.client.notify("record", i))
+        self.assertListEqual(await self.client.call("records"), [0, 1, 2])
+
+    async def test_error(self):
+        """
+        Testing if an exception in the remote command is raised by the call
+        Returns:
+        void
+        """
+        with self.assertRaises(TypeError):
+            await self.client.call("add", "a", b=1)
+
+    async def test_deferred_errors(self):
+        """
+        Testing if the errors of deferred commands are collected and returned by fetch errors
+        Returns:
+        void
+        """
+        await self.client.execute_command("add", ["a", 1], {}, return_mode="none", error_mode="deferred")
+        self.assertIsNone(await self.client.execute_command("add", [None], {}, error_mode="deferred"))
+        errors = await self.client.fetch_errors()
+        self.assertListEqual([command_name for command_name, exception in errors], ["add", "add"])
+        self.assertIsInstance(errors[0][1], TypeError)
+
+    async def test_cancelled_call(self):
+        """
+        Testing if a call cancelled in the middle of the exchange does not leave the stream out of sync
+        Returns:
+        void
+        """
+        with self.assertRaises(asyncio.TimeoutError):
+            await asyncio.wait_for(self.client.call("sleep", 0.2), 0.05)
+        self.assertEqual(await self.client.call("add", 1, b=1), 2)
+        self.assertFalse(self.client.broken)
+
+    async def test_timeout(self):
+        """
+        Testing if a call with a timeout raises a TimeoutError at the deadline and the client keeps working
+        Returns:
+        void
+        """
+        with self.assertRaises(TimeoutError):
+            await self.client.execute_command("sleep", [0.3], {}, timeout=0.05)
+        self.assertEqual(await self.client.call("add", 1, b=1), 2)
+        self.assertFalse(self.client.broken)
+
+    async def test_broken_client(self):
+        """
+        Testing if the client is marked broken, once an exchange failed in between
+        Returns:
+        void
+        """
+        self.client.writer.close()
+        with self.assertRaises(Exception):
+            await self.client.call("add", 1)
+        self.assertTrue(self.client.broken)
+        with self.assertRaises(ConnectionError):
+            await self.client.call("add", 1)
+
+    async def test_ping(self):
+        """
+        Testing if the ping measures the round trip time without disturbing concurrent calls
+        Returns:
+        void
+        """
+        results = await asyncio.gather(self.client.call("add", 1, b=1), self.client.ping(), self.client.call("add", 2))
+        self.assertEqual(results[0], 2)
+        self.assertIsInstance(results[1], float)
+        self.assertEqual(results[2], 2)
+        self.assertEqual(self.client.rtt, results[1])
+
+    async def test_resumption(self):
+        """
+        Testing if the handshake negotiates the features and a reconnecting client resumes its session
+        Returns:
+        void
+        """
+        self.assertSetEqual(self.client.features, Hello.supported_features)
+        self.assertFalse(self.client.resumed)
+        address = self.server.sockets[0].getsockname()
+        reader, writer = await asyncio.open_connection(*address)
+        client = AsyncCommandingClient(reader, writer, self.command_context,
+                                       resumption_token=self.client.resumption_token)
+        await client.start()
+        self.assertTrue(client.resumed)
+        self.assertEqual(await client.call("add", 1, b=2), 3)
+        await client.close()
+
+    async def test_protocol_violation(self):
+        """
+        Testing if the handler closes the connection, when the remote side violates the protocol
+        Returns:
+        void
+        """
+        address = self.server.sockets[0].getsockname()
+        reader, writer = await asyncio.open_connection(*address)
+        writer.write(b"garbage\n" * 8)
+        await writer.drain()
+        self.assertEqual(await asyncio.wait_for(reader.read(), 1), b"")
+        writer.close()
+
+
+class TestAsyncClientThreadedServer(unittest.IsolatedAsyncioTestCase):
+
+    async def test_call(self):
+        """
+        Testing if the async client works with the selector based CommandingServer, which runs coroutine commands
+        to completion
+        Returns:
+        void
+        """
+        command_context = AsyncCommandContext()
+        server = CommandingServer(("127.0.0.1", 0), command_context)
+        server.start()
+        reader, writer = await asyncio.open_connection(*server.address)
+        client = AsyncCommandingClient(reader, writer, command_context)
+        await client.start()
+        self.assertEqual(await client.call("sleep", 0.01), 0.01)
+        self.assertIsInstance(await client.ping(), float)
+        await client.close()
+        server.stop()
+        server.join()
+
+
+class StreamingCommandContext(AsyncCommandContext):
+
+    def command_count_up(self, amount, fail_at=None):
+        for index in range(amount):
+            if index == fail_at:
+                raise ValueError("failed at {}".format(index))
+            yield index
+
+
+class TestAsyncStreaming(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.command_context = StreamingCommandContext()
+        self.server = await asyncio.start_server(
+            lambda reader, writer: AsyncCommandingHandler(reader, writer, self.command_context).run(), "127.0.0.1", 0
+        )
+        address = self.server.sockets[0].getsockname()
+        reader, writer = await asyncio.open_connection(*address)
+        self.client = AsyncCommandingClient(reader, writer, self.command_context)
+        await self.client.start()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def test_stream(self):
+        """
+        Testing if the items of a generator command are yielded by the async stream, also when stopping early
+        Returns:
+        void
+        """
+        self.assertListEqual([item async for item in self.client.stream("count_up", 20)], list(range(20)))
+
+        stream = self.client.stream("count_up", 20)
+        async for item in stream:
+            if item == 3:
+                break
+        await stream.aclose()
+        self.assertEqual(await self.client.call("add", 1, b=2), 3)
+        self.assertFalse(self.client.broken)
+
+    async def test_call(self):
+        """
+        Testing if a generator command called the regular way returns the list of all the items and leaves the
+        connection in sync for the next call, also when the generator fails
+        Returns:
+        void
+        """
+        self.assertListEqual(await self.client.call("count_up", 3), [0, 1, 2])
+        self.assertEqual(await self.client.call("add", 1, 2), 3)
+        with self.assertRaises(ValueError):
+            await self.client.call("count_up", 5, fail_at=2)
+        self.assertEqual(await self.client.call("add", 3, 4), 7)
+        self.assertFalse(self.client.broken)
+
+    async def test_error(self):
+        """
+        Testing if an exception of the generator is raised by the async stream after the items before
+        Returns:
+        void
+        """
+        items = []
+        with self.assertRaises(ValueError):
+            async for item in self.client.stream("count_up", 5, fail_at=2):
+                items.append(item)
+        self.assertListEqual(items, [0, 1])
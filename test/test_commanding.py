@@ -4,12 +4,35 @@ from network.protocol.commanding import ErrorForm
 from network.protocol.commanding import CommandContext
 from network.protocol.commanding import CommandingHandler
 from network.protocol.commanding import CommandingClient
+from network.protocol.commanding import CommandingServer
+from network.protocol.commanding import BatchCommandForm
+from network.protocol.commanding import BatchReturnForm
+from network.protocol.commanding import CommandBatch
+from network.protocol.commanding import CommandProcessor
+from network.protocol.commanding import ResponseStore
+from network.protocol.commanding import CallQueue
+from network.protocol.commanding import CommandLookupError
+from network.protocol.commanding import CommandCache
+from network.protocol.commanding import cacheable
+from network.protocol.commanding import Hello
+from network.protocol.commanding import CommandingBase
+from network.protocol.commanding import CommandingForm
+from network.protocol.commanding import CommandTemplate
 
 from network.form import Form
+from network.form import FormSerializer
+from network.form import FormParser
+from network.form import FormTransmitterThread
+from network.form import FormReceiverThread
+from network.connection import SocketConnection
 
 from network.test.util import connections
 
 import unittest
+import asyncio
+import queue
+import threading
+import socket
 import time
 
 
@@ -53,6 +76,65 @@ class TestCommandForm(unittest.TestCase):
         self.assertEqual(command_form.pos_args, self.basic_pos_args)
         self.assertEqual(command_form.key_args, self.basic_kw_args)
 
+    def test_header(self):
+        """
+        Testing if the header is parsed from the body in one pass, allowing ':' characters in the values and ignoring
+        unknown lines, and if a received form is kept instead of being built again
+        Returns:
+        void
+        """
+        header = CommandForm.parse_header("command:a:b\nreturn:none\nextra:1\ndeadline:12.5")
+        self.assertDictEqual(
+            header, {"command": "a:b", "return_mode": "none", "error_mode": "reply", "deadline": 12.5}
+        )
+        with self.assertRaises(ValueError):
+            CommandForm.parse_header("command:time\nreturn")
+        with self.assertRaises(ValueError):
+            CommandForm.parse_header("return:reply")
+
+        form = CommandForm("ns:time", [1], {}, deadline=time.time() + 10).form
+        command_form = CommandingBase.evaluate_commanding_form(form)
+        self.assertIsInstance(command_form, CommandForm)
+        self.assertIs(command_form.form, form)
+        self.assertEqual(command_form.command_name, "ns:time")
+        self.assertEqual(command_form.deadline, CommandForm(form).deadline)
+
+    def test_form_classes(self):
+        """
+        Testing if the sub classes are registered with their titles, which are derived from the class name
+        Returns:
+        void
+        """
+        self.assertIs(CommandingForm.form_classes["COMMAND"], CommandForm)
+        self.assertIs(CommandingForm.form_classes["BATCHRETURN"], BatchReturnForm)
+        self.assertEqual(ReturnForm(1).procure_title(), "RETURN")
+        with self.assertRaises(ValueError):
+            CommandingBase.evaluate_commanding_form(Form("UNKNOWN", "", {}))
+
+    def test_slots(self):
+        """
+        Testing if the spec of the command form is assembled from its slots, which reference the same objects as the
+        appendix of the form, and if neither the wrapper nor the form accept other attributes
+        Returns:
+        void
+        """
+        command_form = self.basic_command_form
+        self.assertIs(command_form["pos_args"], command_form.form.appendix["pos_args"])
+        self.assertEqual(command_form["title"], "COMMAND")
+        self.assertIn("deadline", command_form)
+        self.assertNotIn("extra", command_form)
+        self.assertSetEqual(set(dict(command_form.items())), {
+            "title", "command", "pos_args", "kw_args", "return_mode", "error_mode", "deadline"
+        })
+        self.assertEqual(command_form, self.basic_command_form)
+        self.assertNotEqual(command_form, CommandForm(self.basic_command_name))
+        with self.assertRaises(KeyError):
+            command_form["extra"]
+        with self.assertRaises(AttributeError):
+            command_form.extra = 1
+        with self.assertRaises(AttributeError):
+            command_form.form.extra = 1
+
     @property
     def basic_command_form(self):
         """
@@ -145,6 +227,39 @@ class TestReturnForm(unittest.TestCase):
         return form
 
 
+class TestErrorForm(unittest.TestCase):
+
+    def test_round_trip(self):
+        error_form = ErrorForm(ErrorForm(ValueError("wrong value")).form)
+        self.assertIsInstance(error_form.exception, ValueError)
+        self.assertEqual(str(error_form.exception), "wrong value")
+
+    def test_message_colon(self):
+        """
+        Testing if the ':' characters of the error message are kept, while newlines are replaced
+        Returns:
+        void
+        """
+        exception = ErrorForm(ErrorForm(ValueError("http://host: a\nb")).form).exception
+        self.assertIsInstance(exception, ValueError)
+        self.assertEqual(str(exception), "http://host: a b")
+
+    def test_complex_constructor(self):
+        """
+        Testing if an exception, whose class can not be created from the message alone, is restored as a plain
+        exception, which keeps the name and the message of the original one
+        Returns:
+        void
+        """
+        try:
+            b"\xff".decode()
+        except UnicodeDecodeError as unicode_error:
+            exception = ErrorForm(ErrorForm(unicode_error).form).exception
+        self.assertIs(type(exception), Exception)
+        self.assertTrue(str(exception).startswith("UnicodeDecodeError"))
+        self.assertIn("0xff", str(exception))
+
+
 class TestCommandingProtocol(unittest.TestCase):
 
     def test_basic_exchange(self):
@@ -167,3 +282,1271 @@ class TestCommandingProtocol(unittest.TestCase):
         command_handler.stop()
         command_client.running = False
 
+
+class TestCommandingServer(unittest.TestCase):
+
+    def test_multiple_clients(self):
+        """
+        Testing if the server serves multiple CommandingClients from its single Thread
+        Returns:
+        void
+        """
+        command_context = CommandContext()
+        server = CommandingServer(("127.0.0.1", 0), command_context)
+        server.start()
+
+        clients = []
+        for i in range(5):
+            sock = socket.create_connection(server.address)
+            client = CommandingClient(SocketConnection(sock), command_context)
+            client.start()
+            clients.append(client)
+
+        for client in clients:
+            return_value = client.execute_command("time", [], {})
+            self.assertIsInstance(return_value, float)
+        self.assertEqual(server.connection_count, 5)
+
+        for client in clients:
+            client.running = False
+        server.stop()
+        server.join()
+
+    def test_error_response(self):
+        """
+        Testing if an exception of the command is sent back to the client as an ErrorForm
+        Returns:
+        void
+        """
+        command_context = CommandContext()
+        server = CommandingServer(("127.0.0.1", 0), command_context)
+        server.start()
+
+        sock = socket.create_connection(server.address)
+        client = CommandingClient(SocketConnection(sock), command_context)
+        client.start()
+        with self.assertRaises(AttributeError):
+            client.execute_command("unknown", [], {})
+
+        client.running = False
+        server.stop()
+        server.join()
+
+    def test_form_parser_partial(self):
+        """
+        Testing if the FormParser correctly assembles a form, that is being fed byte by byte
+        Returns:
+        void
+        """
+        form = CommandForm("time", [1, "a:b"], {"key": 2}).form
+        chunks = FormSerializer(form, "$separation$").chunks()
+        parser = FormParser("$separation$")
+        acks = 0
+        for byte in b"".join(chunks):
+            acks += parser.feed(bytes([byte]))
+        self.assertTrue(parser.finished)
+        self.assertEqual(acks, len(chunks))
+        self.assertEqual(parser.form, form)
+
+
+class TestFormThreads(unittest.TestCase):
+
+    def test_separation_collision(self):
+        """
+        Testing if the threaded transmitter and receiver, which are based on the serializer and the parser, transmit a
+        form with a body line colliding with the separation, without modifying the original form
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        form = Form("TITLE", ["first", "$separation$12", "last"], {"value": 1})
+        transmitter = FormTransmitterThread(conn1, form, "$separation$")
+        receiver = FormReceiverThread(conn2, "$separation$")
+        receiver.start()
+        transmitter.start()
+        received = receiver.receive_form()
+        transmitter.join()
+        transmitter.raise_exception()
+
+        self.assertEqual(received.body, "first\n $separation$12\nlast")
+        self.assertEqual(received.appendix, {"value": 1})
+        self.assertEqual(form.body, "first\n$separation$12\nlast")
+        with self.assertRaises(ValueError):
+            FormTransmitterThread(conn1, form, "$separation$", adjust=False)
+        conn1.sock.close()
+        conn2.sock.close()
+
+
+class TestBatchCommandForm(unittest.TestCase):
+
+    calls = [("time", [], {}), ("add", [1], {"b": 2})]
+
+    def test_form_round_trip(self):
+        """
+        Testing if a BatchCommandForm can be restored from its Form
+        Returns:
+        void
+        """
+        batch_form = BatchCommandForm(self.calls)
+        self.assertEqual(batch_form.form.title, "BATCHCOMMAND")
+        restored = BatchCommandForm(batch_form.form)
+        self.assertListEqual(restored.calls, self.calls)
+
+    def test_return_round_trip(self):
+        """
+        Testing if the results of a BatchReturnForm including the exceptions are restored from its Form
+        Returns:
+        void
+        """
+        return_form = BatchReturnForm([12, ValueError("wrong: value"), "text"])
+        restored = BatchReturnForm(return_form.form)
+        self.assertEqual(restored.results[0], 12)
+        self.assertIsInstance(restored.results[1], ValueError)
+        self.assertEqual(str(restored.results[1]), "wrong: value")
+        self.assertEqual(restored.results[2], "text")
+
+    def test_execute_batch(self):
+        """
+        Testing if a batch is executed by the handler and all results are returned in one response
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = CommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+
+        batch = CommandBatch()
+        batch.add("time")
+        batch.add("unknown", [1])
+        results = command_client.execute_batch(batch)
+        self.assertEqual(len(results), 2)
+        self.assertIsInstance(results[0], float)
+        self.assertIsInstance(results[1], AttributeError)
+
+        command_handler.stop()
+        command_client.running = False
+
+
+class RecordingCommandContext(CommandContext):
+
+    def __init__(self):
+        CommandContext.__init__(self)
+        self.records = []
+
+    def command_record(self, value):
+        self.records.append(value)
+
+    def command_fail(self):
+        raise ValueError("failed on purpose")
+
+    def command_count(self):
+        return len(self.records)
+
+
+class TestReturnModeNone(unittest.TestCase):
+
+    def test_no_reply(self):
+        """
+        Testing if commands with the return mode 'none' are executed without the client waiting for a response and
+        without disturbing the following commands, even if they fail
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = RecordingCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+
+        for i in range(5):
+            self.assertIsNone(command_client.execute_command("record", [i], {}, return_mode="none"))
+        command_client.execute_command("fail", [], {}, return_mode="none")
+        # The reply of this command proves, that no responses were sent for the commands before. It gets a lower
+        # priority, so that it is sent after all the others
+        self.assertEqual(command_client.execute_command("count", [], {}, priority=2), 5)
+        self.assertListEqual(sorted(command_context.records), list(range(5)))
+
+        command_handler.stop()
+        command_client.running = False
+
+    def test_invalid_return_mode(self):
+        with self.assertRaises(ValueError):
+            CommandForm("time", [], {}, return_mode="sometimes")
+
+
+class TestCommandTemplate(unittest.TestCase):
+
+    def test_chunks(self):
+        """
+        Testing if the forms created from a template are sent as the very same chunks as the regular command forms,
+        also when the body collides with the separation, and if they are received as regular command forms
+        Returns:
+        void
+        """
+        template = CommandTemplate("record", error_mode="deferred")
+        for deadline in (None, 12.5):
+            command_form = template.create([1, "a"], {"b": 2}, deadline)
+            regular_form = CommandForm("record", [1, "a"], {"b": 2}, error_mode="deferred", deadline=deadline)
+            for separation in ("$separation$", "error:", "deadline"):
+                self.assertListEqual(
+                    FormSerializer(command_form.form, separation).chunks(),
+                    FormSerializer(regular_form.form, separation).chunks()
+                )
+            restored = CommandForm(command_form.form)
+            self.assertEqual(restored, regular_form)
+            self.assertEqual(command_form, regular_form)
+        with self.assertRaises(ValueError):
+            CommandTemplate("record", return_mode="sometimes")
+
+    def test_execute_template(self):
+        """
+        Testing if the commands of templates are executed by the handler, with and without a reply
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = RecordingCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+
+        record_template = CommandTemplate("record", return_mode="none")
+        count_template = CommandTemplate("count")
+        for i in range(5):
+            self.assertIsNone(command_client.execute_template(record_template, [i], {}))
+        self.assertEqual(command_client.execute_template(count_template, [], {}, priority=2, timeout=5), 5)
+        self.assertListEqual(sorted(command_context.records), list(range(5)))
+
+        command_handler.stop()
+        command_client.running = False
+
+
+class TestDeferredErrors(unittest.TestCase):
+
+    def test_processor_fetch_errors(self):
+        """
+        Testing if the processor collects the errors of deferred commands without responding and returns them with
+        the reserved fetch errors command
+        Returns:
+        void
+        """
+        processor = CommandProcessor(RecordingCommandContext())
+        command_form = CommandForm("fail", [], {}, return_mode="none", error_mode="deferred")
+        self.assertListEqual(processor.process(command_form.form), [])
+        self.assertListEqual(processor.process(command_form.form), [])
+
+        responses = processor.process(CommandForm("fetch_errors", [], {}).form)
+        deferred_list = ReturnForm(responses[0]).return_value
+        self.assertEqual(len(deferred_list), 2)
+        self.assertListEqual(deferred_list[0], ["fail", "ValueError", "failed on purpose"])
+        # The errors have been drained
+        self.assertEqual(len(processor.deferred_errors), 0)
+
+    def test_piggyback(self):
+        """
+        Testing if the deferred errors are attached to the next response and collected by the client
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = RecordingCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+
+        for i in range(3):
+            command_client.execute_command("fail", [], {}, return_mode="none", error_mode="deferred")
+        # The response to this command carries the errors of the commands before
+        self.assertEqual(command_client.execute_command("count", [], {}, priority=2), 0)
+        # The failing call of the batch results in None instead of the exception
+        results = command_client.execute_batch([("record", [1]), ("fail",)], priority=2, error_mode="deferred")
+        self.assertListEqual(results, [None, None])
+
+        errors = command_client.fetch_errors()
+        self.assertEqual(len(errors), 4)
+        for command_name, exception in errors:
+            self.assertEqual(command_name, "fail")
+            self.assertIsInstance(exception, ValueError)
+        self.assertListEqual(command_client.fetch_errors(), [])
+
+        command_handler.stop()
+        command_client.running = False
+
+    def test_deferred_form(self):
+        command_form = CommandForm("time", [], {}, error_mode="deferred")
+        self.assertEqual(CommandForm(command_form.form).error_mode, "deferred")
+        with self.assertRaises(ValueError):
+            CommandForm("time", [], {}, error_mode="later")
+        with self.assertRaises(ValueError):
+            BatchCommandForm([("time",)], error_mode="later")
+
+
+class DecodeCommandContext(RecordingCommandContext):
+
+    def command_decode(self, data):
+        return data.encode("latin-1").decode("utf-8")
+
+
+class TestDeferredErrorsRobustness(unittest.TestCase):
+
+    def test_max_deferred_errors(self):
+        """
+        Testing if the processor only keeps the newest deferred errors and counts the dropped ones
+        Returns:
+        void
+        """
+        processor = CommandProcessor(RecordingCommandContext(), max_deferred_errors=3)
+        for i in range(5):
+            processor.process(CommandForm("record", [], {}, return_mode="none", error_mode="deferred").form)
+        self.assertEqual(len(processor.deferred_errors), 3)
+        self.assertEqual(processor.dropped_errors, 2)
+
+    def test_complex_exception(self):
+        """
+        Testing if a deferred exception, whose class can not be restored from its message, does not break the client
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = DecodeCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+
+        command_client.execute_command("decode", ["\xff"], {}, return_mode="none", error_mode="deferred")
+        self.assertEqual(command_client.execute_command("count", [], {}, priority=2), 0)
+        errors = command_client.fetch_errors()
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(str(errors[0][1]).startswith("UnicodeDecodeError"))
+
+        command_handler.stop()
+        command_client.running = False
+
+
+class TestResponseStore(unittest.TestCase):
+
+    def test_capacity_oldest(self):
+        """
+        Testing if the oldest responses are evicted, once the capacity is exceeded and if they are counted
+        Returns:
+        void
+        """
+        store = ResponseStore(capacity=3)
+        for call_id in range(5):
+            store.put(call_id, call_id * 10)
+        self.assertEqual(len(store), 3)
+        self.assertEqual(store.evicted, 2)
+        self.assertTrue(store.is_evicted(0))
+        self.assertNotIn(1, store)
+        self.assertEqual(store.pop(4), 40)
+
+    def test_capacity_newest(self):
+        store = ResponseStore(capacity=2, eviction_policy="newest")
+        for call_id in range(3):
+            store.put(call_id, call_id)
+        self.assertIn(0, store)
+        self.assertNotIn(2, store)
+        self.assertTrue(store.is_evicted(2))
+
+    def test_ttl(self):
+        """
+        Testing if the responses, which exceeded the time to live are evicted
+        Returns:
+        void
+        """
+        store = ResponseStore(ttl=0.05)
+        store.put(1, "value")
+        self.assertIn(1, store)
+        time.sleep(0.1)
+        self.assertNotIn(1, store)
+        self.assertEqual(store.evicted, 1)
+        with self.assertRaises(KeyError):
+            store.pop(1)
+
+    def test_client_call_ids(self):
+        """
+        Testing if the call ids of the client are unique, even for one character command names
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_client = CommandingClient(conn2, CommandContext())
+        call_ids = [command_client.put_call("a", [], {}, 1) for i in range(5)]
+        self.assertEqual(len(set(call_ids)), 5)
+        conn1.sock.close()
+        conn2.sock.close()
+
+
+class TestCallQueue(unittest.TestCase):
+
+    def test_priority_fifo(self):
+        """
+        Testing if the items are taken out by priority and in the order they were put in within the same priority
+        Returns:
+        void
+        """
+        call_queue = CallQueue(maxsize=0)
+        for index, priority in enumerate([2, 1, 2, 1, 3]):
+            call_queue.put(index, priority)
+        items = [call_queue.get_nowait() for i in range(5)]
+        self.assertListEqual(items, [(1, 1), (1, 3), (2, 0), (2, 2), (3, 4)])
+        with self.assertRaises(queue.Empty):
+            call_queue.get_nowait()
+
+    def test_aging(self):
+        """
+        Testing if a low priority item, which has been waiting long enough is preferred over a fresh high priority one
+        Returns:
+        void
+        """
+        call_queue = CallQueue(aging=100)
+        call_queue.put("old", 5)
+        time.sleep(0.1)
+        call_queue.put("new", 1)
+        self.assertEqual(call_queue.get_nowait(), (5, "old"))
+        metrics = call_queue.metrics()
+        self.assertEqual(metrics["wait_count"], 1)
+        self.assertGreaterEqual(metrics["wait_max"], 0.1)
+        self.assertEqual(metrics["depth"], 1)
+
+    def test_full_policies(self):
+        """
+        Testing the behaviour of the queue policies, once the queue is full
+        Returns:
+        void
+        """
+        call_queue = CallQueue(maxsize=1, full_policy="drop")
+        self.assertTrue(call_queue.put(1))
+        self.assertFalse(call_queue.put(2))
+        self.assertEqual(call_queue.metrics()["dropped"], 1)
+
+        call_queue = CallQueue(maxsize=1, full_policy="raise")
+        call_queue.put(1)
+        with self.assertRaises(queue.Full):
+            call_queue.put(2)
+
+        call_queue = CallQueue(maxsize=1, full_policy="block")
+        call_queue.put(1)
+        with self.assertRaises(queue.Full):
+            call_queue.put(2, timeout=0.01)
+        with self.assertRaises(ValueError):
+            CallQueue(full_policy="sometimes")
+
+    def test_client_queue_size(self):
+        """
+        Testing if the queue size of the client is being used
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_client = CommandingClient(conn2, CommandContext(), queue_size=2, queue_policy="drop")
+        self.assertIsNotNone(command_client.put_call("time", [], {}, 1))
+        self.assertIsNotNone(command_client.put_call("time", [], {}, 1))
+        self.assertIsNone(command_client.put_call("time", [], {}, 1))
+        conn1.sock.close()
+        conn2.sock.close()
+
+
+class TestCommandTable(unittest.TestCase):
+
+    def test_dispatch_table(self):
+        """
+        Testing if the dispatch table contains the commands of the class and its base classes with their signatures
+        Returns:
+        void
+        """
+        self.assertListEqual(RecordingCommandContext.list_commands(), ["count", "fail", "record", "time"])
+        self.assertListEqual(CommandContext.list_commands(), ["time"])
+        signature = RecordingCommandContext.command_signatures["record"]
+        self.assertListEqual(list(signature.parameters), ["value"])
+
+    def test_unknown_command(self):
+        """
+        Testing if an unknown command raises the CommandLookupError, locally as well as through the protocol
+        Returns:
+        void
+        """
+        command_context = RecordingCommandContext()
+        with self.assertRaises(CommandLookupError):
+            command_context.execute_form(CommandForm("missing", [], {}))
+
+        conn1, conn2 = connections()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+        with self.assertRaises(CommandLookupError):
+            command_client.execute_command("missing", [], {})
+        command_handler.stop()
+        command_client.running = False
+
+
+class CacheCommandContext(CommandContext):
+
+    def __init__(self):
+        CommandContext.__init__(self)
+        self.calls = 0
+
+    @cacheable(ttl=0.2)
+    def command_square(self, value):
+        self.calls += 1
+        return value * value
+
+    @cacheable()
+    def command_join(self, *values, separator=","):
+        self.calls += 1
+        return separator.join(values)
+
+
+class TestCommandCache(unittest.TestCase):
+
+    def test_cacheable_commands(self):
+        self.assertDictEqual(CacheCommandContext.cacheable_commands, {"square": 0.2, "join": None})
+
+    def test_lru(self):
+        """
+        Testing if the least recently used entries are dropped and the hits and misses are counted
+        Returns:
+        void
+        """
+        command_cache = CommandCache(maxsize=2)
+        for value in range(3):
+            command_cache.put(CommandCache.key("square", [value], {}), value)
+        with self.assertRaises(KeyError):
+            command_cache.get(CommandCache.key("square", [0], {}))
+        self.assertEqual(command_cache.get(CommandCache.key("square", [2], {})), 2)
+        self.assertEqual(command_cache.hits, 1)
+        self.assertEqual(command_cache.misses, 1)
+        # The key does not depend on the order of the kw args
+        self.assertEqual(CommandCache.key("a", [], {"x": 1, "y": 2}), CommandCache.key("a", [], {"y": 2, "x": 1}))
+
+    def test_client_cache(self):
+        """
+        Testing if the client serves repeated calls of cacheable commands from the cache, until the ttl expires or the
+        cache is invalidated
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = CacheCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+
+        for i in range(5):
+            self.assertEqual(command_client.execute_command("square", [3], {}), 9)
+            self.assertEqual(command_client.execute_command("join", ["a", "b"], {"separator": "-"}), "a-b")
+        self.assertEqual(command_context.calls, 2)
+        self.assertEqual(command_client.command_cache.hits, 8)
+
+        time.sleep(0.25)
+        command_client.execute_command("square", [3], {})
+        command_client.invalidate_cache("join")
+        command_client.execute_command("join", ["a", "b"], {"separator": "-"})
+        # The expired square is executed again, the invalidated join is sent to the handler, but answered from the
+        # result cache of the handler, which has not been invalidated
+        self.assertEqual(command_client.command_cache.misses, 4)
+        self.assertEqual(command_context.calls, 3)
+
+        command_handler.stop()
+        command_client.running = False
+
+
+class TestResultCache(unittest.TestCase):
+
+    def test_shared_cache(self):
+        """
+        Testing if the processors of different connections share the cached response forms of the command context and
+        if a hit is answered with the pre encoded form
+        Returns:
+        void
+        """
+        command_context = CacheCommandContext()
+        command_form = CommandForm("square", [4], {})
+        first = CommandProcessor(command_context).process(command_form.form)
+        second = CommandProcessor(command_context).process(command_form.form)
+        self.assertEqual(ReturnForm(first[0]).return_value, 16)
+        self.assertIs(first[0], second[0])
+        self.assertEqual(command_context.calls, 1)
+        self.assertEqual(command_context.result_cache.hits, 1)
+
+        command_context.invalidate_results("square")
+        CommandProcessor(command_context).process(command_form.form)
+        self.assertEqual(command_context.calls, 2)
+
+    def test_ttl_and_memory_limit(self):
+        """
+        Testing if the cached responses expire and if the memory limit drops the least recently used responses
+        Returns:
+        void
+        """
+        command_context = CacheCommandContext()
+        command_context.result_cache_memory = 200
+        processor = CommandProcessor(command_context)
+        processor.process(CommandForm("square", [2], {}).form)
+        time.sleep(0.25)
+        processor.process(CommandForm("square", [2], {}).form)
+        self.assertEqual(command_context.calls, 2)
+
+        for i in range(20):
+            processor.process(CommandForm("join", ["x" * 10, str(i)], {}).form)
+        self.assertLessEqual(command_context.result_cache.memory, 200)
+        self.assertLess(len(command_context.result_cache), 20)
+
+    def test_no_reply_not_cached(self):
+        """
+        Testing if a cacheable command without reply is executed without a response, even if its result is cached
+        Returns:
+        void
+        """
+        command_context = CacheCommandContext()
+        processor = CommandProcessor(command_context)
+        processor.process(CommandForm("square", [3], {}).form)
+        responses = processor.process(CommandForm("square", [3], {}, return_mode="none").form)
+        self.assertListEqual(responses, [])
+
+        conn1, conn2 = connections()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+        command_client.execute_command("square", [5], {})
+        command_client.execute_command("square", [5], {}, return_mode="none")
+        self.assertEqual(command_client.execute_command("join", ["a"], {}), "a")
+        command_handler.stop()
+        command_client.running = False
+
+
+class SlowCommandContext(CommandContext):
+
+    def __init__(self):
+        CommandContext.__init__(self)
+        self.calls = 0
+
+    def command_slow(self, value):
+        self.calls += 1
+        time.sleep(0.2)
+        if value < 0:
+            raise ValueError("negative value")
+        return value
+
+
+class TestCoalescing(unittest.TestCase):
+
+    def run_concurrently(self, command_client, value, amount):
+        """
+        Calls the slow command with the value from the given amount of Threads at the same time
+        Returns:
+        The list of the return values or exceptions of all the calls
+        """
+        results = []
+
+        def call():
+            try:
+                results.append(command_client.execute_command("slow", [value], {}))
+            except Exception as exception:
+                results.append(exception)
+
+        threads = [threading.Thread(target=call) for i in range(amount)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_coalescing(self):
+        """
+        Testing if identical concurrent calls are only sent once and all receive the result or the exception
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = SlowCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context, coalesced_commands=["slow"])
+        command_handler.start()
+        command_client.start()
+
+        self.assertListEqual(self.run_concurrently(command_client, 3, 8), [3] * 8)
+        self.assertEqual(command_context.calls, 1)
+        self.assertEqual(command_client.coalesced, 7)
+
+        results = self.run_concurrently(command_client, -1, 4)
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+        self.assertEqual(command_context.calls, 2)
+
+        # Without coalescing every call is sent
+        command_client.coalesce("slow", False)
+        self.run_concurrently(command_client, 3, 2)
+        self.assertEqual(command_context.calls, 4)
+
+        command_handler.stop()
+        command_client.running = False
+
+
+class StreamCommandContext(CommandContext):
+
+    def __init__(self):
+        CommandContext.__init__(self)
+        self.produced = 0
+
+    def command_count_up(self, amount, fail_at=None):
+        for index in range(amount):
+            if index == fail_at:
+                raise ValueError("failed at {}".format(index))
+            self.produced += 1
+            yield index
+
+    def command_plain(self):
+        return "plain"
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        conn1, conn2 = connections()
+        self.command_context = StreamCommandContext()
+        self.command_handler = CommandingHandler(conn1, self.command_context)
+        self.command_client = CommandingClient(conn2, self.command_context)
+        self.command_handler.start()
+        self.command_client.start()
+
+    def tearDown(self):
+        self.command_handler.stop()
+        self.command_client.running = False
+
+    def test_stream(self):
+        """
+        Testing if the items of a generator command are received by the stream in order and if the connection can be
+        used normally after the stream
+        Returns:
+        void
+        """
+        stream = self.command_client.execute_stream("count_up", [50], {})
+        self.assertListEqual(list(stream), list(range(50)))
+        self.assertEqual(self.command_client.execute_command("plain", [], {}), "plain")
+        self.assertListEqual(list(self.command_client.execute_stream("plain", [], {})), ["plain"])
+
+    def test_materialized(self):
+        """
+        Testing if a generator command issued as a regular command returns the list of the items
+        Returns:
+        void
+        """
+        self.assertListEqual(self.command_client.execute_command("count_up", [5], {}), [0, 1, 2, 3, 4])
+
+    def test_error(self):
+        """
+        Testing if an exception of the generator ends the stream by raising it after the items before
+        Returns:
+        void
+        """
+        items = []
+        with self.assertRaises(ValueError):
+            for item in self.command_client.execute_stream("count_up", [10], {"fail_at": 3}):
+                items.append(item)
+        self.assertListEqual(items, [0, 1, 2])
+
+    def test_flow_control(self):
+        """
+        Testing if the handler stops producing items, while the consumer does not take them out of the buffer and if
+        a closed stream does not block the client
+        Returns:
+        void
+        """
+        stream = self.command_client.execute_stream("count_up", [100], {}, buffer_size=2)
+        self.assertEqual(next(stream), 0)
+        time.sleep(0.2)
+        # One item consumed, two in the buffer, one being received by the client and one being prepared by the handler
+        self.assertLessEqual(self.command_context.produced, 6)
+        stream.close()
+        self.assertEqual(self.command_client.execute_command("plain", [], {}), "plain")
+        self.assertEqual(self.command_context.produced, 100)
+
+    def test_processor_stream(self):
+        """
+        Testing if the processor responds a generator command with a form per item and the end form
+        Returns:
+        void
+        """
+        processor = CommandProcessor(self.command_context)
+        titles = [form.title for form in processor.process(CommandForm("count_up", [2], {}).form)]
+        self.assertListEqual(titles, ["STREAMITEM", "STREAMITEM", "STREAMEND"])
+
+    def test_server_stream(self):
+        """
+        Testing if the selector based CommandingServer streams the items of a generator command
+        Returns:
+        void
+        """
+        server = CommandingServer(("127.0.0.1", 0), self.command_context)
+        server.start()
+        connection = SocketConnection(socket.create_connection(server.address))
+        client = CommandingClient(connection, self.command_context)
+        client.start()
+        self.assertListEqual(list(client.execute_stream("count_up", [30], {})), list(range(30)))
+        self.assertEqual(client.execute_command("plain", [], {}), "plain")
+        client.running = False
+        server.stop()
+        server.join()
+
+
+class DeadlineCommandContext(RecordingCommandContext):
+
+    def __init__(self):
+        RecordingCommandContext.__init__(self)
+        self.steps = 0
+
+    def command_sleep(self, duration):
+        time.sleep(duration)
+        return duration
+
+    async def command_async_sleep(self, duration):
+        await asyncio.sleep(duration)
+        return duration
+
+    def command_crunch(self, steps, cancel_token=None):
+        for step in range(steps):
+            if cancel_token.cancelled:
+                break
+            self.steps += 1
+            time.sleep(0.01)
+        return self.steps
+
+
+class TestDeadlines(unittest.TestCase):
+
+    def setUp(self):
+        conn1, conn2 = connections()
+        self.command_context = DeadlineCommandContext()
+        self.command_handler = CommandingHandler(conn1, self.command_context)
+        self.command_client = CommandingClient(conn2, self.command_context)
+        self.command_handler.start()
+        self.command_client.start()
+
+    def tearDown(self):
+        self.command_handler.stop()
+        self.command_client.running = False
+
+    def test_deadline_form(self):
+        """
+        Testing if the deadline is transmitted with the full precision and only in case there is one
+        Returns:
+        void
+        """
+        deadline = time.time() + 1.23456789
+        command_form = CommandForm(CommandForm("sleep", [1], {}, deadline=deadline).form)
+        self.assertEqual(command_form.deadline, deadline)
+        self.assertFalse(command_form.expired)
+        form = CommandForm("sleep", [1], {}).form
+        self.assertNotIn("deadline", form.body)
+        self.assertIsNone(CommandForm(form).deadline)
+
+    def test_expired_not_executed(self):
+        """
+        Testing if the processor answers a command, whose deadline has passed with a TimeoutError without executing it
+        Returns:
+        void
+        """
+        processor = CommandProcessor(self.command_context)
+        form = CommandForm("record", [1], {}, deadline=time.time() - 1).form
+        response = ErrorForm(processor.process(form)[0])
+        self.assertIsInstance(response.exception, TimeoutError)
+        self.assertListEqual(self.command_context.records, [])
+
+    def test_coroutine_deadline(self):
+        """
+        Testing if a coroutine command is being cancelled at the deadline
+        Returns:
+        void
+        """
+        processor = CommandProcessor(self.command_context)
+        form = CommandForm("async_sleep", [1], {}, deadline=time.time() + 0.05).form
+        start = time.time()
+        response = ErrorForm(processor.process(form)[0])
+        self.assertIsInstance(response.exception, TimeoutError)
+        self.assertLess(time.time() - start, 0.5)
+
+    def test_client_timeout(self):
+        """
+        Testing if the client raises a TimeoutError at the deadline, discards the late response and keeps working
+        Returns:
+        void
+        """
+        start = time.time()
+        with self.assertRaises(TimeoutError):
+            self.command_client.execute_command("sleep", [0.3], {}, timeout=0.05)
+        self.assertLess(time.time() - start, 0.2)
+        self.assertEqual(self.command_client.execute_command("count", [], {}), 0)
+        self.assertEqual(len(self.command_client.response_store), 0)
+
+    def test_batch_deadline(self):
+        """
+        Testing if the deadline of a batch is transmitted and if an expired batch is answered with a TimeoutError
+        without executing any of its calls
+        Returns:
+        void
+        """
+        deadline = time.time() + 1.23456789
+        batch_form = BatchCommandForm(BatchCommandForm([("record", [1], {})], deadline=deadline).form)
+        self.assertEqual(batch_form.deadline, deadline)
+        self.assertEqual(batch_form.command_forms()[0].deadline, deadline)
+        self.assertIsNone(BatchCommandForm(BatchCommandForm([("record", [1], {})]).form).deadline)
+
+        processor = CommandProcessor(self.command_context)
+        form = BatchCommandForm([("record", [1], {}), ("record", [2], {})], deadline=time.time() - 1).form
+        response = ErrorForm(processor.process(form)[0])
+        self.assertIsInstance(response.exception, TimeoutError)
+        self.assertListEqual(self.command_context.records, [])
+
+    def test_batch_timeout(self):
+        """
+        Testing if a blocking batch raises a TimeoutError at the deadline instead of waiting for the results
+        Returns:
+        void
+        """
+        start = time.time()
+        with self.assertRaises(TimeoutError):
+            self.command_client.execute_batch([("sleep", [0.3], {}), ("count", [], {})], timeout=0.05)
+        self.assertLess(time.time() - start, 0.2)
+        self.assertListEqual(self.command_client.execute_batch([("count", [], {})], timeout=5), [0])
+
+    def test_expired_in_queue(self):
+        """
+        Testing if a call, whose deadline passed while it was waiting in the call queue, is not sent at all
+        Returns:
+        void
+        """
+        self.command_client.execute_command("sleep", [0.2], {}, blocking=False)
+        with self.assertRaises(TimeoutError):
+            self.command_client.execute_command("record", [1], {}, timeout=0.05)
+        self.assertEqual(self.command_client.execute_command("count", [], {}), 0)
+
+    def test_cancel_token(self):
+        """
+        Testing if a command with a cancel token stops early, once the deadline has passed
+        Returns:
+        void
+        """
+        with self.assertRaises(TimeoutError):
+            self.command_client.execute_command("crunch", [1000], {}, timeout=0.1)
+        # The next call is only executed, once the cancelled command returned
+        self.assertEqual(self.command_client.execute_command("count", [], {}), 0)
+        self.assertLess(self.command_context.steps, 100)
+        self.assertEqual(self.command_client.execute_command("crunch", [3], {}), self.command_context.steps)
+
+    def test_client_error(self):
+        """
+        Testing if the callers fail with a ConnectionError instead of waiting forever, once the client Thread stopped
+        because of a broken connection
+        Returns:
+        void
+        """
+        self.command_handler.stop()
+        self.command_handler.connection.sock.close()
+        with self.assertRaises(ConnectionError):
+            self.command_client.execute_command("count", [], {})
+        self.assertIsNotNone(self.command_client.error)
+
+
+class TwinCommandContext(CommandContext):
+    """
+    A command context with the same commands as the RecordingCommandContext, but a different class name
+    """
+    def command_record(self, value):
+        pass
+
+    def command_fail(self):
+        pass
+
+    def command_count(self):
+        pass
+
+
+class TestHandshake(unittest.TestCase):
+
+    def test_hello_encoding(self):
+        """
+        Testing if the hello is restored from its binary form and if other data is rejected
+        Returns:
+        void
+        """
+        hello = Hello(RecordingCommandContext.fingerprint, ["batch", "resume"], b"t" * 16, True)
+        data = hello.encode()
+        self.assertEqual(len(data), Hello.size)
+        decoded = Hello.decode(data)
+        self.assertEqual(decoded.fingerprint, hello.fingerprint)
+        self.assertSetEqual(set(decoded.features), {"batch", "resume"})
+        self.assertEqual(decoded.token, b"t" * 16)
+        self.assertTrue(decoded.resumed)
+        self.assertIsNone(Hello.decode(Hello(hello.fingerprint).encode()).token)
+        with self.assertRaises(ValueError):
+            Hello.decode(b"garbage\n" * 5)
+
+    def test_fingerprint(self):
+        """
+        Testing if the fingerprint only depends on the command set and not on the name of the class
+        Returns:
+        void
+        """
+        self.assertEqual(TwinCommandContext.fingerprint, RecordingCommandContext.fingerprint)
+        self.assertNotEqual(DecodeCommandContext.fingerprint, RecordingCommandContext.fingerprint)
+        self.assertNotEqual(CommandContext.fingerprint, RecordingCommandContext.fingerprint)
+
+    def test_compatible_contexts(self):
+        """
+        Testing if a client and a handler with differently named command contexts, which implement the same command
+        set, can communicate and negotiate all the features
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_handler = CommandingHandler(conn1, RecordingCommandContext())
+        command_client = CommandingClient(conn2, TwinCommandContext())
+        command_handler.start()
+        command_client.start()
+
+        self.assertEqual(command_client.execute_command("count", [], {}), 0)
+        self.assertSetEqual(command_client.features, Hello.supported_features)
+        self.assertSetEqual(command_handler.features, Hello.supported_features)
+        self.assertFalse(command_client.resumed)
+
+        command_handler.stop()
+        command_client.running = False
+
+    def test_incompatible_contexts(self):
+        """
+        Testing if the client refuses a handler with a different command set
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_handler = CommandingHandler(conn1, DecodeCommandContext())
+        command_client = CommandingClient(conn2, RecordingCommandContext())
+        command_handler.start()
+        with self.assertRaises(ConnectionAbortedError):
+            command_client.validate()
+        command_handler.join(1)
+        self.assertFalse(command_handler.is_alive())
+        command_handler.stop()
+
+    def test_handler_timeout(self):
+        """
+        Testing if the handler gives up on a client, which does not send its hello within the timeout of the handler
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_handler = CommandingHandler(conn1, RecordingCommandContext(), timeout=0.1)
+        command_handler.start()
+        command_handler.join(1)
+        self.assertFalse(command_handler.is_alive())
+        command_handler.stop()
+        conn2.sock.close()
+
+    def test_server_timeout(self):
+        """
+        Testing if the server closes a connection, whose client does not complete the handshake within the timeout
+        Returns:
+        void
+        """
+        server = CommandingServer(("127.0.0.1", 0), RecordingCommandContext(), select_timeout=0.01, timeout=0.1)
+        server.start()
+        sock = socket.create_connection(server.address)
+        sock.settimeout(2)
+        self.assertEqual(sock.recv(1024), b"")
+        self.assertEqual(server.connection_count, 0)
+        sock.close()
+        server.stop()
+        server.join()
+
+    def test_resumption(self):
+        """
+        Testing if a reconnecting client resumes its session with the token and thus receives the deferred errors of
+        the previous connection
+        Returns:
+        void
+        """
+        command_context = RecordingCommandContext()
+        conn1, conn2 = connections()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+        self.assertEqual(command_client.execute_command("count", [], {}), 0)
+        # The error stays with the handler, as there is no response it could be attached to
+        command_client.execute_command("fail", [], {}, return_mode="none", error_mode="deferred")
+        while len(command_handler.processor.deferred_errors) == 0:
+            time.sleep(0.001)
+        resumption_token = command_client.resumption_token
+        self.assertIsNotNone(resumption_token)
+        command_handler.stop()
+        command_client.running = False
+
+        conn1, conn2 = connections()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context, resumption_token=resumption_token)
+        command_handler.start()
+        command_client.start()
+        errors = command_client.fetch_errors()
+        self.assertTrue(command_client.resumed)
+        self.assertNotEqual(command_client.resumption_token, resumption_token)
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0][1], ValueError)
+        command_handler.stop()
+        command_client.running = False
+
+    def test_server_resumption(self):
+        """
+        Testing if the selector based CommandingServer resumes sessions and does not accept a token twice
+        Returns:
+        void
+        """
+        command_context = RecordingCommandContext()
+        server = CommandingServer(("127.0.0.1", 0), command_context)
+        server.start()
+        resumption_token = None
+        for resumed in (False, True):
+            connection = SocketConnection(socket.create_connection(server.address))
+            command_client = CommandingClient(connection, command_context, resumption_token=resumption_token)
+            command_client.start()
+            self.assertEqual(command_client.execute_command("count", [], {}), 0)
+            self.assertEqual(command_client.resumed, resumed)
+            command_client.running = False
+            resumption_token = command_client.resumption_token
+
+        self.assertIsNone(command_context.sessions.resume(b"x" * 16))
+        self.assertIsNotNone(command_context.sessions.resume(resumption_token))
+        self.assertIsNone(command_context.sessions.resume(resumption_token))
+        server.stop()
+        server.join()
+
+
+class TestPing(unittest.TestCase):
+
+    def test_client_ping(self):
+        """
+        Testing if the client measures the round trip time with a ping in between the calls of other Threads
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = RecordingCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+
+        threads = [threading.Thread(target=command_client.execute_command, args=("record", [i], {})) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        rtt = command_client.ping(timeout=5)
+        for thread in threads:
+            thread.join()
+        self.assertIsInstance(rtt, float)
+        self.assertGreater(rtt, 0)
+        self.assertEqual(command_client.execute_command("count", [], {}), 20)
+
+        command_handler.stop()
+        command_client.running = False
+
+    def test_polling(self):
+        """
+        Testing if an idle client with a polling interval pings the handler
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = RecordingCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context, polling_interval=0.02)
+        command_handler.start()
+        command_client.start()
+        time.sleep(0.2)
+        self.assertIsNotNone(command_client.rtt)
+        self.assertEqual(command_client.execute_command("count", [], {}), 0)
+
+        command_handler.stop()
+        command_client.running = False
+
+    def test_polling_backoff(self):
+        """
+        Testing if the polling interval of an idle client backs off up to the maximum, which saves most of the polls
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = RecordingCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context, polling_interval=0.01, max_polling_interval=0.08,
+                                          polling_jitter=0)
+        polls = []
+        ping_now = command_client.ping_now
+        command_client.ping_now = lambda: polls.append(ping_now())
+        command_handler.start()
+        command_client.start()
+        try:
+            time.sleep(0.5)
+            self.assertEqual(command_client.poller.interval, 0.08)
+            # With the constant interval there would have been about 50 polls
+            self.assertGreater(len(polls), 2)
+            self.assertLess(len(polls), 15)
+            self.assertEqual(command_client.execute_command("count", [], {}), 0)
+        finally:
+            command_handler.stop()
+            command_client.running = False
+
+    def test_server_ping(self):
+        """
+        Testing if the server pings the idle connections, while the pings crossing the requests of a busy client do
+        not disturb the calls
+        Returns:
+        void
+        """
+        command_context = RecordingCommandContext()
+        server = CommandingServer(("127.0.0.1", 0), command_context, select_timeout=0.001, ping_interval=0.001)
+        server.start()
+        command_client = CommandingClient(SocketConnection(socket.create_connection(server.address)), command_context)
+        command_client.start()
+        for i in range(200):
+            command_client.execute_command("record", [i], {})
+        time.sleep(0.1)
+        session = list(server.sessions.values())[0]
+        self.assertIsNotNone(session.rtt)
+        self.assertEqual(command_client.execute_command("count", [], {}), 200)
+
+        command_client.running = False
+        server.stop()
+        server.join()
+
+    def test_unresponsive_client(self):
+        """
+        Testing if the server closes a connection, which does not answer the ping within the ping timeout
+        Returns:
+        void
+        """
+        command_context = RecordingCommandContext()
+        server = CommandingServer(("127.0.0.1", 0), command_context, ping_interval=0.05, ping_timeout=0.1)
+        server.start()
+        sock = socket.create_connection(server.address)
+        sock.sendall(Hello(command_context.fingerprint).encode())
+        data = b""
+        sock.settimeout(2)
+        while True:
+            more = sock.recv(1024)
+            if not more:
+                break
+            data += more
+        self.assertTrue(data.endswith(b"ping\n"))
+        self.assertEqual(server.connection_count, 0)
+        sock.close()
+        server.stop()
+        server.join()
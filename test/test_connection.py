@@ -0,0 +1,201 @@
+from network.protocol.commanding import CommandContext
+from network.protocol.commanding import CommandingHandler
+from network.protocol.commanding import CommandingClient
+from network.protocol.commanding import CommandingServer
+from network.connection import TLSSocketConnection
+from network.connection import TLSConnector
+
+from network.test.util import certificates
+
+import subprocess
+import unittest
+import tempfile
+import threading
+import socket
+import ssl
+
+
+class EchoCommandContext(CommandContext):
+
+    def command_echo(self, value):
+        return value
+
+
+class TestTLSSocketConnection(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        try:
+            ca_file, cert_file, key_file = certificates(cls.directory.name)
+        except (OSError, subprocess.CalledProcessError):
+            cls.directory.cleanup()
+            raise unittest.SkipTest("The openssl command line tool is needed to create the test certificates")
+        cls.server_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        cls.server_context.load_cert_chain(cert_file, key_file)
+        cls.client_context = ssl.create_default_context(cafile=ca_file)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.directory.cleanup()
+
+    def listen(self, function):
+        """
+        This method starts a Thread, which accepts connections on a new listening socket and calls the given function
+        with the server side TLSSocketConnection of each one
+        Args:
+            function: The function taking the TLSSocketConnection
+
+        Returns:
+        The address of the listening socket
+        """
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.listen(8)
+        self.addCleanup(sock.close)
+
+        def serve():
+            while True:
+                try:
+                    accepted, address = sock.accept()
+                except OSError:
+                    return
+                with accepted:
+                    try:
+                        function(TLSSocketConnection(accepted, self.server_context, server_side=True))
+                    except (OSError, EOFError):
+                        pass
+
+        threading.Thread(target=serve, daemon=True).start()
+        return sock.getsockname()
+
+    def greet(self, connection):
+        """
+        This method is the function of the listening Thread, which greets the client and waits for its answer
+        Args:
+            connection: The server side TLSSocketConnection
+
+        Returns:
+        void
+        """
+        connection.sendall_string("hello\n")
+        connection.wait_string_until_character("\n")
+
+    def test_resumption(self):
+        """
+        Testing if the connector resumes the session of the previous connection to the same address, once that
+        connection has received the session ticket
+        Returns:
+        void
+        """
+        address = self.listen(self.greet)
+        connector = TLSConnector(self.client_context)
+        for i in range(3):
+            connection = connector.connect(address, timeout=5)
+            self.assertEqual(connection.session_reused, i != 0)
+            self.assertEqual(connection.wait_string_until_character("\n"), "hello")
+            self.assertIsNotNone(connection.session)
+            connection.sendall_string("bye\n")
+            connection.sock.close()
+        self.assertIn(address, connector.sessions)
+
+    def test_no_resumption(self):
+        """
+        Testing if every connection performs a full handshake, when the connector does not resume the sessions
+        Returns:
+        void
+        """
+        address = self.listen(self.greet)
+        connector = TLSConnector(self.client_context, resume=False)
+        for i in range(2):
+            connection = connector.connect(address, timeout=5)
+            self.assertFalse(connection.session_reused)
+            connection.wait_string_until_character("\n")
+            connection.sendall_string("bye\n")
+            connection.sock.close()
+
+    def test_verification(self):
+        """
+        Testing if the connection fails, when the certificate of the server is not trusted by the client
+        Returns:
+        void
+        """
+        address = self.listen(self.greet)
+        connector = TLSConnector(ssl.create_default_context(cafile=None, capath=self.directory.name))
+        with self.assertRaises(ssl.SSLCertVerificationError):
+            connector.connect(address, timeout=5)
+
+    def test_pending_bytes(self):
+        """
+        Testing if the data, which has been decrypted along with a received line, is reported as pending
+        Returns:
+        void
+        """
+        def send_lines(connection):
+            connection.sendall_string("a\nbc\n")
+            connection.wait_string_until_character("\n")
+
+        address = self.listen(send_lines)
+        connection = TLSConnector(self.client_context).connect(address, timeout=5)
+        self.assertEqual(connection.pending_bytes(), 0)
+        self.assertEqual(connection.wait_string_until_character("\n"), "a")
+        self.assertEqual(connection.pending_bytes(), 3)
+        self.assertEqual(connection.wait_string_until_character("\n"), "bc")
+        self.assertEqual(connection.pending_bytes(), 0)
+        connection.sendall_string("bye\n")
+        connection.sock.close()
+
+    def test_commanding_handler(self):
+        """
+        Testing if a CommandingClient and a CommandingHandler communicate over the encrypted connection, also with a
+        polling client, which checks for pings in between the calls
+        Returns:
+        void
+        """
+        command_context = EchoCommandContext()
+        handlers = []
+
+        def handle(connection):
+            handler = CommandingHandler(connection, command_context)
+            handlers.append(handler)
+            handler.run()
+
+        address = self.listen(handle)
+        client = CommandingClient(TLSConnector(self.client_context).connect(address, timeout=5), command_context,
+                                  polling_interval=0.01)
+        client.start()
+        try:
+            for value in [1, "text", {"list": [1, 2]}, "x" * 100000]:
+                self.assertEqual(client.execute_command("echo", [value], {}), value)
+            self.assertIsNotNone(client.ping(timeout=5))
+        finally:
+            client.running = False
+            client.join()
+            for handler in handlers:
+                handler.stop()
+
+    def test_commanding_server(self):
+        """
+        Testing if the CommandingServer serves encrypted connections and if the clients resume their sessions, when
+        they reconnect
+        Returns:
+        void
+        """
+        command_context = EchoCommandContext()
+        server = CommandingServer(("127.0.0.1", 0), command_context, ssl_context=self.server_context)
+        server.start()
+        connector = TLSConnector(self.client_context)
+        try:
+            for i in range(3):
+                connection = connector.connect(server.address, timeout=5)
+                self.assertEqual(connection.session_reused, i != 0)
+                client = CommandingClient(connection, command_context)
+                client.start()
+                for value in [i, "x" * 100000]:
+                    self.assertEqual(client.execute_command("echo", [value], {}), value)
+                client.running = False
+                client.join()
+                connection.sock.close()
+        finally:
+            server.stop()
+            server.join()
@@ -7,6 +7,8 @@ from network.form import PickleAppendixEncoder
 from network.form import JsonAppendixEncoder
 
 from network.form import Form
+from network.form import FormTemplate
+from network.form import FormSerializer
 
 import unittest
 
@@ -281,6 +283,39 @@ class TestForm(unittest.TestCase):
         self._test_appendix(form, self.std_appendix)
 
 
+class TestFormTemplate(unittest.TestCase):
+
+    def test_create_form(self):
+        """
+        Testing if the forms created from a template equal the regular forms and are serialized alike, with and
+        without varying body lines
+        Returns:
+        void
+        """
+        template = FormTemplate("TITLE", ["first", "second"])
+        for body_lines in ([], ["third", "$separation$4"]):
+            form = template.create_form(body_lines, {"value": 1})
+            regular_form = Form("TITLE", ["first", "second"] + body_lines, {"value": 1})
+            self.assertEqual(form, regular_form)
+            self.assertIs(form.template, template)
+            self.assertListEqual(
+                FormSerializer(form, "$separation$").chunks(), FormSerializer(regular_form, "$separation$").chunks()
+            )
+
+    def test_header_collision(self):
+        """
+        Testing if the fixed body lines are adjusted for a colliding separation or raise an error without adjusting
+        Returns:
+        void
+        """
+        template = FormTemplate("TITLE", ["$separation$1"])
+        self.assertListEqual(template.header_chunks("$separation$"), [b"TITLE\n", b" $separation$1\n"])
+        with self.assertRaises(ValueError):
+            template.header_chunks("$separation$", adjust=False)
+        with self.assertRaises(ValueError):
+            FormTemplate("TWO\nLINES", [])
+
+
 class TestFormTransmission(unittest.TestCase):
 
     pass
\ No newline at end of file
@@ -0,0 +1,65 @@
+"""
+This is the test module for the load generator
+"""
+from network.protocol.commanding import CommandingServer
+from network.loadgen import LoadCommandContext
+from network.loadgen import percentiles
+from network.loadgen import run_load
+
+import unittest
+
+
+class TestLoadGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.server = CommandingServer(("127.0.0.1", 0), LoadCommandContext())
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.server.join()
+
+    def test_closed_loop(self):
+        """
+        Testing if the closed loop issues calls from all the clients and reports the latencies
+        Returns:
+        void
+        """
+        result = run_load(self.server.address, LoadCommandContext, ("echo", ["x"], {"result_size": 100}), 2, 2, None,
+                          0.3, 0.1)
+        self.assertGreater(result["calls"], 0)
+        self.assertDictEqual(result["errors"], {})
+        self.assertEqual(result["mode"], "closed")
+        self.assertLessEqual(result["latency"]["p50_seconds"], result["latency"]["max_seconds"])
+
+    def test_open_loop(self):
+        """
+        Testing if the open loop issues the calls at the target rate and counts the errors by their class
+        Returns:
+        void
+        """
+        result = run_load(self.server.address, LoadCommandContext, ("echo", [], {}), 1, 2, 100, 0.5, 0.1)
+        self.assertEqual(result["mode"], "open")
+        self.assertEqual(result["calls"], 0)
+        self.assertAlmostEqual(sum(result["errors"].values()), 50, delta=2)
+        self.assertIn("TypeError", result["errors"])
+
+        result = run_load(self.server.address, LoadCommandContext, ("echo", [1], {}), 1, 2, 100, 0.5, 0.1)
+        self.assertAlmostEqual(result["calls"], 50, delta=2)
+        self.assertAlmostEqual(result["calls_per_second"], 100, delta=4)
+
+    def test_percentiles(self):
+        """
+        Testing the percentiles of the latencies
+        Returns:
+        void
+        """
+        result = percentiles([i / 1000 for i in range(1000, 0, -1)])
+        self.assertEqual(result["p50_seconds"], 0.501)
+        self.assertEqual(result["p99_seconds"], 0.991)
+        self.assertEqual(result["max_seconds"], 1)
+        self.assertDictEqual(percentiles([]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""
+This is the test module for the metrics registry and the metrics collected by the handlers
+"""
+from network.protocol.commanding import CommandContext
+from network.protocol.commanding import CommandingHandler
+from network.protocol.commanding import CommandingClient
+from network.protocol.commanding import CommandProcessor
+from network.protocol.commanding import CommandForm
+from network.protocol.commanding import cacheable
+from network.metrics import MetricsRegistry
+
+from network.test.util import connections
+
+import threading
+import unittest
+import asyncio
+import time
+
+
+class MeasuredCommandContext(CommandContext):
+
+    def command_add(self, a, b=0):
+        return a + b
+
+    async def command_sleep(self, duration):
+        await asyncio.sleep(duration)
+        return duration
+
+    @cacheable()
+    def command_square(self, value):
+        return value * value
+
+
+class TestMetricsRegistry(unittest.TestCase):
+
+    def test_snapshot(self):
+        """
+        Testing if the calls, the errors and the histograms are being aggregated in the snapshot
+        Returns:
+        void
+        """
+        registry = MetricsRegistry()
+        for i in range(3):
+            registry.count_call("add")
+        registry.count_error("add", TypeError())
+        registry.observe("execution_seconds", "add", 0.0002)
+        registry.observe("execution_seconds", "add", 3)
+        registry.observe("request_bytes", "add", 100000000)
+
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["add"]["calls"], 3)
+        self.assertDictEqual(snapshot["add"]["errors"], {"TypeError": 1})
+        execution = snapshot["add"]["execution_seconds"]
+        self.assertEqual(execution["count"], 2)
+        self.assertAlmostEqual(execution["sum"], 3.0002)
+        self.assertEqual(execution["buckets"][0.0001], 0)
+        self.assertEqual(execution["buckets"][0.00025], 1)
+        self.assertEqual(execution["buckets"][5], 2)
+        self.assertEqual(snapshot["add"]["request_bytes"]["buckets"][float("inf")], 1)
+
+    def test_threads(self):
+        """
+        Testing if the updates of many Threads are all being merged, also after the Threads have finished
+        Returns:
+        void
+        """
+        registry = MetricsRegistry()
+
+        def count():
+            for i in range(1000):
+                registry.count_call("add")
+                registry.observe("execution_seconds", "add", 0.001)
+
+        threads = [threading.Thread(target=count) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        registry.count_call("add")
+        self.assertEqual(registry.snapshot()["add"]["calls"], 8001)
+        self.assertEqual(len(registry.shards), 1)
+        self.assertEqual(registry.snapshot()["add"]["execution_seconds"]["count"], 8000)
+
+        registry.reset()
+        self.assertDictEqual(registry.snapshot(), {})
+
+    def test_prometheus(self):
+        """
+        Testing the text format of prometheus
+        Returns:
+        void
+        """
+        registry = MetricsRegistry(prefix="test")
+        registry.count_call("add")
+        registry.count_error("add", ValueError('with "quotes"'))
+        registry.observe("response_bytes", "add", 100)
+        lines = registry.prometheus().splitlines()
+        self.assertIn("# TYPE test_calls_total counter", lines)
+        self.assertIn('test_calls_total{command="add"} 1', lines)
+        self.assertIn('test_errors_total{command="add",exception="ValueError"} 1', lines)
+        self.assertIn("# TYPE test_response_bytes histogram", lines)
+        self.assertIn('test_response_bytes_bucket{command="add",le="64"} 0', lines)
+        self.assertIn('test_response_bytes_bucket{command="add",le="256"} 1', lines)
+        self.assertIn('test_response_bytes_bucket{command="add",le="+Inf"} 1', lines)
+        self.assertIn('test_response_bytes_sum{command="add"} 100', lines)
+        self.assertIn('test_response_bytes_count{command="add"} 1', lines)
+
+
+class TestCommandMetrics(unittest.TestCase):
+
+    def test_handler(self):
+        """
+        Testing if the calls through a handler record all the metrics of the command
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = MeasuredCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+        try:
+            for i in range(5):
+                command_client.execute_command("add", [i], {"b": 1})
+            with self.assertRaises(TypeError):
+                command_client.execute_command("add", ["a", 1], {})
+        finally:
+            command_handler.stop()
+            command_client.running = False
+
+        snapshot = command_context.metrics.snapshot()["add"]
+        self.assertEqual(snapshot["calls"], 6)
+        self.assertDictEqual(snapshot["errors"], {"TypeError": 1})
+        for metric in ("execution_seconds", "queue_wait_seconds", "request_bytes", "response_bytes"):
+            self.assertEqual(snapshot[metric]["count"], 6)
+        self.assertGreater(snapshot["request_bytes"]["sum"], 0)
+
+    def test_coroutine(self):
+        """
+        Testing if the execution time of a coroutine command includes the time it has been awaited
+        Returns:
+        void
+        """
+        command_context = MeasuredCommandContext()
+        processor = CommandProcessor(command_context)
+        processor.process(CommandForm("sleep", [0.05], {}).form)
+        execution = command_context.metrics.snapshot()["sleep"]["execution_seconds"]
+        self.assertGreaterEqual(execution["sum"], 0.05)
+
+    def test_cached(self):
+        """
+        Testing if the calls of a cacheable command, which are answered from the result cache, are being recorded as
+        well, only without an execution time
+        Returns:
+        void
+        """
+        command_context = MeasuredCommandContext()
+        processor = CommandProcessor(command_context)
+        for i in range(5):
+            processor.process(CommandForm("square", [3], {}).form, time.perf_counter())
+        asyncio.run(processor.process_async(CommandForm("square", [3], {}).form, time.perf_counter()))
+
+        snapshot = command_context.metrics.snapshot()["square"]
+        self.assertEqual(snapshot["calls"], 6)
+        for metric in ("queue_wait_seconds", "request_bytes", "response_bytes"):
+            self.assertEqual(snapshot[metric]["count"], 6)
+        self.assertEqual(snapshot["execution_seconds"]["count"], 1)
+
+    def test_disabled(self):
+        """
+        Testing if no metrics are being collected, when the command context disables the collection
+        Returns:
+        void
+        """
+        command_context = MeasuredCommandContext()
+        command_context.collect_metrics = False
+        CommandProcessor(command_context).process(CommandForm("add", [1], {}).form, 0.0)
+        self.assertDictEqual(command_context.metrics.snapshot(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
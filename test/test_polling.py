@@ -0,0 +1,193 @@
+"""
+This is the test module for the polling module of the network project
+"""
+from network.polling import GenericPoller
+from network.polling import PollingScheduler
+from network.polling import adaptive_interval_generator
+
+import threading
+import unittest
+import time
+
+
+class TestPollingScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = PollingScheduler(workers=2)
+        self.scheduler.start()
+
+    def tearDown(self):
+        self.scheduler.stop()
+        self.scheduler.join()
+
+    def poller(self, interval, polling_function=None):
+        """
+        This method creates a GenericPoller with a constant interval, which records the times of its polls
+        Args:
+            interval: The float interval in seconds
+            polling_function: The function to be called by the poll, by default it only records the poll
+
+        Returns:
+        The GenericPoller, with the list of poll times as the attribute 'polls'
+        """
+        polls = []
+
+        def poll(connection):
+            polls.append(time.monotonic())
+            if polling_function is not None:
+                polling_function(connection)
+
+        poller = GenericPoller(None, lambda: interval, poll)
+        poller.polls = polls
+        return poller
+
+    def test_interval(self):
+        """
+        Testing if a registered poller is being polled repeatedly in its interval
+        Returns:
+        void
+        """
+        poller = self.poller(0.02)
+        self.scheduler.register(poller)
+        time.sleep(0.15)
+        self.assertGreaterEqual(len(poller.polls), 3)
+        for earlier, later in zip(poller.polls, poller.polls[1:]):
+            self.assertGreaterEqual(later - earlier, 0.02)
+
+    def test_unregister(self):
+        """
+        Testing if an unregistered poller is not being polled anymore
+        Returns:
+        void
+        """
+        poller = self.poller(0.01)
+        self.scheduler.register(poller)
+        time.sleep(0.05)
+        self.assertTrue(self.scheduler.unregister(poller))
+        time.sleep(0.02)
+        amount = len(poller.polls)
+        time.sleep(0.05)
+        self.assertEqual(len(poller.polls), amount)
+        self.assertEqual(len(self.scheduler), 0)
+
+    def test_failure(self):
+        """
+        Testing if a failed poll removes the poller from the schedule and calls the failure callbacks
+        Returns:
+        void
+        """
+        failures = []
+        failed = threading.Event()
+
+        def callback(poller, exception):
+            failures.append((poller, exception))
+            failed.set()
+
+        def fail(connection):
+            raise TimeoutError("no reply")
+
+        self.scheduler.add_failure_callback(callback)
+        poller = self.poller(0.01, fail)
+        self.scheduler.register(poller)
+        self.assertTrue(failed.wait(1))
+        time.sleep(0.05)
+        self.assertEqual(len(failures), 1)
+        self.assertIs(failures[0][0], poller)
+        self.assertIsInstance(failures[0][1], TimeoutError)
+        self.assertEqual(len(self.scheduler), 0)
+        self.assertEqual(self.scheduler.metrics()["failures"], 1)
+
+    def test_many_pollers(self):
+        """
+        Testing if many pollers with different delays are all being polled exactly once within their long interval
+        Returns:
+        void
+        """
+        order = []
+        pollers = [self.poller(10, lambda connection, index=index: order.append(index)) for index in range(200)]
+        for index, poller in reversed(list(enumerate(pollers))):
+            self.scheduler.register(poller, delay=index * 0.0005)
+        time.sleep(0.3)
+        self.assertEqual(sorted(order), list(range(200)))
+        self.assertEqual(self.scheduler.metrics()["polls"], 200)
+        self.assertEqual(len(self.scheduler), 200)
+
+
+class TestGenericPoller(unittest.TestCase):
+
+    def test_interval_generator(self):
+        """
+        Testing if the intervals are being taken from the generator one after the other, whenever the interval was
+        matched with the update flag, and if the last interval is kept, once the generator is exhausted
+        Returns:
+        void
+        """
+        def intervals():
+            yield 1
+            yield 2
+
+        poller = GenericPoller(None, intervals, lambda connection: None)
+        self.assertEqual(poller.interval, 1)
+        self.assertTupleEqual(poller.is_interval_match(0.5, update=True), (False, -0.5))
+        self.assertEqual(poller.interval, 1)
+        self.assertTupleEqual(poller.is_interval_match(1.5, update=True), (True, 0.5))
+        self.assertEqual(poller.interval, 2)
+        poller.is_interval_match(2, update=True)
+        self.assertEqual(poller.interval, 2)
+
+    def test_skip(self):
+        """
+        Testing if the poll is being skipped, while the idle function shows traffic within the interval
+        Returns:
+        void
+        """
+        polls = []
+        idle_times = [0.5, 2]
+        poller = GenericPoller(None, lambda: 1, polls.append, idle_function=lambda: idle_times.pop(0))
+        self.assertFalse(poller.poll())
+        self.assertTrue(poller.poll())
+        self.assertEqual(len(polls), 1)
+        self.assertEqual(poller.skipped, 1)
+
+
+class TestAdaptiveIntervals(unittest.TestCase):
+
+    def test_backoff(self):
+        """
+        Testing if the interval grows by the factor up to the maximum, while the connection is idle
+        Returns:
+        void
+        """
+        intervals = adaptive_interval_generator(1, 10, jitter=0)()
+        self.assertListEqual([next(intervals) for index in range(6)], [1, 2, 4, 8, 10, 10])
+
+    def test_reset(self):
+        """
+        Testing if traffic within the last interval resets the interval to the initial one
+        Returns:
+        void
+        """
+        idle_time = [100]
+        intervals = adaptive_interval_generator(1, 10, jitter=0, idle_function=lambda: idle_time[0])()
+        self.assertListEqual([next(intervals) for index in range(3)], [1, 2, 4])
+        idle_time[0] = 0
+        self.assertEqual(next(intervals), 1)
+
+    def test_jitter_and_rtt(self):
+        """
+        Testing if the intervals are randomized within the jitter and never shorter than the rtt factor times the
+        round trip time
+        Returns:
+        void
+        """
+        intervals = adaptive_interval_generator(1, jitter=0.2)()
+        values = [next(intervals) for index in range(100)]
+        self.assertTrue(all(0.8 <= value <= 1.2 for value in values))
+        self.assertGreater(len(set(values)), 1)
+
+        intervals = adaptive_interval_generator(1, jitter=0, rtt_function=lambda: 0.1, rtt_factor=50)()
+        self.assertEqual(next(intervals), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+This is the test module for the tracing of the form transmission and the commanding protocol
+"""
+from network.protocol.commanding import CommandContext
+from network.protocol.commanding import CommandingHandler
+from network.protocol.commanding import CommandingClient
+from network.tracing import RecordingTracer
+from network.tracing import CallbackTracer
+from network.tracing import set_tracer
+from network.form import FormTransmitterThread
+from network.form import FormReceiverThread
+from network.form import Form
+
+from network.test.util import connections
+
+import unittest
+
+
+class TracedCommandContext(CommandContext):
+
+    def command_add(self, a, b=0):
+        return a + b
+
+
+class TestTracing(unittest.TestCase):
+
+    def setUp(self):
+        self.tracer = RecordingTracer()
+        self.previous_tracer = set_tracer(self.tracer)
+
+    def tearDown(self):
+        set_tracer(self.previous_tracer)
+
+    def test_form_phases(self):
+        """
+        Testing if the transmission and the reception of a form report all their phases
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        form = Form("TITLE", ["line 1", "line 2", "line 3"], {"key": "value"})
+        transmitter = FormTransmitterThread(conn1, form, "$separation$")
+        receiver = FormReceiverThread(conn2, "$separation$")
+        transmitter.start()
+        receiver.start()
+        self.assertEqual(receiver.receive_form().appendix, {"key": "value"})
+        transmitter.join()
+
+        summary = self.tracer.summary()
+        self.assertEqual(summary["serialize_form"]["count"], 1)
+        self.assertEqual(summary["send_title"]["count"], 1)
+        self.assertEqual(summary["send_body"]["count"], 3)
+        self.assertEqual(summary["send_separation"]["count"], 1)
+        self.assertEqual(summary["send_appendix"]["count"], 1)
+        self.assertEqual(summary["wait_ack"]["count"], 6)
+        self.assertEqual(summary["receive_title"]["count"], 1)
+        self.assertEqual(summary["receive_body"]["count"], 4)
+        self.assertEqual(summary["receive_appendix"]["count"], 1)
+        self.assertEqual(summary["send_ack"]["count"], 6)
+        self.assertEqual(summary["assemble_form"]["count"], 1)
+        self.assertEqual(summary["decode_appendix"]["count"], 1)
+        for phase, start, end, attributes in self.tracer.spans():
+            self.assertLessEqual(start, end)
+
+    def test_command_phases(self):
+        """
+        Testing if a call reports the phases of the client and the execution of the command on the handler
+        Returns:
+        void
+        """
+        conn1, conn2 = connections()
+        command_context = TracedCommandContext()
+        command_handler = CommandingHandler(conn1, command_context)
+        command_client = CommandingClient(conn2, command_context)
+        command_handler.start()
+        command_client.start()
+        try:
+            self.assertEqual(command_client.execute_command("add", [1], {"b": 2}), 3)
+        finally:
+            command_handler.stop()
+            command_client.running = False
+
+        for phase in ("send_request", "send_command", "receive_response", "execute_command"):
+            spans = self.tracer.spans(phase)
+            self.assertEqual(len(spans), 1)
+            self.assertDictEqual(spans[0][3], {"command": "add"})
+
+    def test_callback_and_disabled(self):
+        """
+        Testing if the callback tracer receives the spans and if restoring the default tracer stops the tracing
+        Returns:
+        void
+        """
+        phases = []
+        set_tracer(CallbackTracer(lambda phase, start, end, attributes: phases.append(phase)))
+        Form("TITLE", "body", {})
+        self.assertListEqual(phases, ["encode_appendix"])
+
+        set_tracer(None)
+        Form("TITLE", "body", {})
+        self.assertListEqual(phases, ["encode_appendix"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,43 +1,26 @@
 from network.connection import SocketConnection
 
+import subprocess
 import threading
-import random
 import socket
 import time
-
-
-def open_port():
-    """
-    This function will return an open network port
-    Returns:
-    the integer port number of the open port
-    """
-    # Choosing the port random in the upper port range
-    port = random.randint(30000, 60000)
-    result = 0
-    while result == 0:
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        address = ('127.0.0.1', port)
-        # attempting to connect to the server, in case not possible, there is no socket on the port -> port is free
-        result = sock.connect_ex(address)
-        port = random.randint(30000, 60000)
-    # Returning the found free port
-    return port
+import os
 
 
 def sockets(port=None):
     """
     This function wraps the functionality of the SockGrab class, by returning a pair of connected sockets
     Args:
-        port:
+        port: The int port for the server socket. By default the operating system assigns a free port
 
     Returns:
     a tuple of connected sockets, where the first one is the one that was returned by the accepted server connection
     and the second one the actively requesting a connection
     """
-    # Setting the port to any open port in case no special one specified
+    # Binding to the port 0 lets the operating system pick a free port, probing for a free port instead would race
+    # with other sockets being bound in the meantime
     if port is None:
-        port = open_port()
+        port = 0
 
     sock_grab = SockGrab(port)
     sock_grab.start()
@@ -59,19 +42,21 @@ class SockGrab(threading.Thread):
     def __init__(self, port):
         threading.Thread.__init__(self)
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.address = ('127.0.0.1', port)
         self.connector = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.connection = None
+        # Binding the server socket already here, so that the connector can not attempt to connect before the Thread
+        # has been started and actually listens. The address is read back, as the port 0 is replaced by a free one
+        self.sock.bind(('127.0.0.1', port))
+        self.sock.listen(2)
+        self.address = self.sock.getsockname()
 
     def run(self):
         """
-        The main method of the Thread, which will be called after the Thread was started. This will simply define the
-        internal socket object as a server and wait for a connection, which it then assigns to the connection attribute
+        The main method of the Thread, which will be called after the Thread was started. This will simply wait for a
+        connection on the internal server socket, which it then assigns to the connection attribute
         Returns:
         void
         """
-        self.sock.bind(self.address)
-        self.sock.listen(2)
         self.connection, address = self.sock.accept()
 
     def sockets(self):
@@ -112,3 +97,43 @@ class SockGrab(threading.Thread):
         void
         """
         self.connector.connect(self.address)
+
+
+def certificates(directory):
+    """
+    This function creates a self signed certificate authority and a server certificate for 'localhost' and
+    '127.0.0.1', which is signed by that authority, with the openssl command line tool
+    Raises:
+        FileNotFoundError: In case the openssl command line tool is not installed
+        subprocess.CalledProcessError: In case openssl failed to create the certificates
+    Args:
+        directory: The string path of the directory, in which the files are being created
+
+    Returns:
+    The tuple (ca_file, cert_file, key_file) with the string paths of the certificate of the authority, the
+    certificate of the server and the private key of the server
+    """
+    ca_key, ca_file = os.path.join(directory, "ca.key"), os.path.join(directory, "ca.pem")
+    key_file, cert_file = os.path.join(directory, "server.key"), os.path.join(directory, "server.pem")
+    request_file, extension_file = os.path.join(directory, "server.csr"), os.path.join(directory, "server.ext")
+    with open(extension_file, mode="w") as file:
+        file.write(
+            "basicConstraints=critical,CA:FALSE\n"
+            "keyUsage=critical,digitalSignature\n"
+            "extendedKeyUsage=serverAuth\n"
+            "subjectAltName=DNS:localhost,IP:127.0.0.1\n"
+            "subjectKeyIdentifier=hash\n"
+            "authorityKeyIdentifier=keyid\n"
+        )
+    key_options = ["-newkey", "ec", "-pkeyopt", "ec_paramgen_curve:prime256v1", "-nodes"]
+    commands = [
+        ["openssl", "req", "-x509", *key_options, "-keyout", ca_key, "-out", ca_file, "-days", "1",
+         "-subj", "/CN=network test authority", "-addext", "basicConstraints=critical,CA:TRUE",
+         "-addext", "keyUsage=critical,keyCertSign,cRLSign"],
+        ["openssl", "req", *key_options, "-keyout", key_file, "-out", request_file, "-subj", "/CN=localhost"],
+        ["openssl", "x509", "-req", "-in", request_file, "-CA", ca_file, "-CAkey", ca_key, "-CAcreateserial",
+         "-out", cert_file, "-days", "1", "-extfile", extension_file]
+    ]
+    for command in commands:
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return ca_file, cert_file, key_file
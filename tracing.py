@@ -0,0 +1,144 @@
+"""
+The Tracer classes:
+A Tracer receives the start and end timestamps of the individual phases of the form transmission and the commanding
+protocol, like sending the title of a form, waiting for an ACK or executing a command. That way it can be told where
+the time of a slow transfer went.
+By default the no-op base Tracer is being used, whose 'enabled' flag is False. The instrumented code checks that flag
+before even taking the timestamps, so that tracing costs essentially nothing unless a real Tracer is being set with
+'set_tracer'.
+
+The phases being reported are:
+- serialize_form: Creating the chunks of a form to be sent
+- send_title, send_body, send_separation, send_appendix: Sending the according chunk of a form
+- wait_ack: Waiting for the ACK of the receiving end after a chunk
+- receive_title, receive_body, receive_appendix: Receiving the according part of a form
+- send_ack: Sending the ACK for a received part
+- encode_appendix, decode_appendix: Encoding and decoding the appendix of a Form with its appendix encoder
+- assemble_form: Creating the Form object from the received parts, which includes decoding the appendix
+- send_request, send_command, receive_response: The phases of a call of the CommandingClient
+- execute_command: The execution of a command by the command context on the handler side, until the return value of
+  a coroutine command is available
+"""
+import collections
+import threading
+
+
+class Tracer:
+    """
+    BASE CLASS / NO-OP TRACER
+
+    This class acts as the interface of a Tracer and at the same time as the default Tracer, which does nothing.
+    Subclasses have to set the 'enabled' flag to True and implement the 'record' method. The code reporting to a
+    Tracer is supposed to only take the timestamps, in case the flag is set:
+
+        tracer = get_tracer()
+        if tracer.enabled:
+            start = time.perf_counter()
+        ...
+        if tracer.enabled:
+            tracer.record("phase", start, time.perf_counter())
+    """
+    enabled = False
+
+    def record(self, phase, start, end, attributes=None):
+        """
+        This method is being called with the timestamps of a finished phase
+        Args:
+            phase: The string name of the phase
+            start: The float time.perf_counter timestamp of the start of the phase
+            end: The float time.perf_counter timestamp of the end of the phase
+            attributes: The optional dict with further information about the phase, like the name of the command
+
+        Returns:
+        void
+        """
+        pass
+
+
+class RecordingTracer(Tracer):
+    """
+    This Tracer keeps the most recent spans in memory, where a span is a tuple (phase, start, end, attributes). The
+    'summary' method aggregates the kept spans by their phase. The Tracer is thread safe, as the phases are being
+    reported from many Threads.
+    """
+    enabled = True
+
+    def __init__(self, capacity=100000):
+        self.recorded = collections.deque(maxlen=capacity)
+        self.lock = threading.Lock()
+
+    def record(self, phase, start, end, attributes=None):
+        with self.lock:
+            self.recorded.append((phase, start, end, attributes))
+
+    def spans(self, phase=None):
+        """
+        This method returns the recorded spans
+        Args:
+            phase: The string name of the phase to filter by, None for the spans of all phases
+
+        Returns:
+        The list of tuples (phase, start, end, attributes) in the order they were recorded
+        """
+        with self.lock:
+            return [span for span in self.recorded if phase is None or span[0] == phase]
+
+    def summary(self):
+        """
+        This method aggregates the recorded spans by their phase
+        Returns:
+        The dict with the phase names as keys and dicts with the keys count, total_seconds and max_seconds as values
+        """
+        summary = {}
+        for phase, start, end, attributes in self.spans():
+            entry = summary.setdefault(phase, {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            entry["count"] += 1
+            entry["total_seconds"] += end - start
+            entry["max_seconds"] = max(entry["max_seconds"], end - start)
+        return summary
+
+    def clear(self):
+        with self.lock:
+            self.recorded.clear()
+
+
+class CallbackTracer(Tracer):
+    """
+    This Tracer passes every span on to a function with the same parameters as the 'record' method, for example to
+    forward the spans to an external tracing system. The function is being called from within the reporting Thread.
+    """
+    enabled = True
+
+    def __init__(self, callback):
+        self.callback = callback
+
+    def record(self, phase, start, end, attributes=None):
+        self.callback(phase, start, end, attributes)
+
+
+# The tracer, which is used by all the instrumented code, that is not explicitly given a tracer
+_tracer = Tracer()
+
+
+def get_tracer():
+    """
+    This function returns the Tracer currently set for the process
+    Returns:
+    The Tracer object
+    """
+    return _tracer
+
+
+def set_tracer(tracer):
+    """
+    This function sets the Tracer for the whole process. Passing None restores the no-op Tracer
+    Args:
+        tracer: The Tracer object or None
+
+    Returns:
+    The Tracer, which was set before
+    """
+    global _tracer
+    previous = _tracer
+    _tracer = Tracer() if tracer is None else tracer
+    return previous